@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+日志写入吞吐基准
+对比每条消息同步写入并刷新（原实现）、后台线程批量写入以及持久模式（每条落盘后返回）的每秒消息数；
+持久模式另用多个线程同时记录，展示组提交把并发消息合并到一次 fsync
+
+吞吐计入 close 写出全部缓冲的时间；调用耗时只计 log 本身，即战斗循环实际被阻塞的时间。
+单核机器上写入线程与调用方争用同一核心，后台模式的吞吐收益主要来自合并写入和刷新
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.tool import Logger
+
+MESSAGES = 200000
+# 与一回合战斗状态输出相近的消息
+MESSAGE = "剑士 攻击 刺客，造成 23 点伤害 💥暴击！ 生命值: ██████████░░░░░░░░░░ 35/70 (50.0%)"
+
+
+def _measure(settings, messages, threads=1):
+    """返回 (每秒消息数, 每条 log 调用耗时 ns)，threads > 1 时多个线程平分消息同时记录"""
+    logger = Logger(settings, echo=False)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        logger.init_logger(os.path.join(temp_dir, "bench.log"))
+        log = logger.log
+
+        def produce():
+            for _ in range(messages // threads):
+                log(MESSAGE)
+
+        workers = [threading.Thread(target=produce) for _ in range(threads - 1)]
+        start = time.perf_counter()
+        for worker in workers:
+            worker.start()
+        produce()
+        for worker in workers:
+            worker.join()
+        logged = time.perf_counter()
+        # 计入把缓冲全部写出的时间
+        logger.close()
+        elapsed = time.perf_counter() - start
+    return messages / elapsed, (logged - start) / messages * 1e9
+
+
+def main():
+    print("=" * 60)
+    print("       日志写入吞吐基准")
+    print("=" * 60)
+    rows = [
+        ("同步写入 + 逐条刷新", _measure({"background": False}, MESSAGES)),
+        ("后台线程批量写入", _measure({"background": True}, MESSAGES)),
+        ("持久模式（单线程）", _measure({"durable": True}, MESSAGES // 100)),
+        ("持久模式（8 线程组提交）", _measure({"durable": True}, MESSAGES // 20, threads=8)),
+        ("同步写入 + 逐条 fsync", _measure({"background": False, "durable": True}, MESSAGES // 100)),
+    ]
+    baseline = rows[0][1][0]
+    for label, (rate, call_ns) in rows:
+        print(f"{label:24} {rate:12,.0f} 条/秒 ({rate / baseline:5.2f}x)  调用 {call_ns:8.0f} ns/条")
+
+
+if __name__ == "__main__":
+    main()
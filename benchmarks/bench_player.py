@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+角色攻击热路径微基准
+对比 Player.attack_target（结果字典）、Player.strike（元组）与 FastPlayer.strike 的单次攻击耗时，
+以及启用伤害概率表（别名法单次采样）后的耗时
+"""
+
+import os
+import random
+import sys
+import timeit
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.player import FastPlayer, Player
+
+HITS = 200000
+REPEAT = 5
+
+
+def _per_hit_ns(player_class, method_name, damage_tables=False):
+    attacker = player_class(
+        "测试·剑士", "剑士", 100, 25, 8, rng=random.Random(1), damage_tables=damage_tables
+    )
+    target = player_class("测试·盾卫", "盾卫", 10**12, 20, 12, rng=random.Random(2))
+    method = getattr(attacker, method_name)
+    best = min(timeit.repeat(lambda: method(target), number=HITS, repeat=REPEAT))
+    return best / HITS * 1e9
+
+
+def _health_bar_ns(player_class):
+    player = player_class("测试·剑士", "剑士", 100, 25, 8)
+    player.current_health = 37
+    best = min(timeit.repeat(lambda: str(player), number=HITS // 4, repeat=REPEAT))
+    return best / (HITS // 4) * 1e9
+
+
+def main():
+    print("=" * 60)
+    print("       角色攻击热路径微基准")
+    print("=" * 60)
+    baseline = _per_hit_ns(Player, "attack_target")
+    rows = [
+        ("Player.attack_target (dict)", baseline),
+        ("Player.strike (tuple)", _per_hit_ns(Player, "strike")),
+        ("FastPlayer.strike (slots)", _per_hit_ns(FastPlayer, "strike")),
+        ("Player.strike (伤害表)", _per_hit_ns(Player, "strike", True)),
+        ("FastPlayer.strike (伤害表)", _per_hit_ns(FastPlayer, "strike", True)),
+    ]
+    for label, ns in rows:
+        print(f"{label:32} {ns:8.1f} ns/次  ({baseline / ns:4.2f}x)")
+
+    print("-" * 60)
+    print(f"{'Player.__str__':32} {_health_bar_ns(Player):8.1f} ns/次")
+    print(f"{'FastPlayer.__str__':32} {_health_bar_ns(FastPlayer):8.1f} ns/次")
+
+
+if __name__ == "__main__":
+    main()
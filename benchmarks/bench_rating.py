@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+等级分引擎基准
+对比逐场 Python 字典更新的 Elo 与数组化评分周期（Elo / Glicko）的吞吐量，
+并测量逐条消费结果流 add_match 的速度
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.rating import EloRatings, GlickoRatings
+
+PLAYERS = 10000
+MATCHES = 5_000_000
+STREAM_MATCHES = 500_000
+
+
+def _matches(rng):
+    skill = rng.normal(0, 300, PLAYERS)
+    first = rng.integers(0, PLAYERS, MATCHES)
+    second = (first + rng.integers(1, PLAYERS, MATCHES)) % PLAYERS
+    win_probability = 1 / (1 + 10 ** ((skill[second] - skill[first]) / 400))
+    scores = (rng.random(MATCHES) < win_probability).astype(np.float64)
+    return skill, first, second, scores
+
+
+def _naive_elo(first, second, scores, count):
+    """朴素实现：逐场更新 Python 字典"""
+    ratings = {}
+    for a, b, score in zip(first[:count].tolist(), second[:count].tolist(), scores[:count].tolist()):
+        ra = ratings.get(a, 1500.0)
+        rb = ratings.get(b, 1500.0)
+        delta = 32 * (score - 1 / (1 + 10 ** ((rb - ra) / 400)))
+        ratings[a] = ra + delta
+        ratings[b] = rb - delta
+
+
+def main():
+    rng = np.random.default_rng(0)
+    skill, first, second, scores = _matches(rng)
+    print("=" * 60)
+    print(f"       等级分引擎基准 ({PLAYERS} 名参赛者)")
+    print("=" * 60)
+
+    count = 1_000_000
+    start_time = time.perf_counter()
+    _naive_elo(first, second, scores, count)
+    elapsed = time.perf_counter() - start_time
+    print(f"逐场字典 Elo : {count / elapsed:12,.0f} 场/秒 ({count / elapsed * 60:,.0f} 场/分钟)")
+
+    for engine in (EloRatings(batch_size=1 << 14), GlickoRatings()):
+        for index in range(PLAYERS):
+            engine.player_index(str(index))
+        start_time = time.perf_counter()
+        engine.add_matches(first, second, scores)
+        elapsed = time.perf_counter() - start_time
+        correlation = np.corrcoef(engine.ratings[:PLAYERS], skill)[0, 1]
+        print(
+            f"{type(engine).__name__:13}: {MATCHES / elapsed:12,.0f} 场/秒 "
+            f"({MATCHES / elapsed * 60:,.0f} 场/分钟) | 与真实实力相关系数 {correlation:.4f}"
+        )
+
+    engine = GlickoRatings()
+    keys = [str(index) for index in range(PLAYERS)]
+    stream = [
+        (keys[a], keys[b], score)
+        for a, b, score in zip(
+            first[:STREAM_MATCHES].tolist(),
+            second[:STREAM_MATCHES].tolist(),
+            scores[:STREAM_MATCHES].tolist(),
+        )
+    ]
+    start_time = time.perf_counter()
+    engine.consume(stream)
+    engine.flush()
+    elapsed = time.perf_counter() - start_time
+    print(f"结果流 consume: {STREAM_MATCHES / elapsed:12,.0f} 场/秒 ({STREAM_MATCHES / elapsed * 60:,.0f} 场/分钟)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+团队战斗基准
+1000v1000 规模下，对比下标数组/血量堆选目标与每次行动扫描整支队伍的朴素实现，
+并给出按先攻时间线调度（不同速度）的吞吐量
+"""
+
+import os
+import random
+import sys
+import time
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.battle_rules import BattleRules
+from src.player import FastPlayer
+from src.team_battle import TARGET_LOWEST_HEALTH, TARGET_RANDOM, TeamBattle
+from src.timeline import TimelineBattle
+
+TEAM_SIZE = 1000
+RULES = BattleRules(max_rounds=1000)
+
+
+class ScanTeamBattle(TeamBattle):
+    """朴素实现：每次行动都扫描敌方整支队伍"""
+
+    def _choose_target(self, team):
+        first = self.team_sizes[0]
+        indices = range(first) if team == 0 else range(first, len(self.combatants))
+        candidates = [i for i in indices if self.combatants[i].is_alive]
+        if self.targeting == TARGET_LOWEST_HEALTH:
+            return min(candidates, key=lambda i: (self.combatants[i].current_health, i))
+        return candidates[int(self.rng.random() * len(candidates))]
+
+
+def _teams(seed):
+    rng = random.Random(seed)
+    presets = [("剑士", 100, 25, 8, 10), ("刺客", 70, 40, 4, 15), ("盾卫", 150, 15, 15, 7)]
+    teams = []
+    for team in range(2):
+        members = []
+        for i in range(TEAM_SIZE):
+            character_class, health, attack, defense, speed = rng.choice(presets)
+            members.append(
+                FastPlayer(
+                    f"T{team}·{i}", character_class, health, attack, defense, speed=speed
+                )
+            )
+        teams.append(members)
+    return teams
+
+
+def _run(battle_class, targeting):
+    team1, team2 = _teams(1)
+    battle = battle_class(
+        team1, team2, rng=random.Random(2), rules=RULES, targeting=targeting, log_retention=0
+    )
+    start_time = time.perf_counter()
+    result = battle.fight()
+    return result, time.perf_counter() - start_time
+
+
+def main():
+    print("=" * 60)
+    print(f"       团队战斗基准 ({TEAM_SIZE}v{TEAM_SIZE})")
+    print("=" * 60)
+    for targeting in (TARGET_RANDOM, TARGET_LOWEST_HEALTH):
+        for label, battle_class in (
+            ("索引", TeamBattle),
+            ("扫描", ScanTeamBattle),
+            ("时间线", TimelineBattle),
+        ):
+            result, elapsed = _run(battle_class, targeting)
+            print(
+                f"{targeting:14} {label}: {elapsed:7.3f} 秒 | "
+                f"{result['total_rounds']:3} 回合 | {result['actions']:6} 次行动 | "
+                f"{result['actions'] / elapsed:10,.0f} 次/秒 | 存活 {result['survivors']}"
+            )
+
+
+if __name__ == "__main__":
+    main()
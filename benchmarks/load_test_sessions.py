@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+异步会话服务器压力测试
+同时建立大量TCP会话，每个会话按脚本完成若干场交互战斗后退出，统计吞吐量和会话耗时
+
+用法:
+    python benchmarks/load_test_sessions.py --sessions 2000
+    python benchmarks/load_test_sessions.py --host 127.0.0.1 --port 8765 --sessions 500
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.async_session import PROMPT_PREFIX, BattleSessionServer
+from src.clock import VirtualClock, real_clock
+
+
+def _answer(prompt: str, state: dict, rng: random.Random) -> str:
+    """根据提示内容生成脚本化的回复"""
+    if "请输入选项" in prompt:
+        if state["battles"] > 0:
+            state["battles"] -= 1
+            return "1"
+        return "3"
+    if "玩家请选择角色" in prompt:
+        return str(rng.randint(1, 6))
+    if "随机角色名称" in prompt:
+        return "y"
+    if "继续下一回合" in prompt:
+        return "a"
+    if "角色名字" in prompt:
+        return "压测"
+    return ""
+
+
+async def run_client(host: str, port: int, battles: int, seed: int) -> float:
+    """
+    运行一个脚本化客户端
+
+    Returns:
+        float: 会话耗时（秒）
+    """
+    rng = random.Random(seed)
+    state = {"battles": battles}
+    start_time = time.perf_counter()
+    reader, writer = await asyncio.open_connection(host, port, limit=1 << 16)
+    try:
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            text = line.decode("utf-8")
+            if text.startswith(PROMPT_PREFIX):
+                writer.write((_answer(text, state, rng) + "\n").encode("utf-8"))
+                await writer.drain()
+    finally:
+        writer.close()
+        await writer.wait_closed()
+    return time.perf_counter() - start_time
+
+
+async def load_test(args: argparse.Namespace):
+    server = None
+    host, port = args.host, args.port
+    if port is None:
+        server = BattleSessionServer(
+            host=host,
+            port=0,
+            battle_delay=args.delay,
+            seed=0,
+            clock=real_clock if args.delay > 0 else VirtualClock(),
+        )
+        port = await server.start()
+
+    # 限制同时进行中的连接建立，避免超过监听队列长度
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def limited(index: int) -> float:
+        async with semaphore:
+            return await run_client(host, port, args.battles, index)
+
+    start_time = time.perf_counter()
+    durations = await asyncio.gather(*(limited(i) for i in range(args.sessions)))
+    elapsed = time.perf_counter() - start_time
+
+    durations.sort()
+    total_battles = args.sessions * args.battles
+    print("=" * 60)
+    print("       异步会话服务器压力测试")
+    print("=" * 60)
+    print(f"会话数: {args.sessions} | 同时在线上限: {args.concurrency} | 每会话战斗: {args.battles}")
+    print(f"总耗时: {elapsed:.3f} 秒 | {args.sessions / elapsed:,.0f} 会话/秒 | {total_battles / elapsed:,.0f} 场/秒")
+    print(
+        f"会话耗时: P50 {durations[len(durations) // 2] * 1000:.1f} 毫秒 | "
+        f"P99 {durations[int(len(durations) * 0.99) - 1] * 1000:.1f} 毫秒"
+    )
+    if server is not None:
+        print(
+            f"服务器: 完成 {server.completed_sessions} | 断开 {server.dropped_sessions} | "
+            f"异常 {server.failed_sessions}"
+        )
+        await server.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="异步会话服务器压力测试")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=None, help="不指定时在本进程内启动服务器")
+    parser.add_argument("--sessions", type=int, default=1000, help="会话总数")
+    parser.add_argument("--concurrency", type=int, default=1000, help="同时在线的会话数")
+    parser.add_argument("--battles", type=int, default=2, help="每个会话的战斗场数")
+    parser.add_argument("--delay", type=float, default=0.0, help="进程内服务器的回合停顿秒数（0 表示使用虚拟时钟）")
+    asyncio.run(load_test(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -3,23 +3,47 @@ PyBattleLootGame 主程序入口
 运行战斗模拟游戏
 """
 
+import argparse
+import asyncio
+import multiprocessing
 import os
 from datetime import datetime
 import random
 import time
-from typing import Tuple
+from typing import Optional, Tuple
 
 from src.dungeon_master import DungeonMaster
+from src.clock import clock_from_speed, real_clock
 
 from src import (
     Player,
+    Inventory,
     Battle,
+    TournamentRunner,
+    MatchupMatrix,
+    solve_battle,
+    BattleReplay,
+    BattleReplayer,
+    ReplayDivergenceError,
+    BattleSessionServer,
+    StatBalancer,
+    ParameterSweep,
+    parse_grid_spec,
+    create_tournament,
+    generate_entrants,
+    derive_seed,
+    loot_generator,
+    apply_retention,
+    find_log_segments,
+    iter_log_segments,
     game_config,
     character_name_generator,
     character_data_loader,
 )
 
 dungeon_master = DungeonMaster(game_config.game_info)
+# 菜单与战斗停顿使用的时钟，可通过 --speed 加速或切换为即时虚拟时间
+clock = real_clock
 
 
 def clear_screen():
@@ -39,7 +63,7 @@ def clear_screen():
 
 def get_player_choice() -> str:
     """获取玩家选择"""
-    time.sleep(0.2)
+    clock.sleep(0.2)
     while True:
         dungeon_master.print_message("\n请选择操作:")
         dungeon_master.print_message("1. 开始新的战斗")
@@ -59,8 +83,14 @@ def create_preset_characters() -> list:
     return character_data_loader.get_character_presets()
 
 
-def select_character(characters: list) -> Player:
-    """让玩家选择角色，所有输出通过 DungeonMaster 进行"""
+def select_character(characters: list, inventory: Optional[Inventory] = None) -> Player:
+    """
+    让玩家选择角色，所有输出通过 DungeonMaster 进行
+
+    Args:
+        characters: 可选的角色预制数据
+        inventory: 玩家沿用的背包，装备加成计入所选角色的属性
+    """
     dungeon_master.log_message(f"\n请选择你的角色职业:")
     dungeon_master.log_message("-" * 50)
 
@@ -112,11 +142,40 @@ def select_character(characters: list) -> Player:
         health=char_data["health"],
         attack=char_data["attack"],
         defense=char_data["defense"],
+        speed=char_data["speed"],
+        inventory=inventory,
+    )
+
+
+def clean_old_logs(log_dir: str, pattern: str, keep=None):
+    """
+    按配置的保留策略删除旧日志（同一场战斗的日志各分段与回放文件整组删除）
+
+    Args:
+        log_dir: 日志目录
+        pattern: 参与清理的文件名模式，如 battle_*
+        keep: 不删除的文件（正在写入的日志）
+    """
+    retention = game_config.get_logging_config()["retention"]
+    removed = apply_retention(
+        log_dir,
+        pattern,
+        max_logs=retention.get("max_logs"),
+        max_age_days=retention.get("max_age_days"),
+        max_total_bytes=int((retention.get("max_total_mb") or 0) * 1024 * 1024),
+        keep=keep,
     )
+    if removed:
+        dungeon_master.print_message(f"🧹 已清理 {len(removed)} 个旧日志文件")
 
 
-def start_battle():
-    """开始战斗"""
+def start_battle(inventory: Optional[Inventory] = None):
+    """
+    开始战斗
+
+    Args:
+        inventory: 玩家的背包，战利品放入其中并在多场战斗之间保留
+    """
     characters = create_preset_characters()
 
     # 创建唯一 log 文件名
@@ -125,10 +184,12 @@ def start_battle():
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     log_file_path = os.path.join(log_dir, f"battle_{timestamp}.log")
     dungeon_master.init_logger(log_file_path)
+    # 本场的日志与稍后写入的回放同属一组，不会被清理
+    clean_old_logs(log_dir, "battle_*", keep=[dungeon_master.logger.log_path])
 
     # 角色选择界面
     dungeon_master.log_message("\n" + "=" * 60)
-    player1 = select_character(characters)
+    player1 = select_character(characters, inventory)
     player1.pre_name = "【玩家】"
     # 随机敌人
     enemy_data = random.choice(characters)
@@ -139,22 +200,53 @@ def start_battle():
         health=enemy_data["health"],
         attack=enemy_data["attack"],
         defense=enemy_data["defense"],
+        speed=enemy_data["speed"],
+    )
+    # 创建并开始战斗（使用独立种子，战斗结束后保存回放）
+    seed = random.randrange(2**63)
+    battle = Battle(
+        player1, enemy, dungeon_master, rng=random.Random(seed), clock=clock
     )
-    # 创建并开始战斗
-    battle = Battle(player1, enemy, dungeon_master)
     battle_result = battle.fight_until_end()
+    replay_path = os.path.join(log_dir, f"battle_{timestamp}.replay.json")
+    BattleReplay.from_battle(battle, seed).save(replay_path)
+
+    # 战利品掉落（胜利或平局时）：由回放种子派生独立的随机数流，
+    # 可从回放复现，又不会与战斗的伤害掷骰使用同一串随机数
+    if battle_result["outcome"] == "timeout" or battle.winner is player1:
+        loot = loot_generator.roll_battle_loot(
+            battle_result, player1.character_class, random.Random(derive_seed(seed, 1))
+        )
+        if loot:
+            player1.inventory.add_drops(loot)
+            dungeon_master.log_message("\n🎁 获得战利品:")
+            for drop in loot:
+                dungeon_master.log_message(
+                    f"   [{drop['rarity']}] {drop['item']} x{drop['count']}"
+                )
+            dungeon_master.log_message(f"   背包物品总数: {player1.inventory.total_count}")
+        else:
+            dungeon_master.log_message("\n🎁 这次什么也没有掉落")
 
     # 显示战斗摘要
     summary = battle.get_battle_summary()
     dungeon_master.log_message(f"\n📊 战斗统计:")
     dungeon_master.log_message(
-        f"   {player1.name} 总伤害: {summary['player1_damage_dealt']}"
+        f"   {player1.name} 总伤害: {summary['player1_damage_dealt']} "
+        f"(暴击 {summary['player1_stats']['critical_hits']} 次)"
     )
     dungeon_master.log_message(
-        f"   {enemy.name} 总伤害: {summary['player2_damage_dealt']}"
+        f"   {enemy.name} 总伤害: {summary['player2_damage_dealt']} "
+        f"(暴击 {summary['player2_stats']['critical_hits']} 次)"
     )
-    dungeon_master.log_message(f"战斗日志已保存到: {log_file_path}")
-    dungeon_master.logger.close()
+    # 压缩时实际文件名带 .gz 等后缀，轮转时有多个分段
+    segments = dungeon_master.logger.segments
+    dungeon_master.log_message(
+        f"战斗日志已保存到: {segments[0]}"
+        + (f"（共 {len(segments)} 段）" if len(segments) > 1 else "")
+    )
+    dungeon_master.log_message(f"战斗回放已保存到: {replay_path}")
+    dungeon_master.close_logger()
 
 
 def show_game_guide():
@@ -181,10 +273,12 @@ def main():
         )
         return
 
-    time.sleep(1)
+    clock.sleep(1)
+    # 角色每场战斗都按预制数据重新创建，背包在整个游戏过程中保留
+    inventory = Inventory()
 
     while True:
-        time.sleep(0.2)
+        clock.sleep(0.2)
         clear_screen()
         dungeon_master.print_game_logo_title()
         dungeon_master.print_intro()
@@ -192,7 +286,7 @@ def main():
         choice = get_player_choice()
 
         if choice == "1":
-            start_battle()
+            start_battle(inventory)
             dungeon_master.input_prompt("按回车键返回主菜单...")
 
         elif choice == "2":
@@ -204,5 +298,468 @@ def main():
             break
 
 
+def run_simulation(args: argparse.Namespace):
+    """无界面批量模拟两个职业之间的战斗"""
+    player1_data = character_data_loader.get_character_by_class(args.p1)
+    player2_data = character_data_loader.get_character_by_class(args.p2)
+    for class_name, char_data in ((args.p1, player1_data), (args.p2, player2_data)):
+        if char_data is None:
+            dungeon_master.print_message(
+                f"❌ 未知职业: {class_name}，可选职业: "
+                f"{', '.join(character_data_loader.get_character_classes())}"
+            )
+            return
+
+    seed = args.seed if args.seed is not None else random.randrange(2**32)
+    runner = TournamentRunner(
+        workers=args.workers, engine=args.engine, max_rounds=args.max_rounds
+    )
+    start_time = time.perf_counter()
+    stats = runner.run([(player1_data, player2_data)], args.battles, seed=seed)[0]
+    elapsed = time.perf_counter() - start_time
+    result = stats.to_dict()
+
+    dungeon_master.print_message(f"\n📊 模拟结果: {args.p1} VS {args.p2}")
+    dungeon_master.print_message("-" * 60)
+    dungeon_master.print_message(f"战斗场数: {result['battles']}")
+    dungeon_master.print_message(
+        f"{args.p1} 胜率: {result['player1_win_rate']:.2%} | "
+        f"{args.p2} 胜率: {result['player2_win_rate']:.2%} | "
+        f"平局: {result['timeout_rate']:.2%}"
+    )
+    dungeon_master.print_message(
+        f"回合数: 平均 {result['mean_rounds']:.2f} | "
+        f"P50 {result['rounds_p50']} | P90 {result['rounds_p90']} | "
+        f"P99 {result['rounds_p99']}"
+    )
+    dungeon_master.print_message(
+        f"总伤害: {args.p1} {result['player1_damage_dealt']} | "
+        f"{args.p2} {result['player2_damage_dealt']}"
+    )
+    dungeon_master.print_message(
+        f"耗时: {elapsed:.3f} 秒 ({result['battles'] / max(elapsed, 1e-9):,.0f} 场/秒)"
+    )
+
+
+def run_matchup_matrix(args: argparse.Namespace):
+    """计算并显示所有预设职业的对战胜率矩阵"""
+    matrix = MatchupMatrix(
+        battles=args.battles,
+        seed=args.seed,
+        workers=args.workers,
+        engine=args.engine,
+        cache_dir=args.cache_dir,
+        use_cache=not args.no_cache,
+    )
+    start_time = time.perf_counter()
+    results = matrix.compute()
+    elapsed = time.perf_counter() - start_time
+
+    classes = character_data_loader.get_character_classes()
+    dungeon_master.print_message("\n📊 职业对战胜率矩阵（行为玩家1胜率）:")
+    dungeon_master.print_message("-" * 60)
+    dungeon_master.print_message(MatchupMatrix.format_table(results, classes))
+    dungeon_master.print_message("-" * 60)
+    dungeon_master.print_message(
+        f"缓存命中 {matrix.cache_hits} | 重新计算 {matrix.cache_misses} | "
+        f"耗时 {elapsed:.3f} 秒"
+    )
+
+
+def run_exact_solver(args: argparse.Namespace):
+    """精确计算两个职业对战的胜负概率"""
+    player1_data = character_data_loader.get_character_by_class(args.p1)
+    player2_data = character_data_loader.get_character_by_class(args.p2)
+    for class_name, char_data in ((args.p1, player1_data), (args.p2, player2_data)):
+        if char_data is None:
+            dungeon_master.print_message(
+                f"❌ 未知职业: {class_name}，可选职业: "
+                f"{', '.join(character_data_loader.get_character_classes())}"
+            )
+            return
+
+    start_time = time.perf_counter()
+    result = solve_battle(player1_data, player2_data, max_rounds=args.max_rounds)
+    elapsed = time.perf_counter() - start_time
+
+    dungeon_master.print_message(f"\n🎯 精确求解: {args.p1} VS {args.p2}")
+    dungeon_master.print_message("-" * 60)
+    dungeon_master.print_message(
+        f"{args.p1} 胜率: {result['player1_win']:.6%} | "
+        f"{args.p2} 胜率: {result['player2_win']:.6%} | "
+        f"平局: {result['timeout']:.6%}"
+    )
+    dungeon_master.print_message(f"平均回合数: {result['mean_rounds']:.4f}")
+    for round_number, probability in enumerate(result["round_distribution"]):
+        if probability >= 1e-4:
+            dungeon_master.print_message(f"   第{round_number:2}回合结束: {probability:.4%}")
+    dungeon_master.print_message(f"耗时: {elapsed * 1000:.1f} 毫秒")
+
+
+def run_replay(args: argparse.Namespace):
+    """重新生成并显示或校验一场录制的战斗"""
+    replay = BattleReplay.load(args.path)
+    replayer = BattleReplayer(replay)
+    if args.verify:
+        start_time = time.perf_counter()
+        try:
+            battle = replayer.run()
+        except ReplayDivergenceError as e:
+            dungeon_master.print_message(f"❌ {e}")
+            return
+        elapsed = time.perf_counter() - start_time
+        dungeon_master.print_message(
+            f"✅ 回放校验通过: {battle.round_number} 回合，耗时 {elapsed * 1000:.2f} 毫秒"
+        )
+        return
+
+    log_dir = os.path.join(os.path.dirname(__file__), "logs")
+    os.makedirs(log_dir, exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    dungeon_master.init_logger(os.path.join(log_dir, f"replay_{timestamp}.log"))
+    clean_old_logs(log_dir, "replay_*", keep=[dungeon_master.logger.log_path])
+    try:
+        replayer.play(dungeon_master, delay=args.delay, clock=clock)
+    except ReplayDivergenceError as e:
+        dungeon_master.print_message(f"❌ {e}")
+    finally:
+        dungeon_master.close_logger()
+
+
+def run_log_viewer(args: argparse.Namespace):
+    """流式解压并输出战斗日志的全部分段"""
+    if not find_log_segments(args.path):
+        dungeon_master.print_message(f"⚠️ 没有找到日志: {args.path}")
+        return
+    try:
+        for line in iter_log_segments(args.path):
+            print(line)
+    except (OSError, EOFError) as e:
+        dungeon_master.print_message(f"❌ 无法读取日志: {e}")
+
+
+def run_session_server(args: argparse.Namespace):
+    """启动异步会话服务器，单进程同时服务多个玩家"""
+    server = BattleSessionServer(
+        host=args.host, port=args.port, battle_delay=args.delay, clock=clock
+    )
+
+    async def serve():
+        port = await server.start()
+        dungeon_master.print_message(
+            f"🌐 会话服务器已启动: {args.host}:{port}（Ctrl+C 停止）"
+        )
+        await server.serve_forever()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        dungeon_master.print_message(
+            f"服务器已停止，完成会话 {server.completed_sessions} 个，"
+            f"断开 {server.dropped_sessions} 个，异常 {server.failed_sessions} 个"
+        )
+
+
+def run_tournament(args: argparse.Namespace):
+    """生成参赛者并进行锦标赛，每完成一个阶段显示一次排名"""
+    entrants = generate_entrants(args.entrants, seed=args.seed)
+    options = {
+        "games_per_match": args.games,
+        "seed": args.seed,
+        "workers": args.workers,
+        "report_top": args.top,
+    }
+    if args.rounds is not None:
+        options["rounds"] = args.rounds
+    try:
+        tournament = create_tournament(args.format, entrants, **options)
+    except (TypeError, ValueError) as e:
+        dungeon_master.print_message(f"❌ 无法创建锦标赛: {e}")
+        return
+
+    dungeon_master.print_message(
+        f"\n🏆 {args.format} 锦标赛: {len(entrants)} 名参赛者，每场对局 {args.games} 战"
+    )
+    start_time = time.perf_counter()
+    for stage in tournament.run():
+        leader = stage["standings"][0]
+        dungeon_master.print_message(
+            f"阶段 {stage['stage']:3} | 对局 {stage['matches']:6} | 轮空 {stage['byes']:3} | "
+            f"领先: {leader['name']} [{leader['class']}] {leader['points']:g} 分"
+        )
+    elapsed = time.perf_counter() - start_time
+
+    dungeon_master.print_message("-" * 60)
+    for row in tournament.standings(args.top):
+        dungeon_master.print_message(
+            f"{row['rank']:3}. {row['name']} [{row['class']}] | {row['points']:g} 分 | "
+            f"{row['wins']} 胜 {row['losses']} 负 {row['draws']} 平"
+        )
+    dungeon_master.print_message(
+        f"共 {tournament.matches_played} 场对局，耗时 {elapsed:.3f} 秒"
+    )
+
+
+def run_balancer(args: argparse.Namespace):
+    """搜索预设职业属性使各职业对的胜率逼近目标，并写出新的角色数据文件"""
+    if args.evaluator is not None:
+        game_config.set_config_value("balance", "evaluator", args.evaluator)
+    try:
+        balancer = StatBalancer()
+    except ValueError as e:
+        dungeon_master.print_message(f"❌ 无法进行自动平衡: {e}")
+        return
+
+    dungeon_master.print_message(
+        f"\n⚖️ 自动平衡 {len(balancer.classes)} 个职业 "
+        f"(评估方式: {balancer.evaluator}，容差: ±{balancer.tolerance:.1%})"
+    )
+    start_time = time.perf_counter()
+    result = balancer.optimize(
+        max_iterations=args.max_iterations,
+        progress=lambda iteration, loss, max_error: dungeon_master.print_message(
+            f"第 {iteration:2} 轮 | 偏差平方和 {loss:.5f} | 最大偏差 {max_error:.2%}"
+        ),
+    )
+    elapsed = time.perf_counter() - start_time
+
+    dungeon_master.print_message("-" * 60)
+    for old, new in zip(balancer.presets, result["presets"]):
+        dungeon_master.print_message(
+            f"{new['class']:8} | 生命值 {old['health']:3} → {new['health']:3} | "
+            f"攻击力 {old['attack']:2} → {new['attack']:2} | "
+            f"防御力 {old['defense']:2} → {new['defense']:2}"
+        )
+    for row in balancer.pair_report(
+        [balancer.stat_tuple(preset) for preset in result["presets"]]
+    ):
+        dungeon_master.print_message(
+            f"{row['first']} VS {row['second']}: {row['win_rate']:.2%} (目标 {row['target']:.0%})"
+        )
+    path = balancer.write_proposal(result["presets"], args.output)
+    dungeon_master.print_message(
+        f"偏差平方和 {result['initial_loss']:.5f} → {result['final_loss']:.5f} | "
+        f"求解 {result['evaluations']} 次，缓存命中 {result['cache_hits']} 次 | 耗时 {elapsed:.2f} 秒"
+    )
+    dungeon_master.print_message(f"平衡方案已写入: {path}")
+
+
+def run_parameter_sweep(args: argparse.Namespace):
+    """在战斗配置网格上批量模拟职业对局并输出结果表"""
+    try:
+        grid = dict(parse_grid_spec(spec) for spec in args.grid)
+        sweep = ParameterSweep(
+            grid,
+            classes=args.classes,
+            battles=args.battles,
+            seed=args.seed,
+            workers=args.workers,
+            engine=args.engine,
+            cache_dir=args.cache_dir,
+            use_cache=not args.no_cache,
+        )
+    except ValueError as e:
+        dungeon_master.print_message(f"❌ 无法进行参数扫描: {e}")
+        return
+
+    dungeon_master.print_message(
+        f"\n🔬 参数扫描: {sweep.point_count()} 个网格点 × {len(sweep.matchups)} 个对局，"
+        f"每项 {args.battles} 场"
+    )
+    start_time = time.perf_counter()
+    rows = sweep.run()
+    elapsed = time.perf_counter() - start_time
+
+    dungeon_master.print_message(sweep.format_table(rows))
+    dungeon_master.print_message("-" * 60)
+    dungeon_master.print_message(
+        f"缓存命中 {sweep.cache_hits} | 重新计算 {sweep.cache_misses} | "
+        f"无效网格点 {len(sweep.invalid_points)} | 耗时 {elapsed:.3f} 秒"
+    )
+    if args.output:
+        sweep.write_csv(rows, args.output)
+        dungeon_master.print_message(f"结果表已保存到: {args.output}")
+
+
+def non_negative_speed(value: str) -> float:
+    """--speed 参数：非负的有限数"""
+    try:
+        speed = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"无效的速度倍率: {value}")
+    if not (0 <= speed < float("inf")):
+        raise argparse.ArgumentTypeError(f"速度倍率必须为非负数: {value}")
+    return speed
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    """构建命令行参数解析器，不带子命令时进入交互式游戏"""
+    parser = argparse.ArgumentParser(description="PyBattleLootGame 战斗模拟游戏")
+    parser.add_argument("--debug", action="store_true", help="开发调试模式")
+    parser.add_argument(
+        "--speed",
+        type=non_negative_speed,
+        default=None,
+        help="停顿速度倍率：默认真实时间，2 表示两倍速，0 表示不等待（虚拟时间）",
+    )
+    subparsers = parser.add_subparsers(dest="command")
+
+    simulate_parser = subparsers.add_parser("simulate", help="无界面批量战斗模拟")
+    simulate_parser.add_argument("--p1", required=True, help="玩家1职业，例如 剑士")
+    simulate_parser.add_argument("--p2", required=True, help="玩家2职业，例如 刺客")
+    simulate_parser.add_argument(
+        "-n", "--battles", type=int, default=10000, help="模拟场数"
+    )
+    simulate_parser.add_argument(
+        "--max-rounds", type=int, default=None, help="单场最大回合数（默认读取配置）"
+    )
+    simulate_parser.add_argument("--seed", type=int, default=None, help="随机种子")
+    simulate_parser.add_argument(
+        "--engine",
+        choices=["scalar", "vectorized"],
+        default="vectorized",
+        help="模拟引擎：scalar 逐回合调用 Battle，vectorized 使用 NumPy 批量模拟",
+    )
+    simulate_parser.add_argument(
+        "--workers", type=int, default=1, help="并行进程数，0 表示使用全部CPU核心"
+    )
+
+    matrix_parser = subparsers.add_parser("matrix", help="预设职业对战胜率矩阵")
+    matrix_parser.add_argument(
+        "-n", "--battles", type=int, default=100000, help="每个对局的模拟场数"
+    )
+    matrix_parser.add_argument("--seed", type=int, default=0, help="随机种子")
+    matrix_parser.add_argument(
+        "--engine", choices=["scalar", "vectorized"], default="vectorized"
+    )
+    matrix_parser.add_argument(
+        "--workers", type=int, default=1, help="并行进程数，0 表示使用全部CPU核心"
+    )
+    matrix_parser.add_argument("--cache-dir", default=None, help="结果缓存目录")
+    matrix_parser.add_argument(
+        "--no-cache", action="store_true", help="忽略并且不写入磁盘缓存"
+    )
+
+    solve_parser = subparsers.add_parser("solve", help="精确计算1v1对战胜率")
+    solve_parser.add_argument("--p1", required=True, help="玩家1职业，例如 剑士")
+    solve_parser.add_argument("--p2", required=True, help="玩家2职业，例如 刺客")
+    solve_parser.add_argument(
+        "--max-rounds", type=int, default=None, help="单场最大回合数（默认读取配置）"
+    )
+
+    replay_parser = subparsers.add_parser("replay", help="重新生成录制的战斗")
+    replay_parser.add_argument("path", help="回放文件路径（*.replay.json）")
+    replay_parser.add_argument(
+        "--verify", action="store_true", help="只全速重新生成并校验状态哈希"
+    )
+    replay_parser.add_argument(
+        "--delay",
+        type=float,
+        default=None,
+        help="显示回放时回合之间的停顿秒数（默认读取配置）",
+    )
+
+    log_parser = subparsers.add_parser("log", help="查看（可能压缩、轮转的）战斗日志")
+    log_parser.add_argument(
+        "path", help="日志路径，如 logs/battle_20250101_120000.log 或其 .gz 文件"
+    )
+
+    serve_parser = subparsers.add_parser("serve", help="启动异步多会话TCP服务器")
+    serve_parser.add_argument("--host", default="127.0.0.1", help="监听地址")
+    serve_parser.add_argument("--port", type=int, default=8765, help="监听端口")
+    serve_parser.add_argument(
+        "--delay",
+        type=float,
+        default=None,
+        help="战斗回合之间的停顿秒数（默认读取配置）",
+    )
+
+    tournament_parser = subparsers.add_parser("tournament", help="生成参赛者进行锦标赛")
+    tournament_parser.add_argument(
+        "--format",
+        choices=["round_robin", "single_elimination", "double_elimination", "swiss"],
+        default="swiss",
+        help="赛制",
+    )
+    tournament_parser.add_argument(
+        "-n", "--entrants", type=int, default=64, help="参赛人数"
+    )
+    tournament_parser.add_argument(
+        "--games", type=int, default=1, help="每场对局的战斗场数"
+    )
+    tournament_parser.add_argument(
+        "--rounds", type=int, default=None, help="单循环/瑞士轮的轮数（默认完整赛程）"
+    )
+    tournament_parser.add_argument("--seed", type=int, default=0, help="随机种子")
+    tournament_parser.add_argument(
+        "--workers", type=int, default=1, help="并行进程数，0 表示使用全部CPU核心"
+    )
+    tournament_parser.add_argument("--top", type=int, default=10, help="显示的排名条数")
+
+    balance_parser = subparsers.add_parser("balance", help="自动平衡预设职业属性")
+    balance_parser.add_argument(
+        "--output", default=None, help="输出路径（默认 data/character_data.proposed.json）"
+    )
+    balance_parser.add_argument(
+        "--max-iterations", type=int, default=None, help="最大搜索轮数（默认读取配置）"
+    )
+    balance_parser.add_argument(
+        "--evaluator",
+        choices=["exact", "vectorized"],
+        default=None,
+        help="胜率评估方式（默认读取配置）",
+    )
+
+    sweep_parser = subparsers.add_parser("sweep", help="战斗配置参数扫描")
+    sweep_parser.add_argument(
+        "--grid",
+        action="append",
+        required=True,
+        help="网格定义，可重复：键=起点:终点:步长 或 键=值1,值2，例如 critical_hit_chance=0.05:0.25:0.05",
+    )
+    sweep_parser.add_argument(
+        "--classes", nargs="+", default=None, help="参与的职业（默认全部预设职业）"
+    )
+    sweep_parser.add_argument(
+        "-n", "--battles", type=int, default=10000, help="每个网格点每个对局的模拟场数"
+    )
+    sweep_parser.add_argument("--seed", type=int, default=0, help="随机种子")
+    sweep_parser.add_argument(
+        "--engine", choices=["scalar", "vectorized"], default="vectorized"
+    )
+    sweep_parser.add_argument(
+        "--workers", type=int, default=1, help="并行进程数，0 表示使用全部CPU核心"
+    )
+    sweep_parser.add_argument("--output", default=None, help="结果CSV输出路径")
+    sweep_parser.add_argument("--cache-dir", default=None, help="结果缓存目录")
+    sweep_parser.add_argument(
+        "--no-cache", action="store_true", help="忽略并且不写入磁盘缓存"
+    )
+
+    return parser
+
+
 if __name__ == "__main__":
-    main()
+    multiprocessing.freeze_support()
+    args = build_arg_parser().parse_args()
+    clock = clock_from_speed(args.speed)
+    if args.command == "simulate":
+        run_simulation(args)
+    elif args.command == "matrix":
+        run_matchup_matrix(args)
+    elif args.command == "solve":
+        run_exact_solver(args)
+    elif args.command == "replay":
+        run_replay(args)
+    elif args.command == "log":
+        run_log_viewer(args)
+    elif args.command == "serve":
+        run_session_server(args)
+    elif args.command == "tournament":
+        run_tournament(args)
+    elif args.command == "balance":
+        run_balancer(args)
+    elif args.command == "sweep":
+        run_parameter_sweep(args)
+    else:
+        main()
@@ -3,9 +3,52 @@ PyBattleLootGame 源代码包
 """
 
 from .tool import Logger
+from .log_archive import (
+    open_log_stream,
+    iter_log_lines,
+    find_log_segments,
+    iter_log_segments,
+    apply_retention,
+)
+from .rng import RandomStream, as_random_source
 from .dungeon_master import DungeonMaster
-from .player import Player
-from .battle import Battle
+from .player import Player, FastPlayer
+from .battle import Battle, BattleSimulator, BattleOutcomeStats
+from .battle_stats import BattleStats, CombatantStats
+from .battle_rules import BattleRules
+from .battle_log import (
+    BattleEventLog,
+    JsonlBattleLogSink,
+    BinaryBattleLogSink,
+    open_battle_log_sink,
+    read_jsonl_battle_log,
+    read_binary_battle_log,
+)
+from .battle_kernel import VectorizedBattleSimulator, simulate_battles
+from .parallel_runner import TournamentRunner, derive_seed
+from .matchup_matrix import MatchupMatrix
+from .result_cache import ResultCache
+from .exact_solver import solve_battle, damage_pmf
+from .alias_sampler import AliasSampler
+from .damage_table import DamageTable
+from .replay import BattleReplay, BattleReplayer, ReplayDivergenceError
+from .team_battle import TeamBattle
+from .timeline import InitiativeTimeline, TimelineBattle
+from .tournament import (
+    Tournament,
+    RoundRobinTournament,
+    SingleEliminationTournament,
+    DoubleEliminationTournament,
+    SwissTournament,
+    create_tournament,
+    generate_entrants,
+)
+from .rating import EloRatings, GlickoRatings
+from .balancer import StatBalancer
+from .param_sweep import ParameterSweep, parse_grid_spec
+from .loot import LootTableLoader, LootGenerator, loot_table_loader, loot_generator
+from .inventory import ItemCatalog, Inventory, item_catalog
+from .async_session import AsyncDungeonMaster, GameSession, BattleSessionServer
 from .config_manager import GameConfig, game_config
 from .character_generator import (
     CharacterNameGenerator,
@@ -26,7 +69,57 @@ __author__ = "PyBattleLootGame Developer"
 
 __all__ = [
     "Player",
+    "FastPlayer",
     "Battle",
+    "BattleSimulator",
+    "BattleOutcomeStats",
+    "BattleRules",
+    "BattleStats",
+    "CombatantStats",
+    "BattleEventLog",
+    "JsonlBattleLogSink",
+    "BinaryBattleLogSink",
+    "open_battle_log_sink",
+    "read_jsonl_battle_log",
+    "read_binary_battle_log",
+    "VectorizedBattleSimulator",
+    "simulate_battles",
+    "TournamentRunner",
+    "derive_seed",
+    "MatchupMatrix",
+    "ResultCache",
+    "solve_battle",
+    "damage_pmf",
+    "AliasSampler",
+    "DamageTable",
+    "BattleReplay",
+    "BattleReplayer",
+    "ReplayDivergenceError",
+    "TeamBattle",
+    "InitiativeTimeline",
+    "TimelineBattle",
+    "Tournament",
+    "RoundRobinTournament",
+    "SingleEliminationTournament",
+    "DoubleEliminationTournament",
+    "SwissTournament",
+    "create_tournament",
+    "generate_entrants",
+    "EloRatings",
+    "GlickoRatings",
+    "StatBalancer",
+    "ParameterSweep",
+    "parse_grid_spec",
+    "LootTableLoader",
+    "LootGenerator",
+    "loot_table_loader",
+    "loot_generator",
+    "ItemCatalog",
+    "Inventory",
+    "item_catalog",
+    "AsyncDungeonMaster",
+    "GameSession",
+    "BattleSessionServer",
     "GameConfig",
     "game_config",
     "CharacterNameGenerator",
@@ -35,6 +128,13 @@ __all__ = [
     "character_data_loader",
     "DungeonMaster",
     "Logger",
+    "open_log_stream",
+    "iter_log_lines",
+    "find_log_segments",
+    "iter_log_segments",
+    "apply_retention",
+    "RandomStream",
+    "as_random_source",
     # 调试工具
     "debug_logger",
     "verbose", "debug", "info", "critical",
@@ -0,0 +1,131 @@
+"""
+别名采样模块
+Walker 别名法（Vose 构造）：O(n) 预处理后，每次从离散分布采样只需一次均匀随机数
+"""
+
+from fractions import Fraction
+from typing import Any, Callable, List, Optional, Sequence, Union
+
+try:
+    import numpy as np
+except ImportError:  # numpy 为可选依赖，仅批量采样需要
+    np = None
+
+Weight = Union[int, float, Fraction]
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError("批量别名采样需要安装 numpy (pipenv install numpy)")
+
+
+class AliasSampler:
+    """
+    离散分布的别名采样器
+
+    将 n 个结果放入 n 个等宽的桶，每个桶最多包含两个结果（本桶结果与别名）。
+    一个均匀随机数 u 的整数部分 int(u * n) 选桶，小数部分与桶内阈值比较决定取本桶结果还是别名。
+    权重为 Fraction 时按精确分数构造，阈值最后才转换为浮点数
+    """
+
+    def __init__(self, weights: Sequence[Weight], values: Optional[Sequence[Any]] = None):
+        """
+        构造别名表
+
+        Args:
+            weights: 各结果的非负权重（无需归一化）
+            values: 各结果对应的值，默认为结果下标
+        """
+        if not weights:
+            raise ValueError("别名采样器至少需要一个结果")
+        if values is not None and len(values) != len(weights):
+            raise ValueError("values 与 weights 的长度必须一致")
+        if any(weight < 0 for weight in weights):
+            raise ValueError("权重不能为负数")
+        total = sum(weights)
+        if total <= 0:
+            raise ValueError("权重之和必须为正数")
+
+        n = len(weights)
+        exact = all(isinstance(weight, (int, Fraction)) for weight in weights)
+        if exact:
+            scaled = [Fraction(weight) * n / total for weight in weights]
+        else:
+            scaled = [float(weight) * n / total for weight in weights]
+
+        # Vose 构造：不足1的桶由超过1的结果补齐
+        threshold: List[Any] = [1] * n
+        alias = list(range(n))
+        small = [i for i, p in enumerate(scaled) if p < 1]
+        large = [i for i, p in enumerate(scaled) if p >= 1]
+        while small and large:
+            less = small.pop()
+            more = large.pop()
+            threshold[less] = scaled[less]
+            alias[less] = more
+            scaled[more] = scaled[more] + scaled[less] - 1
+            (small if scaled[more] < 1 else large).append(more)
+        # 剩余的桶只含本桶结果（浮点权重下可能残留舍入误差）
+        for i in small + large:
+            threshold[i] = 1
+
+        self.size = n
+        self.threshold = [float(p) for p in threshold]
+        self.alias = alias
+        self.values = list(values) if values is not None else list(range(n))
+        # 每个桶: (阈值, 本桶结果值, 别名结果值)，热路径一次索引取齐；
+        # 调用方可缓存 (size, buckets) 自行内联采样以省去方法调用
+        self.buckets = [
+            (self.threshold[i], self.values[i], self.values[alias[i]]) for i in range(n)
+        ]
+        self._arrays = None
+
+    def sample_index(self, random_value: Callable[[], float]) -> int:
+        """
+        采样一个结果下标
+
+        Args:
+            random_value: 返回 [0, 1) 均匀随机数的函数（如 random.Random().random）
+
+        Returns:
+            int: 结果下标
+        """
+        scaled = random_value() * self.size
+        index = int(scaled)
+        if scaled - index < self.threshold[index]:
+            return index
+        return self.alias[index]
+
+    def sample(self, random_value: Callable[[], float]) -> Any:
+        """采样一个结果值（热路径，内联 sample_index）"""
+        scaled = random_value() * self.size
+        index = int(scaled)
+        threshold, value, alias_value = self.buckets[index]
+        return value if scaled - index < threshold else alias_value
+
+    def sample_indices(self, rng: "np.random.Generator", size: int) -> "np.ndarray":
+        """
+        批量采样结果下标
+
+        Args:
+            rng: numpy.random.Generator
+            size: 采样个数
+
+        Returns:
+            np.ndarray: 结果下标数组
+        """
+        _require_numpy()
+        if self._arrays is None:
+            self._arrays = (np.array(self.threshold), np.array(self.alias, dtype=np.int64))
+        threshold, alias = self._arrays
+        scaled = rng.random(size) * self.size
+        index = scaled.astype(np.int64)
+        return np.where(scaled - index < threshold[index], index, alias[index])
+
+    def probabilities(self) -> List[float]:
+        """别名表实际表示的各结果概率（用于校验）"""
+        probabilities = [0.0] * self.size
+        for i, (threshold, alias) in enumerate(zip(self.threshold, self.alias)):
+            probabilities[i] += threshold / self.size
+            probabilities[alias] += (1 - threshold) / self.size
+        return probabilities
@@ -0,0 +1,326 @@
+"""
+异步游戏会话模块
+基于 asyncio 的行协议会话服务器：DungeonMaster 的输入输出走异步流，
+战斗停顿使用异步时钟，单个进程即可同时承载大量游戏会话
+
+协议: 服务器逐行发送UTF-8文本，以 PROMPT_PREFIX 开头的行表示等待客户端输入，
+客户端回复一行文本作为输入
+"""
+
+import asyncio
+import random
+from typing import Any, Dict, Optional
+
+from .battle import Battle
+from .character_generator import (
+    CharacterDataLoader,
+    CharacterNameGenerator,
+    character_data_loader,
+    character_name_generator,
+)
+from .config_manager import game_config
+from .player import Player
+
+# 等待输入的提示行前缀
+PROMPT_PREFIX = "?> "
+
+
+class SessionClosed(ConnectionError):
+    """客户端已断开连接"""
+
+
+class AsyncDungeonMaster:
+    """通过异步流与玩家交互的DM，接口与 DungeonMaster 一致（input_prompt 为协程）"""
+
+    def __init__(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        game_info: Optional[Dict[str, Any]] = None,
+    ):
+        """
+        初始化DM
+
+        Args:
+            reader: 客户端输入流
+            writer: 客户端输出流
+            game_info: 游戏说明信息，默认使用全局配置
+        """
+        self.reader = reader
+        self.writer = writer
+        self.game_info = game_config.game_info if game_info is None else game_info
+        self.dm_name = self.game_info.get("dungeon_dm", "DM")
+        self.dm_name_en = self.game_info.get("dungeon_dm_en", "DM")
+
+    def print_intro(self):
+        self.print_message(self.game_info.get("game_intro", "欢迎来到游戏！"))
+
+    def print_game_logo_title(self):
+        self.print_message(self.game_info.get("game_logo_title", "游戏标题"))
+
+    def print_guide(self):
+        self.print_message(self.game_info.get("game_guide", "游戏指南内容"))
+
+    def print_exit_message(self):
+        self.print_message(self.game_info.get("game_exit", "感谢游玩！"))
+
+    async def input_prompt(self, prompt: str, with_dm: bool = False) -> str:
+        """
+        发送提示并等待客户端回复一行
+
+        Raises:
+            SessionClosed: 客户端已断开
+        """
+        if with_dm:
+            prompt = f"{self.dm_name}{':'}{prompt}"
+        self.writer.write(f"{PROMPT_PREFIX}{prompt}\n".encode("utf-8"))
+        await self.writer.drain()
+        line = await self.reader.readline()
+        if not line:
+            raise SessionClosed("客户端已断开连接")
+        return line.decode("utf-8", errors="replace").strip()
+
+    def print_message(self, message: str):
+        """写入一条消息（在下一次 input_prompt 或 drain 时发送）"""
+        self.writer.write(f"{message}\n".encode("utf-8"))
+
+    def log_message(self, message: str, with_dm: bool = False):
+        """与 print_message 相同，会话模式下不写本地日志文件"""
+        if with_dm:
+            message = f"{self.dm_name}{':'}{message}"
+        self.print_message(message)
+
+    async def drain(self):
+        await self.writer.drain()
+
+
+class GameSession:
+    """单个玩家的异步游戏会话（与 main.py 的交互流程一致）"""
+
+    def __init__(
+        self,
+        dungeon_master: AsyncDungeonMaster,
+        data_loader: Optional[CharacterDataLoader] = None,
+        name_generator: Optional[CharacterNameGenerator] = None,
+        battle_delay: Optional[float] = None,
+        seed: Optional[int] = None,
+        clock: Any = None,
+    ):
+        """
+        初始化会话
+
+        Args:
+            dungeon_master: 负责与该玩家交互的DM
+            data_loader: 角色数据加载器，默认使用全局实例
+            name_generator: 角色名称生成器，默认使用全局实例
+            battle_delay: 战斗回合之间的停顿秒数，默认读取 display.battle_delay_seconds
+            seed: 会话随机种子，默认随机
+            clock: 控制回合停顿的时钟，默认为真实时钟
+        """
+        self.dungeon_master = dungeon_master
+        self.data_loader = data_loader or character_data_loader
+        self.name_generator = name_generator or character_name_generator
+        self.battle_delay = battle_delay
+        self.clock = clock
+        self.rng = random.Random(seed)
+        self.battles_played = 0
+
+    async def run(self):
+        """主菜单循环，直到玩家退出"""
+        dm = self.dungeon_master
+        dm.print_game_logo_title()
+        dm.print_intro()
+        while True:
+            dm.print_message("\n请选择操作:")
+            dm.print_message("1. 开始新的战斗")
+            dm.print_message("2. 查看游戏说明")
+            dm.print_message("3. 退出游戏")
+            choice = await dm.input_prompt("请输入选项 (1-3): ")
+
+            if choice == "1":
+                await self.start_battle()
+                await dm.input_prompt("按回车键返回主菜单...")
+            elif choice == "2":
+                dm.print_guide()
+                await dm.input_prompt("按回车键返回主菜单...")
+            elif choice == "3":
+                dm.print_exit_message()
+                await dm.drain()
+                return
+            else:
+                dm.print_message("❌ 无效选择，请输入1、2或3")
+
+    async def select_character(self, characters: list) -> Player:
+        """让玩家选择角色和名称"""
+        dm = self.dungeon_master
+        dm.log_message(f"\n请选择你的角色职业:")
+        dm.log_message("-" * 50)
+        for i, char in enumerate(characters, 1):
+            dm.log_message(
+                f"{i}. {char['class']:8} | "
+                f"生命值: {char['health']:3} | "
+                f"攻击力: {char['attack']:2} | "
+                f"防御力: {char['defense']:2}"
+            )
+
+        while True:
+            choice = await dm.input_prompt(f"玩家请选择角色 (1-{len(characters)}): ")
+            if choice.isdigit() and 1 <= int(choice) <= len(characters):
+                char_data = characters[int(choice) - 1]
+                break
+            dm.log_message(f"❌ 请输入1到{len(characters)}之间的数字")
+
+        dm.log_message(f"\n已选择角色: {char_data['class']}")
+        name_choice = (await dm.input_prompt("是否使用随机角色名称？(y/n，默认n): ")).lower()
+        if name_choice in ["y", "yes", "是"]:
+            player_name = self.name_generator.get_random_name(rng=self.rng)
+            dm.log_message(f"🎲 随机角色名称: {player_name}")
+        else:
+            player_name = ""
+            while not player_name:
+                player_name = await dm.input_prompt("请输入你的角色名字: ")
+                if not player_name:
+                    dm.log_message("❌ 角色名字不能为空，请重新输入。")
+
+        return Player(
+            name=player_name,
+            character_class=char_data["class"],
+            health=char_data["health"],
+            attack=char_data["attack"],
+            defense=char_data["defense"],
+            speed=char_data["speed"],
+        )
+
+    async def start_battle(self) -> Dict[str, Any]:
+        """选择角色并与随机敌人战斗"""
+        dm = self.dungeon_master
+        characters = self.data_loader.get_character_presets()
+        dm.log_message("\n" + "=" * 60)
+        player1 = await self.select_character(characters)
+        player1.pre_name = "【玩家】"
+
+        enemy_data = self.rng.choice(characters)
+        enemy = Player(
+            name=self.name_generator.get_random_name(player1.name, rng=self.rng),
+            character_class=enemy_data["class"],
+            health=enemy_data["health"],
+            attack=enemy_data["attack"],
+            defense=enemy_data["defense"],
+            speed=enemy_data["speed"],
+        )
+        battle = Battle(
+            player1,
+            enemy,
+            dm,
+            rng=self.rng,
+            clock=self.clock,
+            battle_delay=self.battle_delay,
+        )
+        battle_result = await battle.fight_until_end_async()
+        self.battles_played += 1
+
+        summary = battle.get_battle_summary()
+        dm.log_message(f"\n📊 战斗统计:")
+        dm.log_message(
+            f"   {player1.name} 总伤害: {summary['player1_damage_dealt']} "
+            f"(暴击 {summary['player1_stats']['critical_hits']} 次)"
+        )
+        dm.log_message(
+            f"   {enemy.name} 总伤害: {summary['player2_damage_dealt']} "
+            f"(暴击 {summary['player2_stats']['critical_hits']} 次)"
+        )
+        return battle_result
+
+
+class BattleSessionServer:
+    """异步行协议会话服务器，每个TCP连接对应一个游戏会话"""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8765,
+        battle_delay: Optional[float] = None,
+        seed: Optional[int] = None,
+        backlog: int = 1024,
+        clock: Any = None,
+    ):
+        """
+        初始化服务器
+
+        Args:
+            host: 监听地址
+            port: 监听端口，0表示由系统分配
+            battle_delay: 战斗回合之间的停顿秒数，默认读取 display.battle_delay_seconds
+            seed: 主随机种子，指定时每个会话的种子依连接顺序确定
+            backlog: 监听队列长度，同时建立大量连接时需要足够大
+            clock: 所有会话共用的时钟，默认为真实时钟
+        """
+        self.host = host
+        self.port = port
+        self.backlog = backlog
+        self.clock = clock
+        self.battle_delay = battle_delay
+        self.seed = seed
+        self.active_sessions = 0
+        self.completed_sessions = 0
+        self.dropped_sessions = 0
+        # 因程序异常终止的会话（不影响其他会话）
+        self.failed_sessions = 0
+        self._connections = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> int:
+        """
+        开始监听
+
+        Returns:
+            int: 实际监听的端口
+        """
+        self._server = await asyncio.start_server(
+            self._handle_client,
+            self.host,
+            self.port,
+            limit=1 << 16,
+            backlog=self.backlog,
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self.port
+
+    async def serve_forever(self):
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def _handle_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ):
+        session_seed = None if self.seed is None else self.seed + self._connections
+        self._connections += 1
+        self.active_sessions += 1
+        session = GameSession(
+            AsyncDungeonMaster(reader, writer),
+            battle_delay=self.battle_delay,
+            seed=session_seed,
+            clock=self.clock,
+        )
+        try:
+            await session.run()
+            self.completed_sessions += 1
+        except (SessionClosed, ConnectionError):
+            self.dropped_sessions += 1
+        except Exception as e:
+            self.failed_sessions += 1
+            print(f"❌ 会话异常终止: {type(e).__name__}: {e}")
+        finally:
+            self.active_sessions -= 1
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
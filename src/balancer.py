@@ -0,0 +1,278 @@
+"""
+自动平衡模块
+在预设职业的 health / attack / defense 上做坐标搜索（模式搜索），
+使每对职业的胜率（平局计半场）逼近配置中的目标胜率
+
+每个候选只改变一个职业的一项属性，其余职业对的结果直接命中缓存；
+胜率以 (职业1属性, 职业2属性) 为键记忆化，利用 胜率(B,A) = 1 - 胜率(A,B) 只计算一个方向，
+重复出现的候选不再重新求解
+"""
+
+import json
+import os
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .battle_rules import BattleRules
+from .character_generator import CharacterDataLoader, character_data_loader
+from .config_manager import GameConfig, game_config
+from .exact_solver import solve_battle
+from .resource_path import get_project_root
+
+# 参与搜索的属性，顺序即属性元组的顺序
+BALANCED_STATS = ("health", "attack", "defense")
+
+EVALUATOR_EXACT = "exact"
+EVALUATOR_VECTORIZED = "vectorized"
+
+StatTuple = Tuple[int, int, int]
+
+
+def get_default_proposal_path() -> str:
+    """获取默认的平衡方案输出路径"""
+    return os.path.join(get_project_root(), "data", "character_data.proposed.json")
+
+
+class StatBalancer:
+    """预设职业属性自动平衡器"""
+
+    def __init__(
+        self,
+        presets: Optional[Sequence[Dict[str, Any]]] = None,
+        config: Optional[GameConfig] = None,
+        data_loader: Optional[CharacterDataLoader] = None,
+        rules: Optional[BattleRules] = None,
+        seed: int = 0,
+    ):
+        """
+        初始化平衡器
+
+        Args:
+            presets: 待平衡的角色预制数据，默认使用数据加载器中的全部预设
+            config: 游戏配置（读取 balance 部分），默认使用全局实例
+            data_loader: 角色数据加载器，默认使用全局实例
+            rules: 战斗规则，默认使用配置中的规则
+            seed: 向量化评估使用的固定种子（所有候选共用同一随机流）
+        """
+        config = config or game_config
+        if presets is None:
+            presets = (data_loader or character_data_loader).get_character_presets()
+        if len(presets) < 2:
+            raise ValueError("至少需要两个职业才能平衡")
+        self.presets = [dict(preset) for preset in presets]
+        self.classes = [preset["class"] for preset in self.presets]
+        self.rules = rules or config.get_battle_rules()
+        self.seed = seed
+
+        settings = config.get_balance_config()
+        self.target_win_rate = float(settings["target_win_rate"])
+        self.pair_targets = {
+            tuple(key.split("/", 1)): float(value)
+            for key, value in (settings.get("pair_targets") or {}).items()
+        }
+        self.tolerance = float(settings["tolerance"])
+        self.max_iterations = int(settings["max_iterations"])
+        self.evaluator = settings["evaluator"]
+        if self.evaluator not in (EVALUATOR_EXACT, EVALUATOR_VECTORIZED):
+            raise ValueError(f"未知评估方式: {self.evaluator}")
+        self.simulated_battles = int(settings["simulated_battles"])
+        self.step_sizes = {stat: int(settings["step_sizes"][stat]) for stat in BALANCED_STATS}
+        self.stat_bounds = {
+            stat: (int(settings["stat_bounds"][stat][0]), int(settings["stat_bounds"][stat][1]))
+            for stat in BALANCED_STATS
+        }
+
+        # (属性元组1, 属性元组2) -> 职业1的胜率
+        self._cache: Dict[Tuple[StatTuple, StatTuple], float] = {}
+        self.evaluations = 0
+        self.cache_hits = 0
+
+    @staticmethod
+    def stat_tuple(preset: Dict[str, Any]) -> StatTuple:
+        """提取参与搜索的属性元组"""
+        return tuple(int(preset[stat]) for stat in BALANCED_STATS)
+
+    def _evaluate(self, first: StatTuple, second: StatTuple) -> float:
+        """计算职业1对职业2的胜率（平局计半场）"""
+        player1 = dict(zip(BALANCED_STATS, first))
+        player2 = dict(zip(BALANCED_STATS, second))
+        if self.evaluator == EVALUATOR_EXACT:
+            result = solve_battle(player1, player2, rules=self.rules)
+            return float(result["player1_win"] + 0.5 * result["timeout"])
+
+        import numpy as np
+        from .battle_kernel import VectorizedBattleSimulator
+
+        stats = VectorizedBattleSimulator(player1, player2, rules=self.rules).run(
+            self.simulated_battles, rng=np.random.default_rng(self.seed)
+        )
+        return (stats.player1_wins + 0.5 * stats.timeouts) / stats.battles
+
+    def win_rate(self, first: StatTuple, second: StatTuple) -> float:
+        """
+        带记忆化的胜率
+
+        Args:
+            first: 职业1的 (health, attack, defense)
+            second: 职业2的 (health, attack, defense)
+
+        Returns:
+            float: 职业1的胜率（平局计半场）
+        """
+        key = (first, second)
+        rate = self._cache.get(key)
+        if rate is not None:
+            self.cache_hits += 1
+            return rate
+        rate = self._cache.get((second, first))
+        if rate is not None:
+            self.cache_hits += 1
+            return 1.0 - rate
+        self.evaluations += 1
+        rate = self._evaluate(first, second)
+        self._cache[key] = rate
+        return rate
+
+    def target(self, first_class: str, second_class: str) -> float:
+        """职业1对职业2的目标胜率"""
+        if (first_class, second_class) in self.pair_targets:
+            return self.pair_targets[(first_class, second_class)]
+        if (second_class, first_class) in self.pair_targets:
+            return 1.0 - self.pair_targets[(second_class, first_class)]
+        return self.target_win_rate
+
+    def pair_report(self, stats: Sequence[StatTuple]) -> List[Dict[str, Any]]:
+        """
+        每对职业的胜率与目标
+
+        Args:
+            stats: 与 self.classes 对应的属性元组
+
+        Returns:
+            List[Dict]: first, second, win_rate, target, error
+        """
+        report = []
+        for i in range(len(stats)):
+            for j in range(i + 1, len(stats)):
+                rate = self.win_rate(stats[i], stats[j])
+                target = self.target(self.classes[i], self.classes[j])
+                report.append(
+                    {
+                        "first": self.classes[i],
+                        "second": self.classes[j],
+                        "win_rate": rate,
+                        "target": target,
+                        "error": rate - target,
+                    }
+                )
+        return report
+
+    def loss(self, stats: Sequence[StatTuple]) -> Tuple[float, float]:
+        """
+        计算候选方案的损失
+
+        Returns:
+            (偏差平方和, 最大绝对偏差)
+        """
+        errors = [row["error"] for row in self.pair_report(stats)]
+        return sum(e * e for e in errors), max(abs(e) for e in errors)
+
+    def _neighbours(
+        self, stats: List[StatTuple], class_index: int, stat_index: int, step: int
+    ) -> List[List[StatTuple]]:
+        stat = BALANCED_STATS[stat_index]
+        low, high = self.stat_bounds[stat]
+        current = stats[class_index][stat_index]
+        candidates = []
+        for value in (current + step, current - step):
+            value = min(max(value, low), high)
+            if value == current:
+                continue
+            changed = list(stats[class_index])
+            changed[stat_index] = value
+            candidate = list(stats)
+            candidate[class_index] = tuple(changed)
+            candidates.append(candidate)
+        return candidates
+
+    def optimize(
+        self,
+        max_iterations: Optional[int] = None,
+        progress: Optional[Callable[[int, float, float], None]] = None,
+    ) -> Dict[str, Any]:
+        """
+        坐标搜索：依次尝试每个职业每项属性 ±步长，接受使损失下降最多的一侧；
+        一整轮没有改进时步长减半，步长均为1仍无改进或偏差进入容差时停止
+
+        Args:
+            max_iterations: 最大轮数，默认读取配置
+            progress: 每轮结束后的回调 (轮数, 偏差平方和, 最大偏差)
+
+        Returns:
+            Dict: presets（新预设）、initial_loss、final_loss、max_error、iterations、evaluations、cache_hits
+        """
+        if max_iterations is None:
+            max_iterations = self.max_iterations
+        stats = [self.stat_tuple(preset) for preset in self.presets]
+        steps = dict(self.step_sizes)
+        loss, max_error = self.loss(stats)
+        initial_loss = loss
+
+        iterations = 0
+        while iterations < max_iterations and max_error > self.tolerance:
+            iterations += 1
+            improved = False
+            for class_index in range(len(stats)):
+                for stat_index, stat in enumerate(BALANCED_STATS):
+                    best = None
+                    for candidate in self._neighbours(stats, class_index, stat_index, steps[stat]):
+                        candidate_loss, candidate_max = self.loss(candidate)
+                        if candidate_loss < loss - 1e-12 and (
+                            best is None or candidate_loss < best[0]
+                        ):
+                            best = (candidate_loss, candidate_max, candidate)
+                    if best is not None:
+                        loss, max_error, stats = best
+                        improved = True
+            if progress is not None:
+                progress(iterations, loss, max_error)
+            if not improved:
+                if all(step == 1 for step in steps.values()):
+                    break
+                steps = {stat: max(1, step // 2) for stat, step in steps.items()}
+
+        presets = []
+        for preset, values in zip(self.presets, stats):
+            proposed = dict(preset)
+            proposed.update(zip(BALANCED_STATS, values))
+            presets.append(proposed)
+        return {
+            "presets": presets,
+            "initial_loss": initial_loss,
+            "final_loss": loss,
+            "max_error": max_error,
+            "iterations": iterations,
+            "evaluations": self.evaluations,
+            "cache_hits": self.cache_hits,
+        }
+
+    @staticmethod
+    def write_proposal(presets: Sequence[Dict[str, Any]], path: Optional[str] = None) -> str:
+        """
+        以 character_data.json 的格式写出平衡方案
+
+        Args:
+            presets: optimize 返回的新预设
+            path: 输出路径，默认为 data/character_data.proposed.json
+
+        Returns:
+            str: 写入的文件路径
+        """
+        path = path or get_default_proposal_path()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({"character_presets": list(presets)}, f, ensure_ascii=False, indent=4)
+        os.replace(temp_path, path)
+        return path
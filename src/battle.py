@@ -3,44 +3,116 @@
 处理1v1战斗逻辑，包括回合制战斗和战斗结果
 """
 
-import random
-import time
-from typing import List, Dict, Any, Optional
+import math
+from typing import List, Dict, Any, Optional, Tuple
 
 from src.dungeon_master import DungeonMaster
-from .player import Player
+from .player import Player, FastPlayer
+from .battle_log import BattleEventLog, RoundView, EVENT_FIELDS
+from .battle_stats import BattleStats
+from .battle_rules import BattleRules
+from .clock import real_clock
+from .config_manager import game_config
+from .rng import as_random_source
+
+
+# 批量模拟结果中的胜负编码
+OUTCOME_TIMEOUT = 0
+OUTCOME_PLAYER1_WIN = 1
+OUTCOME_PLAYER2_WIN = 2
+
+# 每回合开始前的输入提示
+ROUND_PROMPT = "回车键继续下一回合（输入A进入自动模式）..."
 
 
 class Battle:
     """1v1战斗类"""
 
-    def __init__(self, player1: Player, player2: Player, dungeon_master: DungeonMaster):
+    def __init__(
+        self,
+        player1: Player,
+        player2: Player,
+        dungeon_master: Optional[DungeonMaster] = None,
+        rng: Any = None,
+        log_sink: Any = None,
+        log_retention: Optional[int] = None,
+        battle_id: int = 0,
+        rules: Optional[BattleRules] = None,
+        clock: Any = None,
+        battle_delay: Optional[float] = None,
+        auto_advance: Optional[bool] = None,
+    ):
         """
         初始化战斗
 
         Args:
             player1: 玩家1
             player2: 玩家2
-            log_func: 日志输出函数（默认print）
+            dungeon_master: 地下城DM，负责输出战斗信息（无界面模拟时可为None）
+            rng: 本场战斗独立的随机数源，指定时双方角色也改用该随机数源；
+                默认使用全局 random
+            log_sink: 流式日志写入器（如 JsonlBattleLogSink），每回合结束时写入
+            log_retention: battle_log 在内存中保留的回合数，None表示全部保留，
+                0表示战斗结束后不保留（进行中的当前回合始终可读）
+            battle_id: 写入流式日志时使用的战斗编号
+            rules: 战斗规则，指定时双方角色也改用该规则；默认使用全局配置中的规则
+            clock: 控制回合停顿的时钟（RealClock / AcceleratedClock / VirtualClock），
+                默认为真实时钟
+            battle_delay: 回合之间的停顿秒数，默认读取 display.battle_delay_seconds
+            auto_advance: 是否无需输入自动推进回合，默认读取 display.auto_advance_battle
         """
         self.player1 = player1
         self.player2 = player2
-        self.battle_log: List[Dict[str, Any]] = []
+        self.battle_log = BattleEventLog((player1, player2))
+        self.stats = BattleStats(2)
         self.round_number = 0
         self.winner: Optional[Player] = None
         self.battle_ended = False
         self.dungeon_master = dungeon_master
+        self.log_sink = log_sink
+        self.log_retention = log_retention
+        self.battle_id = battle_id
+        # 玩家在战斗中的输入: (输入后执行的回合数, 输入内容)，供回放使用
+        self.inputs: List[Tuple[int, str]] = []
+        display_config = game_config.get_display_config()
+        self.clock = clock or real_clock
+        self.battle_delay = (
+            display_config["battle_delay_seconds"] if battle_delay is None else battle_delay
+        )
+        self.auto_advance_default = (
+            display_config["auto_advance_battle"] if auto_advance is None else auto_advance
+        )
+        self.auto_advance = self.auto_advance_default
+        self.rng = as_random_source(rng)
+        if rng is not None:
+            player1.rng = self.rng
+            player2.rng = self.rng
+        self.rules = rules or game_config.get_battle_rules()
+        if rules is not None:
+            player1.rules = rules
+            player2.rules = rules
+
+    def reset(self) -> None:
+        """重置战斗状态（同时恢复双方血量），用于重复模拟同一对局"""
+        self.player1.reset()
+        self.player2.reset()
+        self.battle_log = BattleEventLog((self.player1, self.player2))
+        self.stats = BattleStats(2)
+        self.round_number = 0
+        self.winner = None
+        self.battle_ended = False
+        self.inputs = []
 
     def determine_turn_order(self) -> List[Player]:
         """
-        确定行动顺序（基于速度，这里简单随机）
+        确定行动顺序（每回合随机先手）
 
         Returns:
             按行动顺序排列的玩家列表
         """
-        # 这里可以基于角色的敏捷属性来决定，目前简单随机
+        # 1v1 Battle 有意保留每回合掷硬币决定先手；speed 属性只在 TimelineBattle 的行动时间轴中生效
         players = [self.player1, self.player2]
-        random.shuffle(players)
+        self.rng.shuffle(players)
         return players
 
     def execute_round(self) -> Dict[str, Any]:
@@ -48,13 +120,23 @@ class Battle:
         执行一个战斗回合
 
         Returns:
-            回合结果信息
+            回合结果信息（与 battle_log 中条目相同的只读字典视图）
         """
         if self.battle_ended:
             return {"error": "Battle has already ended"}
 
         self.round_number += 1
-        round_log = {"round": self.round_number, "actions": []}
+        round_number = self.round_number
+        battle_log = self.battle_log
+        if self.log_retention is not None:
+            battle_log.trim(max(self.log_retention - 1, 0))
+        if round_number == 1 and self.log_sink is not None:
+            self.log_sink.begin_battle(self.battle_id, battle_log.combatants)
+        # 直接写入日志数组（等价于 begin_round / record，省去方法调用开销）
+        events = battle_log.events
+        battle_log.round_index.extend(
+            (round_number, battle_log.dropped_actions + len(events) // EVENT_FIELDS)
+        )
 
         # 确定行动顺序
         turn_order = self.determine_turn_order()
@@ -64,14 +146,35 @@ class Battle:
                 continue
 
             # 确定目标
-            target = self.player2 if attacker == self.player1 else self.player1
+            if attacker is self.player1:
+                target, attacker_index, target_index = self.player2, 0, 1
+            else:
+                target, attacker_index, target_index = self.player1, 1, 0
 
             if not target.is_alive:
                 continue
 
             # 执行攻击
-            attack_result = attacker.attack_target(target)
-            round_log["actions"].append(attack_result)
+            target_health_before = target.current_health
+            base_damage, actual_damage, is_critical = attacker.strike(target)
+            self.stats.record_hit(
+                attacker_index,
+                target_index,
+                actual_damage,
+                is_critical,
+                target_health_before,
+            )
+            events.extend(
+                (
+                    round_number,
+                    attacker_index,
+                    target_index,
+                    base_damage,
+                    actual_damage,
+                    is_critical,
+                    target.current_health,
+                )
+            )
 
             # 检查战斗是否结束
             if not target.is_alive:
@@ -79,19 +182,72 @@ class Battle:
                 self.battle_ended = True
                 break
 
-        self.battle_log.append(round_log)
-        return round_log
+        self.stats.end_round((self.player1.is_alive, self.player2.is_alive))
+        round_view = RoundView(battle_log, len(battle_log) - 1)
+        if self.log_sink is not None:
+            self.log_sink.write_round(self.battle_id, round_view)
+        return round_view
 
-    def fight_until_end(self, max_rounds: int = 50) -> Dict[str, Any]:
+    def fight_until_end(self, max_rounds: Optional[int] = None) -> Dict[str, Any]:
         """
         战斗直到有一方败北
 
         Args:
-            max_rounds: 最大回合数（防止无限战斗）
+            max_rounds: 最大回合数（防止无限战斗），默认使用战斗规则中的设置
 
         Returns:
             战斗结果
         """
+        if max_rounds is None:
+            max_rounds = self.rules.max_rounds
+        self._display_battle_start()
+        while not self.battle_ended and self.round_number < max_rounds:
+            if not self.auto_advance:
+                self._handle_input(self.dungeon_master.input_prompt(ROUND_PROMPT))
+
+            self._play_round()
+
+            if not self.battle_ended:
+                self.clock.sleep(self.battle_delay)  # 短暂停顿
+
+        # 战斗结束
+        return self._finish_fight(max_rounds)
+
+    async def fight_until_end_async(
+        self, max_rounds: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        fight_until_end 的异步版本，供会话服务器在同一事件循环中运行大量战斗
+
+        dungeon_master.input_prompt 必须是协程，回合之间通过 clock.async_sleep 停顿；
+        dungeon_master 提供 drain 协程时每回合等待一次，自动战斗（停顿为0）的输出也受传输层背压约束，
+        慢速客户端不会让服务器无限缓冲
+
+        Args:
+            max_rounds: 最大回合数，默认使用战斗规则中的设置
+
+        Returns:
+            战斗结果
+        """
+        if max_rounds is None:
+            max_rounds = self.rules.max_rounds
+        self._display_battle_start()
+        drain = getattr(self.dungeon_master, "drain", None)
+        while not self.battle_ended and self.round_number < max_rounds:
+            if not self.auto_advance:
+                self._handle_input(await self.dungeon_master.input_prompt(ROUND_PROMPT))
+
+            self._play_round()
+            if drain is not None:
+                await drain()
+
+            if not self.battle_ended:
+                await self.clock.async_sleep(self.battle_delay)
+
+        return self._finish_fight(max_rounds)
+
+    def _display_battle_start(self):
+        """显示开场信息和初始状态"""
         self.dungeon_master.log_message(f"\n🔥 战斗开始！🔥")
         self.dungeon_master.log_message(
             f"{self.player1.get_full_name()} VS {self.player2.get_full_name()}"
@@ -100,29 +256,29 @@ class Battle:
 
         # 显示初始状态
         self._display_battle_status()
-        self.auto_advance = False
-        while not self.battle_ended and self.round_number < max_rounds:
-            if not self.auto_advance:
-                choice = input("\n回车键继续下一回合（输入A进入自动模式）...")
-                if choice.strip().lower() == "a":
-                    self.dungeon_master.log_message("进入自动战斗模式...")
-                    self.auto_advance = True
-                else:
-                    self.auto_advance = False
-
-            round_result = self.execute_round()
-            # 显示回合结果
-            self._display_round_result(round_result)
-            # 显示当前状态
-            self._display_battle_status()
-
-            if not self.battle_ended:
-                time.sleep(1)  # 短暂停顿
+        self.auto_advance = self.auto_advance_default
+
+    def _handle_input(self, choice: str):
+        """记录玩家输入，输入A进入自动战斗模式"""
+        self.inputs.append((self.round_number + 1, choice))
+        if choice.strip().lower() == "a":
+            self.dungeon_master.log_message("进入自动战斗模式...")
+            self.auto_advance = True
+        else:
+            self.auto_advance = False
+
+    def _play_round(self):
+        """执行并显示一个回合"""
+        round_result = self.execute_round()
+        # 显示回合结果
+        self._display_round_result(round_result)
+        # 显示当前状态
+        self._display_battle_status()
 
-        # 战斗结束
+    def _finish_fight(self, max_rounds: int) -> Dict[str, Any]:
+        """生成并显示战斗结果"""
         battle_result = self._generate_battle_result(max_rounds)
         self._display_battle_end(battle_result)
-
         return battle_result
 
     def _display_battle_status(self):
@@ -170,6 +326,8 @@ class Battle:
 
     def _generate_battle_result(self, max_rounds: int) -> Dict[str, Any]:
         """生成战斗结果"""
+        if self.log_retention is not None:
+            self.battle_log.trim(self.log_retention)
         if self.winner:
             return {
                 "outcome": "victory",
@@ -192,21 +350,222 @@ class Battle:
             }
 
     def get_battle_summary(self) -> Dict[str, Any]:
-        """获取战斗摘要"""
-        total_damage_p1 = 0
-        total_damage_p2 = 0
-
-        for round_data in self.battle_log:
-            for action in round_data["actions"]:
-                if action["attacker"] == self.player1.name:
-                    total_damage_p1 += action["actual_damage"]
-                else:
-                    total_damage_p2 += action["actual_damage"]
-
+        """获取战斗摘要（基于增量统计，可在每回合后随时调用）"""
+        player1_stats = self.stats[0]
+        player2_stats = self.stats[1]
         return {
             "total_rounds": self.round_number,
-            "player1_damage_dealt": total_damage_p1,
-            "player2_damage_dealt": total_damage_p2,
+            "player1_damage_dealt": player1_stats.damage_dealt,
+            "player2_damage_dealt": player2_stats.damage_dealt,
+            "player1_stats": player1_stats.to_dict(),
+            "player2_stats": player2_stats.to_dict(),
             "winner": self.winner.name if self.winner else None,
             "battle_ended": self.battle_ended,
         }
+
+
+class BattleOutcomeStats:
+    """批量战斗结果统计，整数计数，可与其他统计结果合并"""
+
+    def __init__(self, max_rounds: int = 50):
+        """
+        初始化统计
+
+        Args:
+            max_rounds: 单场战斗最大回合数，决定回合分布直方图的长度
+        """
+        self.max_rounds = max_rounds
+        self.battles = 0
+        self.player1_wins = 0
+        self.player2_wins = 0
+        self.timeouts = 0
+        # round_histogram[r] 为恰好在第r回合结束的战斗场数
+        self.round_histogram: List[int] = [0] * (max_rounds + 1)
+        # 双方造成的有效伤害总和（不含溢出伤害）
+        self.player1_damage = 0
+        self.player2_damage = 0
+
+    def record(
+        self, outcome: int, rounds: int, player1_damage: int, player2_damage: int
+    ) -> None:
+        """
+        记录一场战斗结果
+
+        Args:
+            outcome: OUTCOME_TIMEOUT / OUTCOME_PLAYER1_WIN / OUTCOME_PLAYER2_WIN
+            rounds: 战斗持续回合数
+            player1_damage: 玩家1造成的有效伤害
+            player2_damage: 玩家2造成的有效伤害
+        """
+        self.battles += 1
+        if outcome == OUTCOME_PLAYER1_WIN:
+            self.player1_wins += 1
+        elif outcome == OUTCOME_PLAYER2_WIN:
+            self.player2_wins += 1
+        else:
+            self.timeouts += 1
+        self.round_histogram[rounds] += 1
+        self.player1_damage += player1_damage
+        self.player2_damage += player2_damage
+
+    def merge(self, other: "BattleOutcomeStats") -> "BattleOutcomeStats":
+        """
+        合并另一份统计结果（原地修改并返回自身）
+
+        Args:
+            other: 需要合并的统计结果，max_rounds必须一致
+        """
+        if other.max_rounds != self.max_rounds:
+            raise ValueError("无法合并最大回合数不同的统计结果")
+        self.battles += other.battles
+        self.player1_wins += other.player1_wins
+        self.player2_wins += other.player2_wins
+        self.timeouts += other.timeouts
+        for i, count in enumerate(other.round_histogram):
+            self.round_histogram[i] += count
+        self.player1_damage += other.player1_damage
+        self.player2_damage += other.player2_damage
+        return self
+
+    def mean_rounds(self) -> float:
+        """平均回合数"""
+        if self.battles == 0:
+            return 0.0
+        total = sum(r * count for r, count in enumerate(self.round_histogram))
+        return total / self.battles
+
+    def rounds_percentile(self, percentile: float) -> int:
+        """
+        回合数分位数（最近秩法）
+
+        Args:
+            percentile: 分位数百分比 (0-100)
+        """
+        if self.battles == 0:
+            return 0
+        rank = max(1, math.ceil(self.battles * percentile / 100))
+        cumulative = 0
+        for rounds, count in enumerate(self.round_histogram):
+            cumulative += count
+            if cumulative >= rank:
+                return rounds
+        return self.max_rounds
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为结果字典"""
+        battles = self.battles or 1
+        return {
+            "battles": self.battles,
+            "player1_wins": self.player1_wins,
+            "player2_wins": self.player2_wins,
+            "timeouts": self.timeouts,
+            "player1_win_rate": self.player1_wins / battles,
+            "player2_win_rate": self.player2_wins / battles,
+            "timeout_rate": self.timeouts / battles,
+            "mean_rounds": self.mean_rounds(),
+            "rounds_p50": self.rounds_percentile(50),
+            "rounds_p90": self.rounds_percentile(90),
+            "rounds_p99": self.rounds_percentile(99),
+            "player1_damage_dealt": self.player1_damage,
+            "player2_damage_dealt": self.player2_damage,
+            "round_histogram": list(self.round_histogram),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "BattleOutcomeStats":
+        """从 to_dict 生成的字典恢复统计结果"""
+        histogram = [int(count) for count in data["round_histogram"]]
+        stats = cls(max_rounds=len(histogram) - 1)
+        stats.battles = int(data["battles"])
+        stats.player1_wins = int(data["player1_wins"])
+        stats.player2_wins = int(data["player2_wins"])
+        stats.timeouts = int(data["timeouts"])
+        stats.round_histogram = histogram
+        stats.player1_damage = int(data["player1_damage_dealt"])
+        stats.player2_damage = int(data["player2_damage_dealt"])
+        return stats
+
+
+class BattleSimulator:
+    """无界面批量战斗模拟器：不输出、不等待、不渲染回合"""
+
+    def __init__(
+        self,
+        player1_data: Dict[str, Any],
+        player2_data: Dict[str, Any],
+        max_rounds: Optional[int] = None,
+        log_sink: Any = None,
+        rules: Optional[BattleRules] = None,
+        damage_tables: bool = False,
+    ):
+        """
+        初始化模拟器
+
+        Args:
+            player1_data: 玩家1角色数据（包含 class, health, attack, defense）
+            player2_data: 玩家2角色数据
+            max_rounds: 单场战斗最大回合数，默认使用战斗规则中的设置
+            log_sink: 流式日志写入器，指定时每场战斗的每个回合都会写入，
+                内存中不保留已结束的回合
+            rules: 战斗规则，默认使用全局配置中的规则
+            damage_tables: 角色是否用伤害概率表采样伤害
+        """
+        self.player1_data = player1_data
+        self.player2_data = player2_data
+        self.rules = rules or game_config.get_battle_rules()
+        self.max_rounds = self.rules.max_rounds if max_rounds is None else max_rounds
+        self.log_sink = log_sink
+        self.damage_tables = damage_tables
+
+    def _create_player(self, name: str, char_data: Dict[str, Any]) -> FastPlayer:
+        return FastPlayer(
+            name=name,
+            character_class=char_data["class"],
+            health=char_data["health"],
+            attack=char_data["attack"],
+            defense=char_data["defense"],
+            rules=self.rules,
+            damage_tables=self.damage_tables,
+        )
+
+    def run(self, battles: int, rng: Any = None) -> BattleOutcomeStats:
+        """
+        连续模拟多场战斗
+
+        Args:
+            battles: 模拟场数
+            rng: 随机数源（random.Random、numpy Generator 等），默认使用全局 random
+
+        Returns:
+            BattleOutcomeStats: 汇总统计结果
+        """
+        stats = BattleOutcomeStats(self.max_rounds)
+        player1 = self._create_player("P1", self.player1_data)
+        player2 = self._create_player("P2", self.player2_data)
+        battle = Battle(player1, player2, rng=rng, rules=self.rules)
+        if self.log_sink is not None:
+            battle.log_sink = self.log_sink
+            battle.log_retention = 0
+        max_rounds = self.max_rounds
+
+        for battle_id in range(battles):
+            battle.reset()
+            battle.battle_id = battle_id
+            execute_round = battle.execute_round
+            while not battle.battle_ended and battle.round_number < max_rounds:
+                execute_round()
+
+            if battle.winner is None:
+                outcome = OUTCOME_TIMEOUT
+            elif battle.winner is player1:
+                outcome = OUTCOME_PLAYER1_WIN
+            else:
+                outcome = OUTCOME_PLAYER2_WIN
+            stats.record(
+                outcome,
+                battle.round_number,
+                player2.max_health - player2.current_health,
+                player1.max_health - player1.current_health,
+            )
+
+        return stats
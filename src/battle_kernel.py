@@ -0,0 +1,249 @@
+"""
+向量化战斗内核模块
+使用 NumPy 数组同时模拟大量相互独立的1v1战斗，
+规则与 Battle.execute_round / Player.attack_target 完全一致
+"""
+
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # numpy 为可选依赖，仅向量化引擎需要
+    np = None
+
+from .battle import (
+    BattleOutcomeStats,
+    OUTCOME_PLAYER1_WIN,
+    OUTCOME_PLAYER2_WIN,
+    OUTCOME_TIMEOUT,
+)
+from .battle_rules import BattleRules, DEFAULT_BATTLE_RULES
+from .config_manager import game_config
+
+if TYPE_CHECKING:
+    from .damage_table import DamageTable
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError("向量化战斗引擎需要安装 numpy (pipenv install numpy)")
+
+
+def roll_damage(
+    attack, defense, rng, rules: BattleRules = DEFAULT_BATTLE_RULES
+) -> "np.ndarray":
+    """
+    批量计算一次攻击造成的实际伤害
+
+    与 Player.attack_target + Player.take_damage 相同：
+    按规则的浮动范围取整，按暴击概率乘以暴击倍率取整，实际伤害 max(1, 伤害 - 防御)
+
+    Args:
+        attack: 攻击方攻击力数组
+        defense: 目标防御力数组
+        rng: numpy.random.Generator
+        rules: 战斗规则
+
+    Returns:
+        np.ndarray: 每场战斗本次攻击的实际伤害
+    """
+    size = len(attack)
+    damage_multiplier = (
+        rules.damage_variance_min + rules.damage_variance_span * rng.random(size)
+    )
+    base_damage = (attack * damage_multiplier).astype(np.int64)
+    is_critical = rng.random(size) < rules.critical_hit_chance
+    base_damage = np.where(
+        is_critical,
+        (base_damage * rules.critical_hit_multiplier).astype(np.int64),
+        base_damage,
+    )
+    return np.maximum(1, base_damage - defense)
+
+
+def _scalar_damage_table(
+    attacker: Dict[str, Any], target: Dict[str, Any], rules: BattleRules
+) -> Optional["DamageTable"]:
+    """攻防均为标量时返回伤害概率表，任一方按场次给出数组时返回None"""
+    attack = attacker["attack"]
+    defense = target["defense"]
+    if np.ndim(attack) or np.ndim(defense):
+        return None
+    return rules.damage_table(int(attack), int(defense))
+
+
+def simulate_battles(
+    battles: int,
+    player1: Dict[str, Any],
+    player2: Dict[str, Any],
+    max_rounds: Optional[int] = None,
+    rng: Optional["np.random.Generator"] = None,
+    rules: Optional[BattleRules] = None,
+    damage_tables: bool = False,
+) -> Tuple["np.ndarray", "np.ndarray", "np.ndarray", "np.ndarray"]:
+    """
+    同时模拟多场独立战斗
+
+    Args:
+        battles: 战斗场数
+        player1: 玩家1属性，health/attack/defense 可以是标量或长度为 battles 的数组
+        player2: 玩家2属性
+        max_rounds: 单场最大回合数，默认使用战斗规则中的设置
+        rng: numpy.random.Generator，为None时使用新的随机生成器
+        rules: 战斗规则，默认使用全局配置中的规则
+        damage_tables: 是否用伤害概率表采样（每次攻击一次随机数）；
+            仅对攻防均为标量的一方生效，按场次给出数组时仍逐次掷骰
+
+    Returns:
+        (outcome, rounds, player1_damage, player2_damage) 四个数组，
+        outcome 取值为 OUTCOME_* 常量，damage 为有效伤害（不含溢出）
+    """
+    _require_numpy()
+    if rng is None:
+        rng = np.random.default_rng()
+    if rules is None:
+        rules = game_config.get_battle_rules()
+    if max_rounds is None:
+        max_rounds = rules.max_rounds
+
+    def column(data: Dict[str, Any], key: str) -> "np.ndarray":
+        return np.broadcast_to(np.asarray(data[key], dtype=np.int64), (battles,))
+
+    health1, attack1, defense1 = (column(player1, k) for k in ("health", "attack", "defense"))
+    health2, attack2, defense2 = (column(player2, k) for k in ("health", "attack", "defense"))
+
+    table_by_1 = table_by_2 = None
+    if damage_tables:
+        table_by_1 = _scalar_damage_table(player1, player2, rules)
+        table_by_2 = _scalar_damage_table(player2, player1, rules)
+
+    hp1 = health1.copy()
+    hp2 = health2.copy()
+    outcome = np.full(battles, OUTCOME_TIMEOUT, dtype=np.int8)
+    rounds = np.full(battles, max_rounds, dtype=np.int32)
+    active = np.arange(battles)
+
+    for round_number in range(1, max_rounds + 1):
+        if active.size == 0:
+            break
+
+        h1 = hp1[active]
+        h2 = hp2[active]
+        if table_by_1 is not None:
+            damage_by_1 = table_by_1.sample_actual(rng, active.size)
+        else:
+            damage_by_1 = roll_damage(attack1[active], defense2[active], rng, rules)
+        if table_by_2 is not None:
+            damage_by_2 = table_by_2.sample_actual(rng, active.size)
+        else:
+            damage_by_2 = roll_damage(attack2[active], defense1[active], rng, rules)
+        # 随机行动顺序，双方先手概率各50%
+        player1_first = rng.random(active.size) < 0.5
+
+        # 先手攻击
+        h2 = np.where(player1_first, h2 - damage_by_1, h2)
+        h1 = np.where(player1_first, h1, h1 - damage_by_2)
+        # 后手存活时才会反击
+        second_acts = np.where(player1_first, h2 > 0, h1 > 0)
+        h1 = np.where(player1_first & second_acts, h1 - damage_by_2, h1)
+        h2 = np.where(~player1_first & second_acts, h2 - damage_by_1, h2)
+
+        hp1[active] = h1
+        hp2[active] = h2
+
+        player1_won = h2 <= 0
+        player2_won = h1 <= 0
+        ended = player1_won | player2_won
+        ended_index = active[ended]
+        outcome[active[player1_won]] = OUTCOME_PLAYER1_WIN
+        outcome[active[player2_won]] = OUTCOME_PLAYER2_WIN
+        rounds[ended_index] = round_number
+        active = active[~ended]
+
+    player1_damage = health2 - np.maximum(hp2, 0)
+    player2_damage = health1 - np.maximum(hp1, 0)
+    return outcome, rounds, player1_damage, player2_damage
+
+
+def stats_from_arrays(
+    outcome: "np.ndarray",
+    rounds: "np.ndarray",
+    player1_damage: "np.ndarray",
+    player2_damage: "np.ndarray",
+    max_rounds: int,
+) -> BattleOutcomeStats:
+    """将 simulate_battles 的结果数组汇总为 BattleOutcomeStats"""
+    _require_numpy()
+    stats = BattleOutcomeStats(max_rounds)
+    stats.battles = int(outcome.size)
+    stats.player1_wins = int(np.count_nonzero(outcome == OUTCOME_PLAYER1_WIN))
+    stats.player2_wins = int(np.count_nonzero(outcome == OUTCOME_PLAYER2_WIN))
+    stats.timeouts = stats.battles - stats.player1_wins - stats.player2_wins
+    stats.round_histogram = np.bincount(rounds, minlength=max_rounds + 1).tolist()
+    stats.player1_damage = int(player1_damage.sum())
+    stats.player2_damage = int(player2_damage.sum())
+    return stats
+
+
+class VectorizedBattleSimulator:
+    """基于 NumPy 的批量战斗模拟器，接口与 BattleSimulator 一致"""
+
+    def __init__(
+        self,
+        player1_data: Dict[str, Any],
+        player2_data: Dict[str, Any],
+        max_rounds: Optional[int] = None,
+        batch_size: int = 1 << 16,
+        rules: Optional[BattleRules] = None,
+        damage_tables: bool = False,
+    ):
+        """
+        初始化模拟器
+
+        Args:
+            player1_data: 玩家1角色数据（包含 class, health, attack, defense）
+            player2_data: 玩家2角色数据
+            max_rounds: 单场战斗最大回合数，默认使用战斗规则中的设置
+            batch_size: 每批同时模拟的战斗场数，限制内存占用
+            rules: 战斗规则，默认使用全局配置中的规则
+            damage_tables: 是否用伤害概率表采样伤害
+        """
+        _require_numpy()
+        self.player1_data = player1_data
+        self.player2_data = player2_data
+        self.rules = rules or game_config.get_battle_rules()
+        self.max_rounds = self.rules.max_rounds if max_rounds is None else max_rounds
+        self.batch_size = batch_size
+        self.damage_tables = damage_tables
+
+    def run(
+        self, battles: int, rng: Optional["np.random.Generator"] = None
+    ) -> BattleOutcomeStats:
+        """
+        模拟多场战斗
+
+        Args:
+            battles: 模拟场数
+            rng: numpy.random.Generator，为None时使用新的随机生成器
+
+        Returns:
+            BattleOutcomeStats: 汇总统计结果
+        """
+        if rng is None:
+            rng = np.random.default_rng()
+        stats = BattleOutcomeStats(self.max_rounds)
+        remaining = battles
+        while remaining > 0:
+            size = min(remaining, self.batch_size)
+            arrays = simulate_battles(
+                size,
+                self.player1_data,
+                self.player2_data,
+                self.max_rounds,
+                rng,
+                self.rules,
+                self.damage_tables,
+            )
+            stats.merge(stats_from_arrays(*arrays, self.max_rounds))
+            remaining -= size
+        return stats
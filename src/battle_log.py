@@ -0,0 +1,382 @@
+"""
+战斗日志模块
+使用定长类型数组存储战斗事件，避免每次攻击创建字典和格式化字符串；
+按需生成与原先回合字典格式一致的只读视图。
+日志可以只在内存中保留最近若干回合，并通过流式写入器逐回合写入 JSONL 或二进制文件
+"""
+
+import json
+import struct
+from array import array
+from collections.abc import Mapping, Sequence
+from typing import Any, Dict, Iterator, List, Tuple
+
+# 视图中每个行动的字段，与 Player.attack_target 返回的字典一致
+ACTION_KEYS = (
+    "attacker",
+    "target",
+    "base_damage",
+    "actual_damage",
+    "is_critical",
+    "target_health",
+    "target_alive",
+)
+ROUND_KEYS = ("round", "actions")
+
+# 事件数组中每条记录的字段顺序
+EVENT_ROUND = 0
+EVENT_ATTACKER = 1
+EVENT_TARGET = 2
+EVENT_BASE_DAMAGE = 3
+EVENT_ACTUAL_DAMAGE = 4
+EVENT_CRITICAL = 5
+EVENT_TARGET_HEALTH = 6
+EVENT_FIELDS = 7
+
+
+def _display_name(combatant: Any) -> str:
+    return f"{combatant.pre_name} {combatant.last_name}"
+
+
+class ActionView(Mapping):
+    """单次攻击事件的只读字典视图，名称在访问时才格式化"""
+
+    __slots__ = ("_log", "_offset")
+
+    def __init__(self, log: "BattleEventLog", index: int):
+        self._log = log
+        self._offset = index * EVENT_FIELDS
+
+    def __getitem__(self, key: str) -> Any:
+        events, offset = self._log.events, self._offset
+        if key == "attacker":
+            return _display_name(self._log.combatants[events[offset + EVENT_ATTACKER]])
+        if key == "target":
+            return _display_name(self._log.combatants[events[offset + EVENT_TARGET]])
+        if key == "base_damage":
+            return events[offset + EVENT_BASE_DAMAGE]
+        if key == "actual_damage":
+            return events[offset + EVENT_ACTUAL_DAMAGE]
+        if key == "is_critical":
+            return bool(events[offset + EVENT_CRITICAL])
+        if key == "target_health":
+            return events[offset + EVENT_TARGET_HEALTH]
+        if key == "target_alive":
+            return events[offset + EVENT_TARGET_HEALTH] > 0
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(ACTION_KEYS)
+
+    def __len__(self) -> int:
+        return len(ACTION_KEYS)
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+
+class RoundView(Mapping):
+    """
+    单个回合的只读字典视图: {"round": 回合数, "actions": [行动视图...]}
+
+    视图记录回合在整场战斗中的绝对序号，日志按保留策略丢弃该回合后访问视图抛出 IndexError，
+    而不会指向另一个回合；需要长期保存时用 to_dict 复制
+    """
+
+    __slots__ = ("_log", "_position")
+
+    def __init__(self, log: "BattleEventLog", round_index: int):
+        """
+        Args:
+            log: 战斗事件日志
+            round_index: 回合在日志当前保留部分中的下标
+        """
+        self._log = log
+        self._position = log.dropped_rounds + round_index
+
+    @property
+    def _round_index(self) -> int:
+        """回合在日志当前保留部分中的下标"""
+        round_index = self._position - self._log.dropped_rounds
+        if round_index < 0:
+            raise IndexError(f"第 {self._position + 1} 个回合已按内存保留策略从战斗日志中丢弃")
+        return round_index
+
+    def action_range(self) -> range:
+        """本回合行动在事件日志中的下标范围"""
+        log = self._log
+        rounds = log.round_index
+        position = self._round_index * 2
+        start = rounds[position + 1] - log.dropped_actions
+        if position + 2 < len(rounds):
+            end = rounds[position + 3] - log.dropped_actions
+        else:
+            end = log.action_count()
+        return range(start, end)
+
+    def event_rows(self) -> List[Tuple[int, ...]]:
+        """本回合的原始事件行 (回合, 攻击者, 目标, 基础伤害, 实际伤害, 暴击, 目标血量)"""
+        actions = self.action_range()
+        events = self._log.events[actions.start * EVENT_FIELDS : actions.stop * EVENT_FIELDS]
+        return [
+            tuple(events[i : i + EVENT_FIELDS])
+            for i in range(0, len(events), EVENT_FIELDS)
+        ]
+
+    def __getitem__(self, key: str) -> Any:
+        if key == "round":
+            return self._log.round_index[self._round_index * 2]
+        if key == "actions":
+            return [ActionView(self._log, i) for i in self.action_range()]
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(ROUND_KEYS)
+
+    def __len__(self) -> int:
+        return len(ROUND_KEYS)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为普通字典（包含格式化后的名称）"""
+        return {
+            "round": self["round"],
+            "actions": [dict(action) for action in self["actions"]],
+        }
+
+    def __repr__(self) -> str:
+        return repr(self.to_dict())
+
+
+class BattleEventLog(Sequence):
+    """
+    紧凑的战斗事件日志
+
+    所有攻击事件按行连续存放在一个 int32 类型数组中
+    (回合, 攻击者下标, 目标下标, 基础伤害, 实际伤害, 暴击, 目标剩余血量)，
+    每次攻击只追加28字节；作为序列访问时表现为原先的回合字典列表
+    """
+
+    def __init__(self, combatants: Sequence):
+        """
+        初始化日志
+
+        Args:
+            combatants: 参战角色列表，事件中以下标引用
+        """
+        self.combatants = tuple(combatants)
+        self.events = array("i")
+        # 每个回合两项：回合数及其第一个行动的全局序号（含已丢弃的行动）
+        self.round_index = array("I")
+        # 因内存保留策略被丢弃的行动数与回合数
+        self.dropped_actions = 0
+        self.dropped_rounds = 0
+
+    def begin_round(self, round_number: int) -> None:
+        """开始记录新的回合"""
+        self.round_index.extend(
+            (round_number, self.dropped_actions + len(self.events) // EVENT_FIELDS)
+        )
+
+    def trim(self, keep_rounds: int) -> None:
+        """
+        丢弃较早的回合，只在内存中保留最近 keep_rounds 个回合
+
+        Args:
+            keep_rounds: 保留的回合数，0表示清空
+        """
+        excess = len(self) - keep_rounds
+        if excess <= 0:
+            return
+        if keep_rounds == 0:
+            first_kept = self.action_count()
+        else:
+            first_kept = self.round_index[excess * 2 + 1] - self.dropped_actions
+        del self.events[: first_kept * EVENT_FIELDS]
+        del self.round_index[: excess * 2]
+        self.dropped_actions += first_kept
+        self.dropped_rounds += excess
+
+    def record(
+        self,
+        attacker_index: int,
+        target_index: int,
+        base_damage: int,
+        actual_damage: int,
+        is_critical: bool,
+        target_health: int,
+    ) -> None:
+        """记录当前回合的一次攻击"""
+        self.events.extend(
+            (
+                self.round_index[-2],
+                attacker_index,
+                target_index,
+                base_damage,
+                actual_damage,
+                is_critical,
+                target_health,
+            )
+        )
+
+    def column(self, field: int) -> array:
+        """取出某个字段的整列数据，例如 column(EVENT_ACTUAL_DAMAGE)"""
+        return self.events[field::EVENT_FIELDS]
+
+    def action_count(self) -> int:
+        """已记录的攻击次数"""
+        return len(self.events) // EVENT_FIELDS
+
+    def nbytes(self) -> int:
+        """日志数组占用的字节数"""
+        return (
+            self.events.itemsize * len(self.events)
+            + self.round_index.itemsize * len(self.round_index)
+        )
+
+    def __len__(self) -> int:
+        return len(self.round_index) // 2
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [RoundView(self, i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("battle log index out of range")
+        return RoundView(self, index)
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        """转换为普通的回合字典列表"""
+        return [round_view.to_dict() for round_view in self]
+
+    def __repr__(self) -> str:
+        return f"BattleEventLog(rounds={len(self)}, actions={self.action_count()})"
+
+
+# 二进制日志记录: 战斗编号, 回合, 攻击者, 目标, 基础伤害, 实际伤害, 暴击, 目标血量（小端，25字节）
+# 攻击者与目标为 16 位下标，团队战斗与时间轴战斗最多支持 65536 名参战角色
+BINARY_RECORD = struct.Struct("<IIHHiiBi")
+BINARY_MAX_COMBATANTS = 1 << 16
+
+
+class JsonlBattleLogSink:
+    """以 JSON Lines 格式逐回合写入战斗日志"""
+
+    def __init__(self, path: str):
+        """
+        初始化写入器
+
+        Args:
+            path: 输出文件路径
+        """
+        self.path = path
+        self._file = open(path, "w", encoding="utf-8")
+
+    def begin_battle(self, battle_id: int, combatants: Sequence) -> None:
+        """写入战斗头，记录参战角色名称（事件中以下标引用）"""
+        record = {"battle": battle_id, "combatants": [c.name for c in combatants]}
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def write_round(self, battle_id: int, round_view: RoundView) -> None:
+        """写入一个回合"""
+        actions = [
+            {
+                "attacker": attacker,
+                "target": target,
+                "base_damage": base_damage,
+                "actual_damage": actual_damage,
+                "is_critical": bool(is_critical),
+                "target_health": target_health,
+            }
+            for _, attacker, target, base_damage, actual_damage, is_critical, target_health
+            in round_view.event_rows()
+        ]
+        record = {"battle": battle_id, "round": round_view["round"], "actions": actions}
+        self._file.write(json.dumps(record) + "\n")
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self._file.close()
+
+    def __enter__(self) -> "JsonlBattleLogSink":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class BinaryBattleLogSink:
+    """以定长二进制记录（BINARY_RECORD）逐回合写入战斗日志"""
+
+    def __init__(self, path: str):
+        """
+        初始化写入器
+
+        Args:
+            path: 输出文件路径
+        """
+        self.path = path
+        self._file = open(path, "wb")
+
+    def begin_battle(self, battle_id: int, combatants: Sequence) -> None:
+        """二进制格式不记录角色名称，只检查角色下标能否写入记录"""
+        if len(combatants) > BINARY_MAX_COMBATANTS:
+            raise ValueError(
+                f"二进制战斗日志最多支持 {BINARY_MAX_COMBATANTS} 名参战角色，当前 {len(combatants)} 名"
+            )
+
+    def write_round(self, battle_id: int, round_view: RoundView) -> None:
+        """写入一个回合"""
+        pack = BINARY_RECORD.pack
+        self._file.write(
+            b"".join(pack(battle_id, *row) for row in round_view.event_rows())
+        )
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self._file.close()
+
+    def __enter__(self) -> "BinaryBattleLogSink":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def read_jsonl_battle_log(path: str) -> Iterator[Dict[str, Any]]:
+    """逐行读取 JSON Lines 战斗日志"""
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def read_binary_battle_log(
+    path: str, chunk_records: int = 4096
+) -> Iterator[Tuple[int, ...]]:
+    """
+    分块读取二进制战斗日志
+
+    Args:
+        path: 日志文件路径
+        chunk_records: 每次读取的记录数
+
+    Yields:
+        (战斗编号, 回合, 攻击者, 目标, 基础伤害, 实际伤害, 暴击, 目标血量)
+    """
+    chunk_size = BINARY_RECORD.size * chunk_records
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            if len(chunk) % BINARY_RECORD.size:
+                raise ValueError(f"二进制战斗日志已截断: {path}")
+            yield from BINARY_RECORD.iter_unpack(chunk)
+
+
+def open_battle_log_sink(path: str):
+    """根据扩展名创建写入器：.jsonl 为 JSON Lines，其余为二进制格式"""
+    if path.endswith(".jsonl"):
+        return JsonlBattleLogSink(path)
+    return BinaryBattleLogSink(path)
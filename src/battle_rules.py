@@ -0,0 +1,162 @@
+"""
+战斗规则模块
+将配置文件 battle 部分预编译为不可变的规则对象，
+战斗热路径直接读取属性而不再查询字典
+"""
+
+import hashlib
+import json
+import math
+from fractions import Fraction
+from typing import TYPE_CHECKING, Any, Dict, Tuple
+
+if TYPE_CHECKING:
+    from .damage_table import DamageTable
+
+# 规则字段及默认值（与 config/game_config.yaml 的 battle 部分一致）
+BATTLE_RULE_DEFAULTS: Dict[str, Any] = {
+    "max_rounds": 50,
+    "critical_hit_chance": 0.1,
+    "critical_hit_multiplier": 1.5,
+    "damage_variance_min": 0.8,
+    "damage_variance_max": 1.2,
+}
+
+
+class BattleRules:
+    """不可变的战斗规则"""
+
+    __slots__ = (
+        "max_rounds",
+        "critical_hit_chance",
+        "critical_hit_multiplier",
+        "damage_variance_min",
+        "damage_variance_max",
+        "damage_variance_span",
+        "version",
+        "_damage_ranges",
+        "_damage_tables",
+    )
+
+    def __init__(
+        self,
+        max_rounds: int = 50,
+        critical_hit_chance: float = 0.1,
+        critical_hit_multiplier: float = 1.5,
+        damage_variance_min: float = 0.8,
+        damage_variance_max: float = 1.2,
+    ):
+        """
+        初始化战斗规则
+
+        Args:
+            max_rounds: 单场最大回合数
+            critical_hit_chance: 暴击概率
+            critical_hit_multiplier: 暴击伤害倍率
+            damage_variance_min: 伤害浮动下限
+            damage_variance_max: 伤害浮动上限
+        """
+        if max_rounds < 1:
+            raise ValueError("max_rounds 必须至少为1")
+        if not 0 <= critical_hit_chance <= 1:
+            raise ValueError("critical_hit_chance 必须在0到1之间")
+        if damage_variance_max < damage_variance_min:
+            raise ValueError("damage_variance_max 不能小于 damage_variance_min")
+
+        values = {
+            "max_rounds": int(max_rounds),
+            "critical_hit_chance": float(critical_hit_chance),
+            "critical_hit_multiplier": float(critical_hit_multiplier),
+            "damage_variance_min": float(damage_variance_min),
+            "damage_variance_max": float(damage_variance_max),
+        }
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+        object.__setattr__(
+            self, "damage_variance_span", values["damage_variance_max"] - values["damage_variance_min"]
+        )
+        material = json.dumps(values, sort_keys=True).encode("utf-8")
+        object.__setattr__(self, "version", hashlib.sha256(material).hexdigest()[:16])
+        object.__setattr__(self, "_damage_ranges", {})
+        object.__setattr__(self, "_damage_tables", {})
+
+    @classmethod
+    def from_config(cls, battle_config: Dict[str, Any]) -> "BattleRules":
+        """
+        从配置字典创建规则，缺失的键使用默认值
+
+        Args:
+            battle_config: 配置文件中的 battle 部分
+        """
+        values = dict(BATTLE_RULE_DEFAULTS)
+        values.update(
+            {k: v for k, v in (battle_config or {}).items() if k in BATTLE_RULE_DEFAULTS}
+        )
+        return cls(**values)
+
+    def replace(self, **changes: Any) -> "BattleRules":
+        """返回修改了部分字段的新规则"""
+        values = self.to_dict()
+        values.update(changes)
+        return BattleRules(**values)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为配置字典"""
+        return {name: getattr(self, name) for name in BATTLE_RULE_DEFAULTS}
+
+    def damage_range(self, attack: int) -> Tuple[int, int]:
+        """
+        获取某攻击力在浮动后（暴击前）的基础伤害整数范围（结果按攻击力缓存）
+
+        Args:
+            attack: 攻击力
+
+        Returns:
+            (最小基础伤害, 最大基础伤害)
+        """
+        cached = self._damage_ranges.get(attack)
+        if cached is None:
+            low = Fraction(str(self.damage_variance_min)) * attack
+            high = Fraction(str(self.damage_variance_max)) * attack
+            cached = (math.floor(low), max(math.floor(low), math.ceil(high) - 1))
+            self._damage_ranges[attack] = cached
+        return cached
+
+    def damage_table(self, attack: int, defense: int) -> "DamageTable":
+        """
+        获取 (攻击力, 防御力) 在本规则下的伤害概率表（结果按攻防组合缓存）
+
+        Args:
+            attack: 攻击方攻击力
+            defense: 目标防御力
+
+        Returns:
+            DamageTable: 可用别名法单次采样的伤害概率表
+        """
+        table = self._damage_tables.get((attack, defense))
+        if table is None:
+            from .damage_table import DamageTable  # 避免与 exact_solver 循环导入
+
+            table = DamageTable(attack, defense, self)
+            self._damage_tables[(attack, defense)] = table
+        return table
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("BattleRules 是不可变对象，请使用 replace 创建新规则")
+
+    def __reduce__(self):
+        return (BattleRules, tuple(self.to_dict().values()))
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, BattleRules) and self.to_dict() == other.to_dict()
+
+    def __hash__(self) -> int:
+        return hash(tuple(self.to_dict().values()))
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{k}={v!r}" for k, v in self.to_dict().items())
+        return f"BattleRules({fields})"
+
+
+# 默认规则
+DEFAULT_BATTLE_RULES = BattleRules()
@@ -0,0 +1,96 @@
+"""
+战斗统计模块
+在每次攻击时增量更新各参战角色的统计数据，读取摘要无需重新扫描战斗日志
+"""
+
+from typing import Any, Dict, List
+
+
+class CombatantStats:
+    """单个参战角色的累计统计"""
+
+    __slots__ = (
+        "damage_dealt",
+        "damage_taken",
+        "critical_hits",
+        "hits",
+        "overkill",
+        "rounds_survived",
+    )
+
+    def __init__(self):
+        self.damage_dealt = 0  # 造成的实际伤害（含溢出）
+        self.damage_taken = 0  # 承受的实际伤害（含溢出）
+        self.critical_hits = 0  # 暴击次数
+        self.hits = 0  # 攻击次数
+        self.overkill = 0  # 击杀时超出目标剩余血量的伤害
+        self.rounds_survived = 0  # 回合结束时仍存活的回合数
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为字典"""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class BattleStats:
+    """一场战斗中所有参战角色的累计统计，按参战顺序以下标访问"""
+
+    def __init__(self, combatant_count: int = 2):
+        """
+        初始化统计
+
+        Args:
+            combatant_count: 参战角色数量
+        """
+        self.combatants: List[CombatantStats] = [
+            CombatantStats() for _ in range(combatant_count)
+        ]
+        self.rounds = 0
+
+    def __getitem__(self, index: int) -> CombatantStats:
+        return self.combatants[index]
+
+    def record_hit(
+        self,
+        attacker_index: int,
+        target_index: int,
+        actual_damage: int,
+        is_critical: bool,
+        target_health_before: int,
+    ) -> None:
+        """
+        记录一次攻击
+
+        Args:
+            attacker_index: 攻击者下标
+            target_index: 目标下标
+            actual_damage: 实际伤害
+            is_critical: 是否暴击
+            target_health_before: 目标受击前的血量
+        """
+        attacker = self.combatants[attacker_index]
+        attacker.hits += 1
+        attacker.damage_dealt += actual_damage
+        if is_critical:
+            attacker.critical_hits += 1
+        if actual_damage > target_health_before:
+            attacker.overkill += actual_damage - target_health_before
+        self.combatants[target_index].damage_taken += actual_damage
+
+    def end_round(self, alive_flags) -> None:
+        """
+        回合结束时更新存活回合数
+
+        Args:
+            alive_flags: 各参战角色是否存活（与下标顺序一致）
+        """
+        self.rounds += 1
+        for stats, alive in zip(self.combatants, alive_flags):
+            if alive:
+                stats.rounds_survived += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为字典"""
+        return {
+            "rounds": self.rounds,
+            "combatants": [stats.to_dict() for stats in self.combatants],
+        }
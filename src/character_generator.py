@@ -3,10 +3,11 @@
 """
 
 import json
-import random
 import os
 from typing import Dict, List, Optional, Any
+from .player import DEFAULT_SPEED
 from .resource_path import get_resource_path
+from .rng import as_random_source
 
 
 class CharacterDataLoader:
@@ -42,8 +43,10 @@ class CharacterDataLoader:
             # 验证每个角色数据的完整性
             validated_presets = []
             for char in self._character_presets:
-                if isinstance(char, dict) and all(
-                    key in char for key in ["class", "health", "attack", "defense"]
+                if (
+                    isinstance(char, dict)
+                    and all(key in char for key in ["class", "health", "attack", "defense"])
+                    and int(char.get("speed", DEFAULT_SPEED)) > 0
                 ):
                     validated_presets.append(
                         {
@@ -51,6 +54,8 @@ class CharacterDataLoader:
                             "health": int(char["health"]),
                             "attack": int(char["attack"]),
                             "defense": int(char["defense"]),
+                            # 速度为可选字段，旧数据文件缺省时使用默认速度
+                            "speed": int(char.get("speed", DEFAULT_SPEED)),
                         }
                     )
                 else:
@@ -64,12 +69,12 @@ class CharacterDataLoader:
             print(f"❌ 找不到角色数据配置文件: {self.data_file_path}")
             # 提供默认角色数据作为备选
             self._character_presets = [
-                {"class": "剑士", "health": 100, "attack": 25, "defense": 8},
-                {"class": "法师", "health": 80, "attack": 35, "defense": 5},
-                {"class": "弓箭手", "health": 90, "attack": 30, "defense": 6},
-                {"class": "盾卫", "health": 120, "attack": 20, "defense": 12},
-                {"class": "刺客", "health": 70, "attack": 40, "defense": 4},
-                {"class": "圣骑士", "health": 110, "attack": 22, "defense": 10},
+                {"class": "剑士", "health": 100, "attack": 25, "defense": 8, "speed": 10},
+                {"class": "法师", "health": 80, "attack": 35, "defense": 5, "speed": 9},
+                {"class": "弓箭手", "health": 90, "attack": 30, "defense": 6, "speed": 12},
+                {"class": "盾卫", "health": 120, "attack": 20, "defense": 12, "speed": 7},
+                {"class": "刺客", "health": 70, "attack": 40, "defense": 4, "speed": 15},
+                {"class": "圣骑士", "health": 110, "attack": 22, "defense": 10, "speed": 8},
             ]
             print("🔄 使用默认角色数据")
 
@@ -86,21 +91,24 @@ class CharacterDataLoader:
         获取所有角色预制数据
 
         Returns:
-            List[Dict]: 角色预制数据列表，每个字典包含 name, health, attack, defense
+            List[Dict]: 角色预制数据列表，每个字典包含 name, health, attack, defense, speed
         """
         return self._character_presets.copy()
 
-    def get_random_character(self) -> Dict[str, Any]:
+    def get_random_character(self, rng: Any = None) -> Dict[str, Any]:
         """
         随机获取一个角色预制数据
 
+        Args:
+            rng: 随机数源（random.Random、numpy Generator 等），默认使用全局 random
+
         Returns:
             Dict: 随机角色数据
         """
         if not self._character_presets:
             return dict()
 
-        return random.choice(self._character_presets).copy()
+        return as_random_source(rng).choice(self._character_presets).copy()
 
     def get_character_by_class(self, class_name: str) -> Optional[Dict[str, Any]]:
         """
@@ -189,19 +197,21 @@ class CharacterNameGenerator:
             print(f"❌ 加载角色名称时发生错误: {e}")
             self._character_names = ["错误角色"]
 
-    def get_random_name(self, except_name: str = "") -> str:
+    def get_random_name(self, except_name: str = "", rng: Any = None) -> str:
         """
         随机获取一个角色名称
         
         except_name: 如果生成的名称与此名称相同，则重新生成
+        rng: 随机数源（random.Random、numpy Generator 等），默认使用全局 random
         
         return: 随机角色名称
         """
         if not self._character_names:
             return "无名角色"
-        temp_name = random.choice(self._character_names)
+        rng = as_random_source(rng)
+        temp_name = rng.choice(self._character_names)
         if except_name == temp_name:
-            return self.get_random_name(except_name)
+            return self.get_random_name(except_name, rng)
         return temp_name
 
     def get_all_names(self) -> List[str]:
@@ -213,13 +223,16 @@ class CharacterNameGenerator:
         """
         return self._character_names.copy()
 
-    def get_random_names(self, count: int, allow_duplicates: bool = False) -> List[str]:
+    def get_random_names(
+        self, count: int, allow_duplicates: bool = False, rng: Any = None
+    ) -> List[str]:
         """
         获取多个随机角色名称
 
         Args:
             count: 需要获取的名称数量
             allow_duplicates: 是否允许重复名称
+            rng: 随机数源（random.Random、numpy Generator 等），默认使用全局 random
 
         Returns:
             List[str]: 随机角色名称列表
@@ -227,11 +240,12 @@ class CharacterNameGenerator:
         if not self._character_names:
             return ["无名角色"] * count
 
+        rng = as_random_source(rng)
         if allow_duplicates or count <= len(self._character_names):
             if allow_duplicates:
-                return [random.choice(self._character_names) for _ in range(count)]
+                return [rng.choice(self._character_names) for _ in range(count)]
             else:
-                return random.sample(
+                return rng.sample(
                     self._character_names, min(count, len(self._character_names))
                 )
         else:
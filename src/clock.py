@@ -0,0 +1,99 @@
+"""
+时钟模块
+为战斗节奏和菜单停顿提供可替换的时钟：真实时间、N倍加速和即时完成的虚拟时间，
+自动化测试和批量运行可以走真实的交互代码路径而无需等待
+"""
+
+import asyncio
+import time
+from typing import Optional
+
+
+class RealClock:
+    """真实时钟"""
+
+    def now(self) -> float:
+        """当前时间（秒，单调递增）"""
+        return time.monotonic()
+
+    def sleep(self, seconds: float) -> None:
+        """阻塞等待"""
+        if seconds > 0:
+            time.sleep(seconds)
+
+    async def async_sleep(self, seconds: float) -> None:
+        """异步等待"""
+        await asyncio.sleep(max(seconds, 0))
+
+
+class AcceleratedClock(RealClock):
+    """N倍速时钟：所有等待缩短为 1/N，now 返回按倍率推进的时间"""
+
+    def __init__(self, factor: float):
+        """
+        初始化时钟
+
+        Args:
+            factor: 加速倍率，必须为正数
+        """
+        if factor <= 0:
+            raise ValueError("加速倍率必须为正数")
+        self.factor = factor
+        self._origin = time.monotonic()
+
+    def now(self) -> float:
+        return (time.monotonic() - self._origin) * self.factor
+
+    def sleep(self, seconds: float) -> None:
+        super().sleep(seconds / self.factor)
+
+    async def async_sleep(self, seconds: float) -> None:
+        await super().async_sleep(seconds / self.factor)
+
+
+class VirtualClock:
+    """虚拟时钟：等待立即返回，只推进虚拟时间"""
+
+    def __init__(self, start: float = 0.0):
+        """
+        初始化时钟
+
+        Args:
+            start: 初始虚拟时间
+        """
+        self._now = start
+        # 累计等待次数，便于测试检查节奏
+        self.sleeps = 0
+
+    def now(self) -> float:
+        return self._now
+
+    def sleep(self, seconds: float) -> None:
+        self._now += max(seconds, 0)
+        self.sleeps += 1
+
+    async def async_sleep(self, seconds: float) -> None:
+        self.sleep(seconds)
+        # 仍然让出事件循环，使其他会话可以运行
+        await asyncio.sleep(0)
+
+
+def clock_from_speed(speed: Optional[float] = None):
+    """
+    根据速度倍率创建时钟
+
+    Args:
+        speed: None或1为真实时间，0为即时虚拟时间，其他正数为N倍加速
+
+    Returns:
+        对应的时钟实例
+    """
+    if speed is None or speed == 1:
+        return real_clock
+    if speed == 0:
+        return VirtualClock()
+    return AcceleratedClock(speed)
+
+
+# 默认的真实时钟
+real_clock = RealClock()
@@ -7,6 +7,32 @@ import yaml
 import os
 from typing import Dict, Any, List, Optional
 from .resource_path import get_resource_path
+from .battle_rules import BattleRules
+
+# 自动平衡的默认设置，配置文件中缺少的键使用这些值
+BALANCE_DEFAULTS: Dict[str, Any] = {
+    "target_win_rate": 0.5,
+    "pair_targets": {},
+    "tolerance": 0.02,
+    "max_iterations": 30,
+    "evaluator": "exact",
+    "simulated_battles": 20000,
+    "step_sizes": {"health": 8, "attack": 4, "defense": 2},
+    "stat_bounds": {"health": [30, 300], "attack": [5, 100], "defense": [0, 40]},
+}
+
+# 战斗日志写入的默认设置
+LOGGING_DEFAULTS: Dict[str, Any] = {
+    "background": True,
+    "flush_interval_seconds": 0.5,
+    "flush_max_messages": 8192,
+    "durable": False,
+    # 以下默认不压缩、不轮转、不清理；随附的配置文件开启 gzip 压缩与保留策略
+    "compression": "none",
+    "rotate_max_chars": 0,
+    "rotate_max_age_seconds": 0,
+    "retention": {"max_logs": 0, "max_age_days": 0, "max_total_mb": 0},
+}
 
 
 class GameConfig:
@@ -26,6 +52,7 @@ class GameConfig:
 
         self.config_path = config_path
         self.config = {}
+        self._battle_rules: Optional[BattleRules] = None
         self.load_config()
         self.game_info = {}
         self.load_game_info()
@@ -47,6 +74,7 @@ class GameConfig:
 
     def load_config(self):
         """加载YAML配置文件"""
+        self._battle_rules = None
         try:
             if os.path.exists(self.config_path):
                 with open(self.config_path, "r", encoding="utf-8") as f:
@@ -74,20 +102,33 @@ class GameConfig:
                 "auto_advance_battle": False,
                 "battle_delay_seconds": 1,
             },
+            "balance": dict(BALANCE_DEFAULTS),
+            "logging": dict(LOGGING_DEFAULTS),
         }
 
     def get_battle_config(self) -> Dict[str, Any]:
         """获取战斗配置"""
-        battle_config = self.config.get("battle", {})
-        return {
-            "max_rounds": battle_config.get("max_rounds", 50),
-            "critical_hit_chance": battle_config.get("critical_hit_chance", 0.1),
-            "critical_hit_multiplier": battle_config.get(
-                "critical_hit_multiplier", 1.5
-            ),
-            "damage_variance_min": battle_config.get("damage_variance_min", 0.8),
-            "damage_variance_max": battle_config.get("damage_variance_max", 1.2),
-        }
+        return self.get_battle_rules().to_dict()
+
+    def get_battle_rules(self) -> BattleRules:
+        """
+        获取预编译的战斗规则
+
+        规则只在首次访问时构建，配置重新加载或修改 battle 部分后重新构建
+
+        Returns:
+            BattleRules: 不可变的战斗规则
+        """
+        if self._battle_rules is None:
+            battle_config = self.config.get("battle", {})
+            if not isinstance(battle_config, dict):
+                battle_config = {}
+            try:
+                self._battle_rules = BattleRules.from_config(battle_config)
+            except (TypeError, ValueError) as e:
+                print(f"警告: 战斗配置无效 ({e})，使用默认规则")
+                self._battle_rules = BattleRules()
+        return self._battle_rules
 
     def get_display_config(self) -> Dict[str, Any]:
         """获取显示配置"""
@@ -98,6 +139,32 @@ class GameConfig:
             "battle_delay_seconds": display_config.get("battle_delay_seconds", 1),
         }
 
+    def get_balance_config(self) -> Dict[str, Any]:
+        """获取自动平衡配置（缺少的键使用默认值）"""
+        balance_config = self.config.get("balance", {})
+        if not isinstance(balance_config, dict):
+            balance_config = {}
+        merged = dict(BALANCE_DEFAULTS)
+        for key, value in balance_config.items():
+            if isinstance(value, dict) and isinstance(merged.get(key), dict):
+                merged[key] = {**merged[key], **value}
+            elif value is not None:
+                merged[key] = value
+        return merged
+
+    def get_logging_config(self) -> Dict[str, Any]:
+        """获取日志写入配置（缺少的键使用默认值）"""
+        logging_config = self.config.get("logging", {})
+        if not isinstance(logging_config, dict):
+            logging_config = {}
+        merged = dict(LOGGING_DEFAULTS)
+        for key, value in logging_config.items():
+            if isinstance(value, dict) and isinstance(merged.get(key), dict):
+                merged[key] = {**merged[key], **value}
+            elif value is not None:
+                merged[key] = value
+        return merged
+
     def save_config(self):
         """保存配置到YAML文件"""
         try:
@@ -128,6 +195,8 @@ class GameConfig:
 
     def set_config_value(self, section: str, key: str, value: Any):
         """设置特定配置值"""
+        if section == "battle":
+            self._battle_rules = None
         if section not in self.config:
             self.config[section] = {}
 
@@ -0,0 +1,86 @@
+"""
+伤害概率表模块
+攻击力和防御力都是小整数，按 (攻击力, 防御力, 战斗规则) 预先计算一次攻击的全部结果
+及其精确概率，用别名法采样：每次攻击只需一次均匀随机数，
+分布与 Player.strike 的浮动、取整、暴击、减防计算完全一致
+"""
+
+from fractions import Fraction
+from typing import Callable, Dict, List, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # numpy 为可选依赖，仅批量采样需要
+    np = None
+
+from .alias_sampler import AliasSampler
+from .battle_rules import BattleRules
+from .exact_solver import damage_outcomes
+
+# 一次攻击的结果: (基础伤害(含暴击), 实际伤害, 是否暴击)
+DamageOutcome = Tuple[int, int, bool]
+
+
+class DamageTable:
+    """单个 (攻击力, 防御力, 战斗规则) 组合的伤害概率表"""
+
+    def __init__(self, attack: int, defense: int, rules: BattleRules):
+        """
+        计算伤害概率表
+
+        Args:
+            attack: 攻击方攻击力
+            defense: 目标防御力
+            rules: 战斗规则
+        """
+        self.attack = attack
+        self.defense = defense
+        self.rules = rules
+
+        merged: Dict[DamageOutcome, Fraction] = {}
+        for damage, is_critical, actual, probability in damage_outcomes(
+            attack,
+            defense,
+            rules.damage_variance_min,
+            rules.damage_variance_max,
+            rules.critical_hit_chance,
+            rules.critical_hit_multiplier,
+        ):
+            outcome = (damage, actual, is_critical)
+            merged[outcome] = merged.get(outcome, Fraction(0)) + probability
+
+        self.outcomes: List[DamageOutcome] = list(merged)
+        self.probabilities: List[Fraction] = list(merged.values())
+        self.sampler = AliasSampler(self.probabilities, self.outcomes)
+        # 采样一次攻击: sample(random_value) -> (基础伤害, 实际伤害, 是否暴击)，
+        # 直接绑定采样器方法以省去一层调用
+        self.sample: Callable[[Callable[[], float]], DamageOutcome] = self.sampler.sample
+        self._actual_damage = None
+
+    def sample_actual(self, rng: "np.random.Generator", size: int) -> "np.ndarray":
+        """
+        批量采样实际伤害（供向量化战斗内核使用）
+
+        Args:
+            rng: numpy.random.Generator
+            size: 攻击次数
+
+        Returns:
+            np.ndarray: 实际伤害数组
+        """
+        if self._actual_damage is None:
+            self._actual_damage = np.array(
+                [actual for _, actual, _ in self.outcomes], dtype=np.int64
+            )
+        return self._actual_damage[self.sampler.sample_indices(rng, size)]
+
+    def actual_damage_pmf(self) -> Dict[int, Fraction]:
+        """实际伤害的精确分布（与 exact_solver.damage_pmf 相同）"""
+        pmf: Dict[int, Fraction] = {}
+        for (_, actual, _), probability in zip(self.outcomes, self.probabilities):
+            pmf[actual] = pmf.get(actual, Fraction(0)) + probability
+        return pmf
+
+    def mean_actual_damage(self) -> float:
+        """实际伤害的期望"""
+        return float(sum(actual * p for actual, p in self.actual_damage_pmf().items()))
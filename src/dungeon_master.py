@@ -57,5 +57,6 @@ class DungeonMaster:
         self.logger.log(message)
 
     def close_logger(self):
+        """写出缓冲的日志并关闭日志文件"""
         if self.logger:
             self.logger.close()
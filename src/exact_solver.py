@@ -0,0 +1,214 @@
+"""
+精确胜率求解模块
+将1v1战斗视为以双方血量为状态的马尔可夫链，
+通过动态规划精确计算胜负/超时概率和结束回合分布，无需蒙特卡洛采样
+"""
+
+import math
+from fractions import Fraction
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # numpy 为可选依赖，仅精确求解器需要
+    np = None
+
+from .battle_rules import BattleRules
+from .config_manager import game_config
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError("精确胜率求解器需要安装 numpy (pipenv install numpy)")
+
+
+def _to_fraction(value: float) -> Fraction:
+    """将配置中的小数（如0.8）转换为其十进制字面量对应的精确分数"""
+    return Fraction(str(value))
+
+
+def base_damage_pmf(
+    attack: int, variance_min: float = 0.8, variance_max: float = 1.2
+) -> Dict[int, Fraction]:
+    """
+    计算浮动后基础伤害 int(attack * U(variance_min, variance_max)) 的精确分布
+
+    Args:
+        attack: 攻击力
+        variance_min: 伤害浮动下限
+        variance_max: 伤害浮动上限
+
+    Returns:
+        Dict[int, Fraction]: 基础伤害 -> 概率
+    """
+    low = _to_fraction(variance_min) * attack
+    high = _to_fraction(variance_max) * attack
+    if high <= low:
+        return {math.floor(low): Fraction(1)}
+
+    width = high - low
+    pmf: Dict[int, Fraction] = {}
+    for damage in range(math.floor(low), math.ceil(high)):
+        overlap = min(high, Fraction(damage + 1)) - max(low, Fraction(damage))
+        if overlap > 0:
+            pmf[damage] = overlap / width
+    return pmf
+
+
+def damage_outcomes(
+    attack: int,
+    defense: int,
+    variance_min: float = 0.8,
+    variance_max: float = 1.2,
+    crit_chance: float = 0.1,
+    crit_multiplier: float = 1.5,
+) -> List[Tuple[int, bool, int, Fraction]]:
+    """
+    列出一次攻击所有可能的结果及其精确概率
+
+    Returns:
+        List: (基础伤害(含暴击), 是否暴击, 实际伤害, 概率) 列表
+    """
+    crit = _to_fraction(crit_chance)
+    multiplier = _to_fraction(crit_multiplier)
+    outcomes = []
+    for base, probability in base_damage_pmf(attack, variance_min, variance_max).items():
+        for is_critical, branch in ((False, 1 - crit), (True, crit)):
+            if branch == 0:
+                continue
+            damage = math.floor(base * multiplier) if is_critical else base
+            outcomes.append(
+                (damage, is_critical, max(1, damage - defense), probability * branch)
+            )
+    return outcomes
+
+
+def damage_pmf(
+    attack: int,
+    defense: int,
+    variance_min: float = 0.8,
+    variance_max: float = 1.2,
+    crit_chance: float = 0.1,
+    crit_multiplier: float = 1.5,
+) -> Dict[int, Fraction]:
+    """
+    计算一次攻击实际伤害 max(1, 伤害 - 防御) 的精确分布
+
+    Returns:
+        Dict[int, Fraction]: 实际伤害 -> 概率
+    """
+    pmf: Dict[int, Fraction] = {}
+    for _, _, actual, probability in damage_outcomes(
+        attack, defense, variance_min, variance_max, crit_chance, crit_multiplier
+    ):
+        pmf[actual] = pmf.get(actual, Fraction(0)) + probability
+    return pmf
+
+
+def _hit_player2(state: "np.ndarray", pmf: List[Tuple[int, float]]) -> Tuple["np.ndarray", float]:
+    """对状态矩阵中的玩家2（列）施加一次攻击，返回存活状态和击杀概率"""
+    result = np.zeros_like(state)
+    column_mass = state.sum(axis=0)
+    cumulative = np.cumsum(column_mass)
+    killed = 0.0
+    size = state.shape[1]
+    for damage, probability in pmf:
+        if damage < size:
+            result[:, 1 : size - damage] += probability * state[:, 1 + damage :]
+        killed += probability * cumulative[min(damage, size - 1)]
+    return result, killed
+
+
+def _hit_player1(state: "np.ndarray", pmf: List[Tuple[int, float]]) -> Tuple["np.ndarray", float]:
+    """对状态矩阵中的玩家1（行）施加一次攻击，返回存活状态和击杀概率"""
+    result, killed = _hit_player2(state.T, pmf)
+    return result.T, killed
+
+
+def solve_battle(
+    player1: Dict[str, Any],
+    player2: Dict[str, Any],
+    max_rounds: Optional[int] = None,
+    rules: Optional[BattleRules] = None,
+) -> Dict[str, Any]:
+    """
+    精确求解1v1战斗结果分布
+
+    每回合以各50%的概率决定先手（与 Battle.determine_turn_order 一致），
+    先手击败对手时后手不再行动
+
+    Args:
+        player1: 玩家1属性（health, attack, defense）
+        player2: 玩家2属性
+        max_rounds: 最大回合数，超过即判定超时平局，默认使用战斗规则中的设置
+        rules: 战斗规则（浮动范围、暴击概率与倍率），默认使用全局配置中的规则
+
+    Returns:
+        Dict: 胜负/超时概率、平均回合数以及按回合的结束概率分布
+    """
+    _require_numpy()
+    if rules is None:
+        rules = game_config.get_battle_rules()
+    if max_rounds is None:
+        max_rounds = rules.max_rounds
+    damage_rules = (
+        rules.damage_variance_min,
+        rules.damage_variance_max,
+        rules.critical_hit_chance,
+        rules.critical_hit_multiplier,
+    )
+    pmf1 = [
+        (damage, float(p))
+        for damage, p in sorted(
+            damage_pmf(player1["attack"], player2["defense"], *damage_rules).items()
+        )
+    ]
+    pmf2 = [
+        (damage, float(p))
+        for damage, p in sorted(
+            damage_pmf(player2["attack"], player1["defense"], *damage_rules).items()
+        )
+    ]
+
+    # state[h1, h2]: 回合开始时双方血量分别为 h1、h2 的概率（索引0恒为0）
+    state = np.zeros((player1["health"] + 1, player2["health"] + 1))
+    state[player1["health"], player2["health"]] = 1.0
+
+    player1_win_by_round = [0.0] * (max_rounds + 1)
+    player2_win_by_round = [0.0] * (max_rounds + 1)
+
+    for round_number in range(1, max_rounds + 1):
+        half = 0.5 * state
+
+        # 玩家1先手
+        first, player1_kills = _hit_player2(half, pmf1)
+        first, player2_kills = _hit_player1(first, pmf2)
+        # 玩家2先手
+        second, player2_kills_first = _hit_player1(half, pmf2)
+        second, player1_kills_second = _hit_player2(second, pmf1)
+
+        player1_win_by_round[round_number] = player1_kills + player1_kills_second
+        player2_win_by_round[round_number] = player2_kills + player2_kills_first
+        state = first + second
+
+        # 每次攻击至少造成1点伤害，状态会不断向低血量收缩
+        rows = np.flatnonzero(state.any(axis=1))
+        columns = np.flatnonzero(state.any(axis=0))
+        if rows.size == 0:
+            break
+        state = state[: rows[-1] + 1, : columns[-1] + 1]
+
+    timeout = float(state.sum())
+    round_distribution = [
+        w1 + w2 for w1, w2 in zip(player1_win_by_round, player2_win_by_round)
+    ]
+    round_distribution[max_rounds] += timeout
+    return {
+        "player1_win": sum(player1_win_by_round),
+        "player2_win": sum(player2_win_by_round),
+        "timeout": timeout,
+        "mean_rounds": sum(r * p for r, p in enumerate(round_distribution)),
+        "round_distribution": round_distribution,
+        "player1_win_by_round": player1_win_by_round,
+        "player2_win_by_round": player2_win_by_round,
+    }
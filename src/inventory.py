@@ -0,0 +1,364 @@
+"""
+背包模块
+物品目录把物品名称映射为整数ID；背包以紧凑的类型化数组（array.array）按列存储
+(物品ID, 数量, 稀有度, 属性加成)，按物品ID和稀有度建立索引，
+并维护物品总数、全部物品属性加成和已装备属性加成的累计值，汇总无需遍历整个背包
+"""
+
+import weakref
+from array import array
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+from .loot import ITEM_STATS, LootTableLoader, loot_table_loader
+
+# 物品引用: 物品名称或物品ID
+ItemRef = Union[str, int]
+
+
+class ItemCatalog:
+    """物品目录：物品名称 <-> 整数ID，以及每个物品的稀有度与属性加成"""
+
+    def __init__(self):
+        self.names: List[str] = []
+        self.id_of: Dict[str, int] = {}
+        self.rarity_names: List[str] = []
+        self.rarity_ranks = array("b")
+        # 属性加成按属性分列: 属性 -> 按物品ID索引的数组
+        self.stats: Dict[str, array] = {stat: array("i") for stat in ITEM_STATS}
+        self._rank_of_rarity: Dict[str, int] = {}
+
+    @classmethod
+    def from_loot_tables(cls, loader: Optional[LootTableLoader] = None) -> "ItemCatalog":
+        """
+        由掉落表中出现的全部物品构建目录
+
+        Args:
+            loader: 掉落表加载器，默认使用全局实例
+        """
+        loader = loader or loot_table_loader
+        catalog = cls()
+        for name, item in loader.get_items().items():
+            rarity = item["rarity"]
+            catalog.register(name, rarity, loader.get_rarity_rank(rarity), item["stats"])
+        return catalog
+
+    def register(
+        self,
+        name: str,
+        rarity: str = "普通",
+        rarity_rank: int = 0,
+        stats: Optional[Dict[str, int]] = None,
+    ) -> int:
+        """
+        注册物品，已注册时直接返回其ID
+
+        Args:
+            name: 物品名称
+            rarity: 稀有度名称
+            rarity_rank: 稀有度等级（数值越大越稀有）
+            stats: 属性加成，如 {"attack": 3}
+
+        Returns:
+            int: 物品ID
+        """
+        item_id = self.id_of.get(name)
+        if item_id is not None:
+            return item_id
+        item_id = len(self.names)
+        self.names.append(name)
+        self.id_of[name] = item_id
+        self.rarity_names.append(rarity)
+        self.rarity_ranks.append(rarity_rank)
+        self._rank_of_rarity.setdefault(rarity, rarity_rank)
+        stats = stats or {}
+        for stat in ITEM_STATS:
+            self.stats[stat].append(int(stats.get(stat, 0)))
+        return item_id
+
+    def resolve(self, item: ItemRef, register: bool = False) -> int:
+        """
+        将物品名称或ID解析为ID
+
+        Args:
+            item: 物品名称或物品ID
+            register: 未知名称是否自动注册为无加成的普通物品（仅放入物品时使用），
+                否则抛出 KeyError，避免查询或失败的操作让共享目录无限增长
+        """
+        if isinstance(item, int):
+            if not 0 <= item < len(self.names):
+                raise KeyError(f"未知物品ID: {item}")
+            return item
+        item_id = self.id_of.get(item)
+        if item_id is None:
+            if not register:
+                raise KeyError(f"未知物品: {item}")
+            item_id = self.register(item)
+        return item_id
+
+    def rarity_rank(self, rarity: Union[str, int]) -> int:
+        """将稀有度名称转换为等级，整数原样返回"""
+        if isinstance(rarity, int):
+            return rarity
+        if rarity not in self._rank_of_rarity:
+            raise KeyError(f"未知稀有度: {rarity}")
+        return self._rank_of_rarity[rarity]
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+
+class Inventory:
+    """
+    数组存储的背包
+
+    每个物品占一个槽位（同名物品堆叠），槽位的各列存放在等长的 array.array 中；
+    删除物品时用最后一个槽位填补空位，保持数组紧凑
+    """
+
+    def __init__(self, catalog: Optional[ItemCatalog] = None):
+        """
+        Args:
+            catalog: 物品目录，默认使用全局实例
+        """
+        self.catalog = catalog or item_catalog
+        self.item_ids = array("i")
+        self.counts = array("q")
+        self.rarities = array("b")
+        self.modifiers: Dict[str, array] = {stat: array("i") for stat in ITEM_STATS}
+        # 物品ID -> 槽位；稀有度等级 -> 物品ID集合
+        self.slot_of: Dict[int, int] = {}
+        self.by_rarity: Dict[int, Set[int]] = {}
+        # 累计值
+        self.total_count = 0
+        self.stat_totals: Dict[str, int] = {stat: 0 for stat in ITEM_STATS}
+        self.equipped: Set[int] = set()
+        self.equipped_totals: Dict[str, int] = {stat: 0 for stat in ITEM_STATS}
+        self._equipment_listener: Optional[Callable[[], Optional[Callable]]] = None
+
+    @property
+    def on_equipment_change(self) -> Optional[Callable[[Dict[str, int]], None]]:
+        """装备变化时的回调，参数为本次属性加成的变化量（Player 用它同步属性）"""
+        if self._equipment_listener is None:
+            return None
+        return self._equipment_listener()
+
+    @on_equipment_change.setter
+    def on_equipment_change(self, callback: Optional[Callable[[Dict[str, int]], None]]) -> None:
+        # 绑定方法只保存弱引用，避免 所有者 → 背包 → 绑定方法 → 所有者 的引用循环
+        if callback is None:
+            self._equipment_listener = None
+        elif hasattr(callback, "__self__") and hasattr(callback, "__func__"):
+            self._equipment_listener = weakref.WeakMethod(callback)
+        else:
+            self._equipment_listener = lambda: callback
+
+    def _change_equipped(self, slot: int, sign: int) -> None:
+        delta = {stat: sign * column[slot] for stat, column in self.modifiers.items()}
+        for stat, value in delta.items():
+            self.equipped_totals[stat] += value
+        callback = self.on_equipment_change
+        if callback is not None:
+            callback(delta)
+
+    def _new_slot(self, item_id: int) -> int:
+        catalog = self.catalog
+        slot = len(self.item_ids)
+        rank = catalog.rarity_ranks[item_id]
+        self.item_ids.append(item_id)
+        self.counts.append(0)
+        self.rarities.append(rank)
+        for stat in ITEM_STATS:
+            self.modifiers[stat].append(catalog.stats[stat][item_id])
+        self.slot_of[item_id] = slot
+        self.by_rarity.setdefault(rank, set()).add(item_id)
+        return slot
+
+    def _drop_slot(self, slot: int) -> None:
+        """移除槽位，用最后一个槽位填补"""
+        item_id = self.item_ids[slot]
+        rank = self.rarities[slot]
+        last = len(self.item_ids) - 1
+        columns = [self.item_ids, self.counts, self.rarities] + list(self.modifiers.values())
+        if slot != last:
+            for column in columns:
+                column[slot] = column[last]
+            self.slot_of[self.item_ids[slot]] = slot
+        for column in columns:
+            column.pop()
+        del self.slot_of[item_id]
+        members = self.by_rarity[rank]
+        members.discard(item_id)
+        if not members:
+            del self.by_rarity[rank]
+
+    def add(self, item: ItemRef, count: int = 1) -> int:
+        """
+        放入物品
+
+        Args:
+            item: 物品名称或ID
+            count: 数量
+
+        Returns:
+            int: 放入后该物品的数量
+        """
+        if count < 1:
+            raise ValueError("放入数量必须为正数")
+        item_id = self.catalog.resolve(item, register=True)
+        slot = self.slot_of.get(item_id)
+        if slot is None:
+            slot = self._new_slot(item_id)
+        self.counts[slot] += count
+        self.total_count += count
+        for stat, column in self.modifiers.items():
+            self.stat_totals[stat] += column[slot] * count
+        return self.counts[slot]
+
+    def remove(self, item: ItemRef, count: int = 1) -> int:
+        """
+        取出物品，数量不足时不做任何修改并抛出 ValueError（未知物品抛出 KeyError）；
+        数量归零的物品同时卸下
+
+        Args:
+            item: 物品名称或ID
+            count: 数量
+
+        Returns:
+            int: 取出后该物品的剩余数量
+        """
+        if count < 1:
+            raise ValueError("取出数量必须为正数")
+        item_id = self.catalog.resolve(item)
+        slot = self.slot_of.get(item_id)
+        held = 0 if slot is None else self.counts[slot]
+        if held < count:
+            raise ValueError(f"物品数量不足: {self.catalog.names[item_id]} ({held} < {count})")
+        for stat, column in self.modifiers.items():
+            self.stat_totals[stat] -= column[slot] * count
+        self.total_count -= count
+        remaining = held - count
+        if remaining == 0:
+            if item_id in self.equipped:
+                self.unequip(item_id)
+            self._drop_slot(slot)
+        else:
+            self.counts[slot] = remaining
+        return remaining
+
+    def add_many(self, items: Iterable[Tuple[ItemRef, int]]) -> None:
+        """
+        批量放入物品
+
+        Args:
+            items: (物品, 数量) 序列
+        """
+        for item, count in items:
+            self.add(item, count)
+
+    def remove_many(self, items: Iterable[Tuple[ItemRef, int]]) -> None:
+        """
+        批量取出物品：先检查全部数量，任一不足时不做任何修改并抛出 ValueError（未知物品抛出 KeyError）
+
+        Args:
+            items: (物品, 数量) 序列
+        """
+        needed: Dict[int, int] = {}
+        for item, count in items:
+            if count < 1:
+                raise ValueError("取出数量必须为正数")
+            item_id = self.catalog.resolve(item)
+            needed[item_id] = needed.get(item_id, 0) + count
+        for item_id, count in needed.items():
+            if self.count(item_id) < count:
+                raise ValueError(
+                    f"物品数量不足: {self.catalog.names[item_id]} ({self.count(item_id)} < {count})"
+                )
+        for item_id, count in needed.items():
+            self.remove(item_id, count)
+
+    def add_drops(self, drops: Iterable[Dict[str, Any]]) -> None:
+        """放入 LootGenerator.roll 返回的战利品"""
+        self.add_many((drop["item"], drop["count"]) for drop in drops)
+
+    def count(self, item: ItemRef) -> int:
+        """某物品的数量"""
+        item_id = item if isinstance(item, int) else self.catalog.id_of.get(item)
+        slot = self.slot_of.get(item_id)
+        return 0 if slot is None else self.counts[slot]
+
+    def items_by_rarity(self, rarity: Union[str, int]) -> List[Tuple[str, int]]:
+        """
+        某稀有度的全部物品（通过稀有度索引，不遍历背包）
+
+        Args:
+            rarity: 稀有度名称或等级
+
+        Returns:
+            List: (物品名称, 数量) 列表，按物品ID排列
+        """
+        item_ids = sorted(self.by_rarity.get(self.catalog.rarity_rank(rarity), ()))
+        return [(self.catalog.names[item_id], self.count(item_id)) for item_id in item_ids]
+
+    def equip(self, item: ItemRef) -> bool:
+        """
+        装备一件背包中的物品（每种物品至多装备一件）
+
+        Returns:
+            bool: 是否新装备
+        """
+        item_id = self.catalog.resolve(item)
+        slot = self.slot_of.get(item_id)
+        if slot is None:
+            raise ValueError(f"背包中没有该物品: {self.catalog.names[item_id]}")
+        if item_id in self.equipped:
+            return False
+        self.equipped.add(item_id)
+        self._change_equipped(slot, 1)
+        return True
+
+    def unequip(self, item: ItemRef) -> bool:
+        """
+        卸下物品
+
+        Returns:
+            bool: 是否确实卸下
+        """
+        item_id = self.catalog.resolve(item)
+        if item_id not in self.equipped:
+            return False
+        self.equipped.discard(item_id)
+        self._change_equipped(self.slot_of[item_id], -1)
+        return True
+
+    def equipped_bonus(self) -> Dict[str, int]:
+        """已装备物品的属性加成合计（累计值，O(1)）"""
+        return dict(self.equipped_totals)
+
+    def total_bonus(self) -> Dict[str, int]:
+        """背包内全部物品（按数量）的属性加成合计（累计值，O(1)）"""
+        return dict(self.stat_totals)
+
+    def __len__(self) -> int:
+        """不同物品的种数"""
+        return len(self.item_ids)
+
+    def __contains__(self, item: ItemRef) -> bool:
+        return self.count(item) > 0
+
+    def __iter__(self) -> Iterator[Tuple[str, int]]:
+        """按槽位顺序产出 (物品名称, 数量)"""
+        names = self.catalog.names
+        for item_id, count in zip(self.item_ids, self.counts):
+            yield names[item_id], count
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为可序列化的字典"""
+        names = self.catalog.names
+        return {
+            "items": {name: count for name, count in self},
+            "equipped": sorted(names[item_id] for item_id in self.equipped),
+        }
+
+
+# 全局实例
+item_catalog = ItemCatalog.from_loot_tables(loot_table_loader)
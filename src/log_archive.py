@@ -0,0 +1,225 @@
+"""
+战斗日志归档模块
+使用标准库编解码器（gzip / bz2 / lzma）流式压缩日志文件，按段轮转命名，
+按数量、时间和总大小清理旧日志，并提供逐行流式读取（不把整个文件读入内存）
+"""
+
+import bz2
+import glob
+import gzip
+import lzma
+import os
+import re
+import time
+from typing import IO, Any, Dict, Iterator, List, Optional
+
+# 压缩方式 -> 文件后缀
+COMPRESSION_SUFFIXES: Dict[str, str] = {
+    "none": "",
+    "gzip": ".gz",
+    "bz2": ".bz2",
+    "lzma": ".xz",
+}
+
+_OPENERS = {"gzip": gzip.open, "bz2": bz2.open, "lzma": lzma.open}
+
+
+def _check_compression(compression: str) -> None:
+    if compression not in COMPRESSION_SUFFIXES:
+        raise ValueError(
+            f"未知压缩方式: {compression}，可选: {', '.join(COMPRESSION_SUFFIXES)}"
+        )
+
+
+def detect_compression(path: str) -> str:
+    """根据文件后缀判断压缩方式"""
+    for compression, suffix in COMPRESSION_SUFFIXES.items():
+        if suffix and path.endswith(suffix):
+            return compression
+    return "none"
+
+
+def segment_path(path: str, index: int, compression: str = "none") -> str:
+    """
+    计算日志分段的文件路径
+
+    Args:
+        path: 日志基础路径，如 logs/battle_20250101_120000.log
+        index: 分段序号，0 为第一段
+        compression: 压缩方式
+
+    Returns:
+        str: 如 battle_20250101_120000.log.gz、battle_20250101_120000.1.log.gz
+    """
+    _check_compression(compression)
+    if index > 0:
+        root, ext = os.path.splitext(path)
+        path = f"{root}.{index}{ext}"
+    return path + COMPRESSION_SUFFIXES[compression]
+
+
+def open_log_stream(path: str, mode: str = "rt", compression: Optional[str] = None) -> IO[str]:
+    """
+    以文本方式打开（可能压缩的）日志文件
+
+    Args:
+        path: 文件路径
+        mode: "rt"、"wt" 或 "at"
+        compression: 压缩方式，默认按文件后缀判断
+
+    Returns:
+        文本流（写入时数据在写出前流式压缩）
+    """
+    if compression is None:
+        compression = detect_compression(path)
+    _check_compression(compression)
+    if compression == "none":
+        return open(path, mode.replace("t", ""), encoding="utf-8")
+    return _OPENERS[compression](path, mode, encoding="utf-8")
+
+
+def iter_log_lines(path: str) -> Iterator[str]:
+    """
+    逐行流式读取日志文件（自动解压），行尾不含换行符；
+    压缩流没有结束标记时（仍在写入或未正常关闭）读到已写出的部分为止
+
+    Args:
+        path: 日志文件路径
+    """
+    with open_log_stream(path, "rt") as stream:
+        try:
+            for line in stream:
+                yield line.rstrip("\n")
+        except EOFError:
+            print(f"⚠️ 日志文件不完整（仍在写入或未正常关闭）: {path}")
+
+
+def _strip_compression_suffix(path: str) -> str:
+    suffix = COMPRESSION_SUFFIXES[detect_compression(path)]
+    return path[: -len(suffix)] if suffix else path
+
+
+def find_log_segments(path: str) -> List[str]:
+    """
+    按顺序列出一份日志的全部分段
+
+    Args:
+        path: 日志基础路径（如 logs/battle_x.log）或其第一段（如 logs/battle_x.log.gz）
+
+    Returns:
+        List[str]: 分段路径，第一段在前
+    """
+    base = _strip_compression_suffix(path)
+    root, ext = os.path.splitext(base)
+    segment_name = re.compile(re.escape(root) + r"(?:\.(\d+))?" + re.escape(ext))
+    segments = []
+    for candidate in glob.glob(glob.escape(root) + "*"):
+        match = segment_name.fullmatch(_strip_compression_suffix(candidate))
+        if match:
+            segments.append((int(match.group(1) or 0), candidate))
+    return [candidate for _, candidate in sorted(segments)]
+
+
+def iter_log_segments(path: str) -> Iterator[str]:
+    """
+    按顺序逐行流式读取一份日志的全部分段
+
+    Args:
+        path: 日志基础路径或其第一段
+    """
+    for segment in find_log_segments(path):
+        yield from iter_log_lines(segment)
+
+
+def log_group_key(path: str) -> str:
+    """
+    日志所属的组：同一场战斗的日志各分段与回放文件，文件名在第一个“.”之前相同
+
+    Args:
+        path: 文件路径，如 logs/battle_x.1.log.gz、logs/battle_x.replay.json
+
+    Returns:
+        str: 组标识，如 logs/battle_x
+    """
+    directory, name = os.path.split(path)
+    return os.path.join(directory, name.split(".", 1)[0])
+
+
+def apply_retention(
+    directory: str,
+    pattern: str = "battle_*",
+    max_logs: Optional[int] = None,
+    max_age_days: Optional[float] = None,
+    max_total_bytes: Optional[int] = None,
+    keep: Optional[List[str]] = None,
+    now: Optional[float] = None,
+) -> List[str]:
+    """
+    按保留策略删除旧日志：同一场战斗的文件（日志各分段、回放）按 log_group_key 归为一组，
+    整组保留或删除，不会只删掉轮转日志的前几段。先删除超过保留天数的组，
+    再从最旧的组开始删除，直到组数和总大小都不超过上限
+
+    Args:
+        directory: 日志目录
+        pattern: 参与清理的文件名模式
+        max_logs: 最多保留的组数（每场战斗一组），None 或 0 表示不限
+        max_age_days: 最长保留天数（按组内最新的修改时间），None 或 0 表示不限
+        max_total_bytes: 最大总字节数，None 或 0 表示不限
+        keep: 不删除的文件（如正在写入的日志），其所在的组整组保留
+        now: 当前时间戳，默认使用 time.time()
+
+    Returns:
+        List[str]: 被删除的文件路径
+    """
+    now = time.time() if now is None else now
+    keep_groups = {log_group_key(os.path.abspath(path)) for path in keep or []}
+    groups: Dict[str, List[Any]] = {}
+    for path in sorted(glob.glob(os.path.join(glob.escape(directory), pattern))):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        # 每组: [最新修改时间, 组标识, 总字节数, 文件列表]
+        key = log_group_key(os.path.abspath(path))
+        group = groups.setdefault(key, [0.0, key, 0, []])
+        group[0] = max(group[0], stat.st_mtime)
+        group[2] += stat.st_size
+        group[3].append((path, stat.st_size))
+    entries = sorted(groups.values())
+
+    removed = []
+
+    def remove(entry: List[Any]) -> bool:
+        """删除整组文件，返回该组是否已全部删除"""
+        if entry[1] in keep_groups:
+            return False
+        failed = []
+        for path, size in entry[3]:
+            try:
+                os.remove(path)
+            except OSError as e:
+                print(f"⚠️ 删除旧日志失败: {path} ({e})")
+                failed.append((path, size))
+                continue
+            removed.append(path)
+            entry[2] -= size
+        entry[3] = failed
+        return not failed
+
+    if max_age_days:
+        cutoff = now - max_age_days * 86400
+        entries = [entry for entry in entries if not (entry[0] < cutoff and remove(entry))]
+
+    total = sum(entry[2] for entry in entries)
+    remaining = 0
+    for index, entry in enumerate(entries):
+        newer = len(entries) - index - 1
+        over_count = max_logs and remaining + newer + 1 > max_logs
+        over_size = max_total_bytes and total > max_total_bytes
+        size = entry[2]
+        if (over_count or over_size) and remove(entry):
+            total -= size
+        else:
+            total -= size - entry[2]
+            remaining += 1
+    return removed
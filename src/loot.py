@@ -0,0 +1,517 @@
+"""
+战利品掉落模块
+从 data/loot_tables.json 加载掉落表（支持嵌套子表、稀有度和职业修正），
+加载后按 (掉落表, 职业) 展开为一张扁平的别名表：无论嵌套多深，每次掷骰只需一个随机数；
+批量接口用 numpy 一次采样大量掷骰，用于校验掉落率
+"""
+
+import json
+from fractions import Fraction
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # numpy 为可选依赖，仅批量掷骰需要
+    np = None
+
+from .alias_sampler import AliasSampler
+from .resource_path import get_resource_path
+from .rng import as_random_source
+
+# 战斗结束后使用的掉落表
+LOOT_TABLE_VICTORY = "battle_victory"
+LOOT_TABLE_TIMEOUT = "battle_timeout"
+
+# 批量掷骰时每块的采样个数，限制内存占用
+BATCH_CHUNK_SIZE = 1 << 20
+
+# 物品可带的属性加成
+ITEM_STATS = ("health", "attack", "defense")
+
+# 一次掷骰的结果: (物品, 稀有度, 数量)，None 表示本次没有掉落
+LootDrop = Tuple[str, str, int]
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError("批量掷骰需要安装 numpy (pipenv install numpy)")
+
+
+def _to_fraction(value: Any) -> Fraction:
+    """将配置中的权重/倍率转换为其十进制字面量对应的精确分数"""
+    return Fraction(str(value))
+
+
+class LootTableLoader:
+    """战利品掉落表加载器"""
+
+    def __init__(self, data_file_path: Optional[str] = None):
+        """
+        初始化掉落表加载器
+
+        Args:
+            data_file_path: loot_tables.json 文件路径，如果为None则使用默认路径
+        """
+        if data_file_path is None:
+            data_file_path = get_resource_path("data/loot_tables.json")
+
+        self.data_file_path = data_file_path
+        self._rarities: Dict[str, Dict[str, Any]] = {}
+        self._tables: Dict[str, Dict[str, Any]] = {}
+        self._class_modifiers: Dict[str, Dict[str, Dict[str, float]]] = {}
+        self.all_load_success = True
+        self._load_loot_tables()
+
+    def _validate_entry(self, entry: Any) -> Optional[Dict[str, Any]]:
+        """校验单个条目，格式错误时返回None"""
+        if not isinstance(entry, dict):
+            return None
+        try:
+            weight = float(entry.get("weight", 0))
+        except (TypeError, ValueError):
+            return None
+        if weight <= 0 or ("item" in entry and "table" in entry):
+            return None
+
+        validated: Dict[str, Any] = {"weight": entry["weight"]}
+        if "table" in entry:
+            validated["table"] = str(entry["table"])
+        elif "item" in entry:
+            rarity = entry.get("rarity")
+            if rarity not in self._rarities:
+                return None
+            count = entry.get("count", [1, 1])
+            if isinstance(count, int):
+                count = [count, count]
+            if not isinstance(count, list) or len(count) != 2:
+                return None
+            try:
+                count = [int(count[0]), int(count[1])]
+            except (TypeError, ValueError):
+                return None
+            if not 1 <= count[0] <= count[1]:
+                return None
+            stats = entry.get("stats", {})
+            if not isinstance(stats, dict) or any(key not in ITEM_STATS for key in stats):
+                return None
+            try:
+                stats = {key: int(value) for key, value in stats.items()}
+            except (TypeError, ValueError):
+                return None
+            validated.update(
+                {
+                    "item": str(entry["item"]),
+                    "rarity": rarity,
+                    "count": tuple(count),
+                    "tags": [str(tag) for tag in entry.get("tags", [])],
+                    "stats": stats,
+                }
+            )
+        return validated
+
+    @staticmethod
+    def _positive_multiplier(value: Any) -> bool:
+        """倍率是否为可解析的正数（为0或负数会使掉落表总权重为0或概率为负）"""
+        try:
+            return _to_fraction(value) > 0
+        except (TypeError, ValueError, ZeroDivisionError):
+            return False
+
+    def _validate_multipliers(self, owner: str, multipliers: Any) -> Dict[str, Any]:
+        """校验职业修正中的倍率表，跳过非正数倍率"""
+        validated = {}
+        for name, value in dict(multipliers).items():
+            if self._positive_multiplier(value):
+                validated[str(name)] = value
+            else:
+                print(f"⚠️ 职业修正 {owner} 的倍率必须为正数，跳过: {name}={value}")
+        return validated
+
+    def _check_references(self) -> None:
+        """移除引用不存在子表的条目，并拒绝循环引用"""
+        for table_name, table in self._tables.items():
+            entries = []
+            for entry in table["entries"]:
+                if "table" in entry and entry["table"] not in self._tables:
+                    print(f"⚠️ 掉落表 {table_name} 引用了不存在的子表，跳过: {entry['table']}")
+                    continue
+                entries.append(entry)
+            table["entries"] = entries
+
+        def visit(name: str, path: List[str]) -> None:
+            if name in path:
+                raise ValueError(f"掉落表存在循环引用: {' -> '.join(path + [name])}")
+            for entry in self._tables[name]["entries"]:
+                if "table" in entry:
+                    visit(entry["table"], path + [name])
+
+        for name in self._tables:
+            visit(name, [])
+
+    def _load_loot_tables(self) -> None:
+        """从JSON文件加载掉落表"""
+        try:
+            with open(self.data_file_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+
+            self._rarities = {}
+            for name, value in data.get("rarities", {}).items():
+                multiplier = value.get("multiplier", 1)
+                if not self._positive_multiplier(multiplier):
+                    print(f"⚠️ 稀有度 {name} 的倍率必须为正数，跳过: {multiplier}")
+                    continue
+                self._rarities[str(name)] = {
+                    "rank": int(value.get("rank", 0)),
+                    "multiplier": multiplier,
+                }
+            raw_tables = data.get("tables", {})
+            if not raw_tables:
+                raise ValueError("掉落表数据为空")
+
+            self._tables = {}
+            for table_name, table in raw_tables.items():
+                entries = []
+                for entry in table.get("entries", []):
+                    validated = self._validate_entry(entry)
+                    if validated is None:
+                        print(f"⚠️ 掉落表 {table_name} 条目格式错误，跳过: {entry}")
+                    else:
+                        entries.append(validated)
+                self._tables[str(table_name)] = {
+                    "rolls": max(1, int(table.get("rolls", 1))),
+                    "entries": entries,
+                }
+            self._check_references()
+            for table_name, table in self._tables.items():
+                if not table["entries"]:
+                    raise ValueError(f"掉落表 {table_name} 没有有效条目")
+
+            self._class_modifiers = {
+                str(class_name): {
+                    "tags": self._validate_multipliers(class_name, modifier.get("tags", {})),
+                    "rarities": self._validate_multipliers(class_name, modifier.get("rarities", {})),
+                }
+                for class_name, modifier in data.get("class_modifiers", {}).items()
+            }
+            print(f"✅ 成功加载 {len(self._tables)} 个战利品掉落表")
+
+        except FileNotFoundError:
+            self.all_load_success = False
+            print(f"❌ 找不到战利品掉落表文件: {self.data_file_path}")
+
+        except json.JSONDecodeError as e:
+            self.all_load_success = False
+            print(f"❌ JSON配置文件格式错误: {e}")
+
+        except Exception as e:
+            self.all_load_success = False
+            self._tables = {}
+            print(f"❌ 加载战利品掉落表时发生错误: {e}")
+
+    def get_table_names(self) -> List[str]:
+        """获取所有掉落表名称"""
+        return list(self._tables)
+
+    def get_table(self, table_name: str) -> Optional[Dict[str, Any]]:
+        """获取掉落表定义（rolls 与 entries），不存在时返回None"""
+        return self._tables.get(table_name)
+
+    def get_items(self) -> Dict[str, Dict[str, Any]]:
+        """
+        获取所有掉落表中出现的物品定义
+
+        Returns:
+            Dict: 物品 -> {"rarity": 稀有度, "stats": 属性加成}，同名物品以首次出现为准
+        """
+        items: Dict[str, Dict[str, Any]] = {}
+        for table in self._tables.values():
+            for entry in table["entries"]:
+                if "item" in entry and entry["item"] not in items:
+                    items[entry["item"]] = {"rarity": entry["rarity"], "stats": dict(entry["stats"])}
+        return items
+
+    def get_rarity_rank(self, rarity: str) -> int:
+        """获取稀有度等级，数值越大越稀有"""
+        return self._rarities.get(rarity, {}).get("rank", 0)
+
+    def entry_weight(self, entry: Dict[str, Any], character_class: Optional[str] = None) -> Fraction:
+        """
+        计算条目的实际权重：基础权重 × 稀有度倍率 × 职业对标签和稀有度的修正
+
+        Args:
+            entry: 掉落表条目
+            character_class: 获得掉落的职业，None表示不应用职业修正
+
+        Returns:
+            Fraction: 精确权重
+        """
+        weight = _to_fraction(entry["weight"])
+        if "item" not in entry:
+            return weight
+        weight *= _to_fraction(self._rarities[entry["rarity"]]["multiplier"])
+        modifier = self._class_modifiers.get(character_class) if character_class else None
+        if modifier:
+            for tag in entry["tags"]:
+                if tag in modifier["tags"]:
+                    weight *= _to_fraction(modifier["tags"][tag])
+            if entry["rarity"] in modifier["rarities"]:
+                weight *= _to_fraction(modifier["rarities"][entry["rarity"]])
+        return weight
+
+    def reload_loot_tables(self) -> None:
+        """重新加载掉落表"""
+        self.all_load_success = True
+        self._load_loot_tables()
+
+
+class CompiledLootTable:
+    """
+    展开为扁平别名表的掉落表
+
+    嵌套子表在编译时按路径概率相乘展开，数量区间展开为等概率的各个数量，
+    因此一次掷骰（含子表选择和数量）只需一个均匀随机数
+    """
+
+    def __init__(
+        self,
+        table_name: str,
+        outcomes: List[Optional[LootDrop]],
+        probabilities: List[Fraction],
+        rolls: int,
+        character_class: Optional[str] = None,
+    ):
+        """
+        Args:
+            table_name: 掉落表名称
+            outcomes: 展开后的全部结果（None 表示空掉落）
+            probabilities: 各结果的精确概率
+            rolls: 每次掉落的掷骰次数
+            character_class: 编译时应用的职业修正
+        """
+        self.table_name = table_name
+        self.outcomes = outcomes
+        self.probabilities = probabilities
+        self.rolls = rolls
+        self.character_class = character_class
+        self.sampler = AliasSampler(probabilities, outcomes)
+        self.roll_once = self.sampler.sample
+
+    def roll(self, random_value: Any, rolls: Optional[int] = None) -> List[LootDrop]:
+        """
+        掷骰并返回非空的掉落（未合并）
+
+        Args:
+            random_value: 返回 [0, 1) 均匀随机数的函数
+            rolls: 掷骰次数，默认使用掉落表的 rolls
+        """
+        roll_once = self.roll_once
+        drops = []
+        for _ in range(self.rolls if rolls is None else rolls):
+            drop = roll_once(random_value)
+            if drop is not None:
+                drops.append(drop)
+        return drops
+
+    def drop_rates(self) -> Dict[str, Dict[str, float]]:
+        """
+        每次掷骰各物品的精确掉落概率与期望数量
+
+        Returns:
+            Dict: 物品 -> {"probability": 掉落概率, "expected_count": 期望数量}
+        """
+        rates: Dict[str, List[Fraction]] = {}
+        for outcome, probability in zip(self.outcomes, self.probabilities):
+            if outcome is None:
+                continue
+            item, _, count = outcome
+            rate = rates.setdefault(item, [Fraction(0), Fraction(0)])
+            rate[0] += probability
+            rate[1] += probability * count
+        return {
+            item: {"probability": float(p), "expected_count": float(c)}
+            for item, (p, c) in rates.items()
+        }
+
+    def roll_batch(self, rng: "np.random.Generator", rolls: int) -> Dict[str, Any]:
+        """
+        批量掷骰，按结果下标计数后汇总，不逐次创建Python对象
+
+        Args:
+            rng: numpy.random.Generator
+            rolls: 掷骰总次数
+
+        Returns:
+            Dict: rolls、empty（空掉落次数）、drops（物品 -> 掉落次数）、
+                counts（物品 -> 总数量）
+        """
+        _require_numpy()
+        histogram = np.zeros(len(self.outcomes), dtype=np.int64)
+        remaining = rolls
+        while remaining > 0:
+            size = min(remaining, BATCH_CHUNK_SIZE)
+            histogram += np.bincount(
+                self.sampler.sample_indices(rng, size), minlength=len(self.outcomes)
+            )
+            remaining -= size
+
+        empty = 0
+        drops: Dict[str, int] = {}
+        counts: Dict[str, int] = {}
+        for outcome, hits in zip(self.outcomes, histogram.tolist()):
+            if outcome is None:
+                empty += hits
+                continue
+            item, _, count = outcome
+            drops[item] = drops.get(item, 0) + hits
+            counts[item] = counts.get(item, 0) + hits * count
+        return {"rolls": rolls, "empty": empty, "drops": drops, "counts": counts}
+
+
+class LootGenerator:
+    """战利品生成器：编译并缓存掉落表，提供单次掉落、批量掷骰和战斗结算接口"""
+
+    def __init__(self, loader: Optional[LootTableLoader] = None):
+        """
+        Args:
+            loader: 掉落表加载器，默认使用全局实例
+        """
+        self.loader = loader or loot_table_loader
+        # (掉落表, 职业) -> 编译后的掉落表
+        self._compiled: Dict[Tuple[str, Optional[str]], CompiledLootTable] = {}
+
+    def _expand(
+        self,
+        table_name: str,
+        character_class: Optional[str],
+        probability: Fraction,
+        merged: Dict[Optional[LootDrop], Fraction],
+    ) -> None:
+        table = self.loader.get_table(table_name)
+        weights = [self.loader.entry_weight(entry, character_class) for entry in table["entries"]]
+        total = sum(weights)
+        if total <= 0:
+            # 加载时已拒绝非正权重与倍率，此处兜底：总权重为0的表视为不掉落，而不是除零
+            merged[None] = merged.get(None, Fraction(0)) + probability
+            return
+        for entry, weight in zip(table["entries"], weights):
+            branch = probability * weight / total
+            if "table" in entry:
+                # 子表在编译时展开；子表自身的 rolls 只在直接掷该表时生效
+                self._expand(entry["table"], character_class, branch, merged)
+            elif "item" in entry:
+                low, high = entry["count"]
+                share = branch / (high - low + 1)
+                for count in range(low, high + 1):
+                    drop = (entry["item"], entry["rarity"], count)
+                    merged[drop] = merged.get(drop, Fraction(0)) + share
+            else:
+                merged[None] = merged.get(None, Fraction(0)) + branch
+
+    def compile(self, table_name: str, character_class: Optional[str] = None) -> CompiledLootTable:
+        """
+        获取编译后的掉落表（结果按 (掉落表, 职业) 缓存）
+
+        Args:
+            table_name: 掉落表名称
+            character_class: 获得掉落的职业，用于应用职业修正
+
+        Returns:
+            CompiledLootTable: 扁平别名表
+        """
+        key = (table_name, character_class)
+        compiled = self._compiled.get(key)
+        if compiled is None:
+            table = self.loader.get_table(table_name)
+            if table is None:
+                raise KeyError(f"未知掉落表: {table_name}")
+            merged: Dict[Optional[LootDrop], Fraction] = {}
+            self._expand(table_name, character_class, Fraction(1), merged)
+            compiled = CompiledLootTable(
+                table_name, list(merged), list(merged.values()), table["rolls"], character_class
+            )
+            self._compiled[key] = compiled
+        return compiled
+
+    def clear_cache(self) -> None:
+        """清空编译缓存（重新加载掉落表后调用）"""
+        self._compiled.clear()
+
+    def roll(
+        self,
+        table_name: str,
+        character_class: Optional[str] = None,
+        rng: Any = None,
+        rolls: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        掷一次掉落，相同物品合并数量
+
+        Args:
+            table_name: 掉落表名称
+            character_class: 获得掉落的职业
+            rng: 随机数源（random.Random、numpy Generator 等），默认使用全局 random
+            rolls: 掷骰次数，默认使用掉落表的 rolls
+
+        Returns:
+            List[Dict]: item、rarity、count，按稀有度从高到低排列
+        """
+        compiled = self.compile(table_name, character_class)
+        totals: Dict[Tuple[str, str], int] = {}
+        for item, rarity, count in compiled.roll(as_random_source(rng).random, rolls):
+            totals[(item, rarity)] = totals.get((item, rarity), 0) + count
+        drops = [
+            {"item": item, "rarity": rarity, "count": count}
+            for (item, rarity), count in totals.items()
+        ]
+        drops.sort(key=lambda drop: (-self.loader.get_rarity_rank(drop["rarity"]), drop["item"]))
+        return drops
+
+    def roll_batch(
+        self,
+        table_name: str,
+        rolls: int,
+        character_class: Optional[str] = None,
+        rng: Optional["np.random.Generator"] = None,
+    ) -> Dict[str, Any]:
+        """
+        批量掷骰用于校验掉落率
+
+        Args:
+            table_name: 掉落表名称
+            rolls: 掷骰总次数
+            character_class: 获得掉落的职业
+            rng: numpy.random.Generator，为None时使用新的随机生成器
+
+        Returns:
+            Dict: 见 CompiledLootTable.roll_batch
+        """
+        _require_numpy()
+        if rng is None:
+            rng = np.random.default_rng()
+        return self.compile(table_name, character_class).roll_batch(rng, rolls)
+
+    def roll_battle_loot(
+        self, battle_result: Dict[str, Any], character_class: Optional[str], rng: Any = None
+    ) -> List[Dict[str, Any]]:
+        """
+        根据战斗结果掷战利品
+
+        Args:
+            battle_result: Battle._generate_battle_result 返回的结果
+            character_class: 获得战利品的角色职业
+            rng: 随机数源
+
+        Returns:
+            List[Dict]: 合并后的掉落，战斗结果没有对应掉落表时为空
+        """
+        table_name = (
+            LOOT_TABLE_VICTORY if battle_result["outcome"] == "victory" else LOOT_TABLE_TIMEOUT
+        )
+        if self.loader.get_table(table_name) is None:
+            return []
+        return self.roll(table_name, character_class, rng)
+
+
+# 全局实例
+loot_table_loader = LootTableLoader()
+loot_generator = LootGenerator(loot_table_loader)
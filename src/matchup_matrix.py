@@ -0,0 +1,144 @@
+"""
+职业对战矩阵模块
+计算所有预设职业两两对战（有序对）的胜/平/负率和回合分布，
+并以角色属性与战斗配置的内容哈希为键，将结果缓存到磁盘
+"""
+
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+from .battle import BattleOutcomeStats
+from .character_generator import CharacterDataLoader, character_data_loader
+from .config_manager import GameConfig, game_config
+from .parallel_runner import TournamentRunner, ENGINE_VECTORIZED
+from .resource_path import get_project_root
+from .result_cache import ResultCache
+
+# 缓存格式版本，模拟逻辑变化时递增以使旧缓存失效
+CACHE_VERSION = 1
+
+
+def get_default_cache_dir() -> str:
+    """获取默认的对战矩阵缓存目录"""
+    return os.path.join(get_project_root(), "cache", "matchups")
+
+
+class MatchupMatrix:
+    """职业对战矩阵"""
+
+    def __init__(
+        self,
+        data_loader: Optional[CharacterDataLoader] = None,
+        config: Optional[GameConfig] = None,
+        battles: int = 100000,
+        seed: int = 0,
+        workers: Optional[int] = 1,
+        engine: str = ENGINE_VECTORIZED,
+        cache_dir: Optional[str] = None,
+        use_cache: bool = True,
+    ):
+        """
+        初始化对战矩阵
+
+        Args:
+            data_loader: 角色数据加载器，默认使用全局实例
+            config: 游戏配置，默认使用全局实例
+            battles: 每个有序对局的模拟场数
+            seed: 主随机种子
+            workers: 并行进程数，0或None表示使用全部CPU核心
+            engine: 模拟引擎，"vectorized" 或 "scalar"
+            cache_dir: 缓存目录，默认为项目根目录下的 cache/matchups
+            use_cache: 是否读写磁盘缓存
+        """
+        self.data_loader = data_loader or character_data_loader
+        self.config = config or game_config
+        self.battles = battles
+        self.seed = seed
+        self.workers = workers
+        self.engine = engine
+        self.cache_dir = cache_dir or get_default_cache_dir()
+        self.cache = ResultCache(self.cache_dir, CACHE_VERSION, "对战缓存")
+        self.use_cache = use_cache
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def cache_key(self, player1: Dict[str, Any], player2: Dict[str, Any]) -> str:
+        """
+        计算对局的缓存键
+
+        Args:
+            player1: 玩家1角色数据
+            player2: 玩家2角色数据
+
+        Returns:
+            str: 由角色属性、战斗配置和模拟参数得到的SHA-256哈希
+        """
+        return self.cache.key(
+            player1,
+            player2,
+            self.config.get_battle_rules(),
+            self.battles,
+            self.seed,
+            self.engine,
+        )
+
+    def compute(self) -> Dict[Tuple[str, str], BattleOutcomeStats]:
+        """
+        计算所有有序职业对的对战结果
+
+        Returns:
+            Dict: (玩家1职业, 玩家2职业) -> BattleOutcomeStats
+        """
+        presets = self.data_loader.get_character_presets()
+        rules = self.config.get_battle_rules()
+        results: Dict[Tuple[str, str], BattleOutcomeStats] = {}
+
+        pending: List[Tuple[Tuple[str, str], str, Dict[str, Any], Dict[str, Any]]] = []
+        for player1 in presets:
+            for player2 in presets:
+                pair = (player1["class"], player2["class"])
+                key = self.cache_key(player1, player2)
+                cached = self.cache.load(key) if self.use_cache else None
+                if cached is not None:
+                    self.cache_hits += 1
+                    results[pair] = cached
+                else:
+                    self.cache_misses += 1
+                    pending.append((pair, key, player1, player2))
+
+        if pending:
+            runner = TournamentRunner(
+                workers=self.workers, engine=self.engine, rules=rules
+            )
+            # 每个对局的种子由其缓存键决定，与其在矩阵中的位置无关
+            stats_list = runner.run(
+                [(player1, player2) for _, _, player1, player2 in pending],
+                self.battles,
+                matchup_seeds=[ResultCache.seed_for(key) for _, key, _, _ in pending],
+            )
+            for (pair, key, _, _), stats in zip(pending, stats_list):
+                results[pair] = stats
+                if self.use_cache:
+                    self.cache.store(key, stats)
+
+        return results
+
+    @staticmethod
+    def format_table(
+        results: Dict[Tuple[str, str], BattleOutcomeStats], classes: List[str]
+    ) -> str:
+        """
+        将对战结果格式化为胜率表（行为玩家1，列为玩家2）
+
+        Args:
+            results: compute 返回的对战结果
+            classes: 职业顺序
+        """
+        lines = [f"{'':8}" + "".join(f"{c:8}" for c in classes)]
+        for class1 in classes:
+            cells = []
+            for class2 in classes:
+                stats = results[(class1, class2)]
+                cells.append(f"{stats.player1_wins / max(stats.battles, 1):<8.1%}")
+            lines.append(f"{class1:8}" + "".join(cells))
+        return "\n".join(lines)
@@ -0,0 +1,189 @@
+"""
+多进程对局运行器模块
+将大量对局切分为固定大小的分片，分发到进程池并行模拟
+
+每个分片的随机种子只由主种子、对局编号和分片编号决定，
+与进程数量无关；各分片的整数统计结果按顺序合并，
+因此无论使用多少个进程，最终结果都完全一致
+"""
+
+import hashlib
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .battle import BattleOutcomeStats, BattleSimulator
+from .battle_rules import BattleRules
+from .config_manager import game_config
+
+ENGINE_SCALAR = "scalar"
+ENGINE_VECTORIZED = "vectorized"
+
+# 单个分片任务: (对局编号, 分片编号, 玩家1数据, 玩家2数据, 场数, 最大回合数, 引擎, 种子, 战斗规则)
+ChunkTask = Tuple[
+    int, int, Dict[str, Any], Dict[str, Any], int, int, str, int, BattleRules
+]
+
+
+def derive_seed(master_seed: int, *keys: int) -> int:
+    """
+    由主种子和任意整数键派生独立的64位子种子
+
+    Args:
+        master_seed: 主随机种子
+        *keys: 派生路径，例如 (对局编号, 分片编号)
+
+    Returns:
+        int: 子种子
+    """
+    material = ",".join(str(k) for k in (master_seed,) + keys).encode("ascii")
+    return int.from_bytes(hashlib.sha256(material).digest()[:8], "little")
+
+
+def _run_chunk(task: ChunkTask) -> Tuple[int, int, BattleOutcomeStats]:
+    """在工作进程中模拟一个分片"""
+    (
+        matchup_index,
+        chunk_index,
+        player1,
+        player2,
+        battles,
+        max_rounds,
+        engine,
+        seed,
+        rules,
+    ) = task
+
+    if engine == ENGINE_VECTORIZED:
+        import numpy as np
+        from .battle_kernel import VectorizedBattleSimulator
+
+        simulator = VectorizedBattleSimulator(
+            player1, player2, max_rounds=max_rounds, rules=rules
+        )
+        stats = simulator.run(battles, rng=np.random.default_rng(seed))
+    else:
+        simulator = BattleSimulator(player1, player2, max_rounds=max_rounds, rules=rules)
+        stats = simulator.run(battles, rng=random.Random(seed))
+
+    return matchup_index, chunk_index, stats
+
+
+class TournamentRunner:
+    """多进程对局运行器"""
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        chunk_size: int = 1 << 16,
+        engine: str = ENGINE_VECTORIZED,
+        max_rounds: Optional[int] = None,
+        rules: Optional[BattleRules] = None,
+    ):
+        """
+        初始化运行器
+
+        Args:
+            workers: 进程数量，None或0表示使用全部CPU核心，1表示在当前进程中运行
+            chunk_size: 每个分片的战斗场数，决定随机流的划分方式（影响结果）
+            engine: 模拟引擎，"vectorized" 或 "scalar"
+            max_rounds: 单场战斗最大回合数，默认使用战斗规则中的设置
+            rules: 战斗规则，默认使用全局配置中的规则（随分片任务传给工作进程）
+        """
+        if engine not in (ENGINE_SCALAR, ENGINE_VECTORIZED):
+            raise ValueError(f"未知模拟引擎: {engine}")
+        if chunk_size <= 0:
+            raise ValueError("chunk_size 必须为正数")
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.engine = engine
+        self.rules = rules or game_config.get_battle_rules()
+        self.max_rounds_override = max_rounds
+        self.max_rounds = self.rules.max_rounds if max_rounds is None else max_rounds
+
+    def _max_rounds_for(self, rules: BattleRules) -> int:
+        if self.max_rounds_override is None:
+            return rules.max_rounds
+        return self.max_rounds_override
+
+    def _iter_tasks(
+        self,
+        matchups: Sequence[Tuple[Dict[str, Any], Dict[str, Any]]],
+        battles_per_matchup: int,
+        seed: int,
+        matchup_seeds: Optional[Sequence[int]],
+        matchup_rules: Optional[Sequence[BattleRules]] = None,
+    ) -> Iterator[ChunkTask]:
+        for matchup_index, (player1, player2) in enumerate(matchups):
+            rules = self.rules if matchup_rules is None else matchup_rules[matchup_index]
+            max_rounds = self._max_rounds_for(rules)
+            if matchup_seeds is None:
+                seed_path: Tuple[int, ...] = (seed, matchup_index)
+            else:
+                seed_path = (matchup_seeds[matchup_index],)
+            remaining = battles_per_matchup
+            chunk_index = 0
+            while remaining > 0:
+                size = min(remaining, self.chunk_size)
+                yield (
+                    matchup_index,
+                    chunk_index,
+                    player1,
+                    player2,
+                    size,
+                    max_rounds,
+                    self.engine,
+                    derive_seed(*seed_path, chunk_index),
+                    rules,
+                )
+                remaining -= size
+                chunk_index += 1
+
+    def run(
+        self,
+        matchups: Sequence[Tuple[Dict[str, Any], Dict[str, Any]]],
+        battles_per_matchup: int,
+        seed: int = 0,
+        matchup_seeds: Optional[Sequence[int]] = None,
+        matchup_rules: Optional[Sequence[BattleRules]] = None,
+    ) -> List[BattleOutcomeStats]:
+        """
+        并行模拟所有对局
+
+        Args:
+            matchups: 对局列表，每项为 (玩家1数据, 玩家2数据)
+            battles_per_matchup: 每个对局的模拟场数
+            seed: 主随机种子
+            matchup_seeds: 每个对局独立的种子，指定时忽略 seed，
+                使对局结果与其在列表中的位置无关
+            matchup_rules: 每个对局各自的战斗规则，指定时覆盖运行器的规则，
+                使一次运行可覆盖多组配置（单场最大回合数也取自各自的规则）
+
+        Returns:
+            List[BattleOutcomeStats]: 与 matchups 顺序一致的统计结果
+        """
+        if matchup_seeds is not None and len(matchup_seeds) != len(matchups):
+            raise ValueError("matchup_seeds 的长度必须与 matchups 一致")
+        if matchup_rules is None:
+            results = [BattleOutcomeStats(self.max_rounds) for _ in matchups]
+        elif len(matchup_rules) != len(matchups):
+            raise ValueError("matchup_rules 的长度必须与 matchups 一致")
+        else:
+            results = [
+                BattleOutcomeStats(self._max_rounds_for(rules)) for rules in matchup_rules
+            ]
+        tasks = self._iter_tasks(
+            matchups, battles_per_matchup, seed, matchup_seeds, matchup_rules
+        )
+
+        # executor.map 按提交顺序返回结果，保证合并顺序确定
+        if self.workers == 1:
+            for matchup_index, _, stats in map(_run_chunk, tasks):
+                results[matchup_index].merge(stats)
+        else:
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                for matchup_index, _, stats in executor.map(_run_chunk, tasks):
+                    results[matchup_index].merge(stats)
+
+        return results
@@ -0,0 +1,286 @@
+"""
+战斗配置参数扫描模块
+在 battle 部分的若干键上取网格，对每个网格点模拟指定职业对局，输出整齐的结果表
+
+每个 (网格点, 对局) 的结果以角色属性、完整战斗规则和模拟参数的内容哈希为键缓存到磁盘，
+每批网格点完成后立即写入缓存；中断后重新运行同一扫描只会计算缺失的部分
+"""
+
+import csv
+import itertools
+import os
+from decimal import Decimal
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .battle import BattleOutcomeStats
+from .battle_rules import BATTLE_RULE_DEFAULTS, BattleRules
+from .character_generator import CharacterDataLoader, character_data_loader
+from .config_manager import game_config
+from .parallel_runner import ENGINE_VECTORIZED, TournamentRunner
+from .resource_path import get_project_root
+from .result_cache import ResultCache
+
+# 缓存格式版本，模拟逻辑变化时递增以使旧缓存失效
+SWEEP_CACHE_VERSION = 1
+
+# 结果表中每行的统计列
+RESULT_COLUMNS = (
+    "player1_win_rate",
+    "player2_win_rate",
+    "timeout_rate",
+    "mean_rounds",
+    "rounds_p90",
+)
+
+
+def get_default_sweep_cache_dir() -> str:
+    """获取默认的参数扫描缓存目录"""
+    return os.path.join(get_project_root(), "cache", "sweeps")
+
+
+def parse_grid_spec(spec: str) -> Tuple[str, List[Any]]:
+    """
+    解析网格定义
+
+    Args:
+        spec: "键=起点:终点:步长"（包含终点）或 "键=值1,值2,..."，
+            例如 "critical_hit_chance=0.05:0.25:0.05"
+
+    Returns:
+        (键, 取值列表)
+    """
+    key, separator, values_text = spec.partition("=")
+    key = key.strip()
+    if not separator or not values_text.strip():
+        raise ValueError(f"网格定义格式错误: {spec}")
+    if key not in BATTLE_RULE_DEFAULTS:
+        raise ValueError(f"未知战斗配置键: {key}，可选: {', '.join(BATTLE_RULE_DEFAULTS)}")
+    cast = type(BATTLE_RULE_DEFAULTS[key])
+
+    if ":" in values_text:
+        parts = values_text.split(":")
+        if len(parts) != 3:
+            raise ValueError(f"范围格式应为 起点:终点:步长: {spec}")
+        # 用 Decimal 逐步累加，避免 0.1 + 0.2 之类的浮点误差
+        start, stop, step = (Decimal(part.strip()) for part in parts)
+        if step <= 0:
+            raise ValueError(f"步长必须为正数: {spec}")
+        values = []
+        current = start
+        while current <= stop:
+            values.append(cast(current))
+            current += step
+    else:
+        values = [cast(Decimal(part.strip())) for part in values_text.split(",") if part.strip()]
+    if not values:
+        raise ValueError(f"网格没有取值: {spec}")
+    return key, values
+
+
+class ParameterSweep:
+    """战斗配置参数扫描"""
+
+    def __init__(
+        self,
+        grid: Dict[str, Sequence[Any]],
+        classes: Optional[Sequence[str]] = None,
+        battles: int = 10000,
+        seed: int = 0,
+        workers: Optional[int] = 1,
+        engine: str = ENGINE_VECTORIZED,
+        base_rules: Optional[BattleRules] = None,
+        data_loader: Optional[CharacterDataLoader] = None,
+        cache_dir: Optional[str] = None,
+        use_cache: bool = True,
+        points_per_batch: int = 8,
+    ):
+        """
+        初始化参数扫描
+
+        Args:
+            grid: 战斗配置键 -> 取值列表，网格为各键取值的笛卡尔积
+            classes: 参与的职业，两两组成对局（无序对），默认全部预设职业
+            battles: 每个 (网格点, 对局) 的模拟场数
+            seed: 主随机种子
+            workers: 进程数量，0或None表示使用全部CPU核心
+            engine: 模拟引擎，"vectorized" 或 "scalar"
+            base_rules: 网格以外的键取值，默认使用全局配置中的规则
+            data_loader: 角色数据加载器，默认使用全局实例
+            cache_dir: 缓存目录，默认为项目根目录下的 cache/sweeps
+            use_cache: 是否读写磁盘缓存
+            points_per_batch: 每批一起提交到进程池的网格点数，每批完成后写入缓存
+        """
+        if not grid:
+            raise ValueError("参数网格不能为空")
+        for key, values in grid.items():
+            if key not in BATTLE_RULE_DEFAULTS:
+                raise ValueError(f"未知战斗配置键: {key}")
+            if not values:
+                raise ValueError(f"网格键 {key} 没有取值")
+        self.grid = {key: list(values) for key, values in grid.items()}
+        self.battles = battles
+        self.seed = seed
+        self.workers = workers
+        self.engine = engine
+        self.base_rules = base_rules or game_config.get_battle_rules()
+        self.cache_dir = cache_dir or get_default_sweep_cache_dir()
+        self.cache = ResultCache(self.cache_dir, SWEEP_CACHE_VERSION, "扫描缓存")
+        self.use_cache = use_cache
+        self.points_per_batch = max(1, points_per_batch)
+
+        data_loader = data_loader or character_data_loader
+        presets = data_loader.get_character_presets()
+        if classes is not None:
+            by_class = {preset["class"]: preset for preset in presets}
+            unknown = [name for name in classes if name not in by_class]
+            if unknown:
+                raise ValueError(f"未知职业: {', '.join(unknown)}")
+            presets = [by_class[name] for name in classes]
+        if len(presets) < 2:
+            raise ValueError("至少需要两个职业")
+        self.matchups = list(itertools.combinations(presets, 2))
+
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.invalid_points: List[Dict[str, Any]] = []
+
+    def iter_points(self) -> Iterator[Dict[str, Any]]:
+        """按网格顺序逐个产生网格点"""
+        keys = list(self.grid)
+        for values in itertools.product(*(self.grid[key] for key in keys)):
+            yield dict(zip(keys, values))
+
+    def point_count(self) -> int:
+        """网格点总数"""
+        count = 1
+        for values in self.grid.values():
+            count *= len(values)
+        return count
+
+    def cache_key(
+        self, rules: BattleRules, player1: Dict[str, Any], player2: Dict[str, Any]
+    ) -> str:
+        """
+        计算 (网格点, 对局) 的缓存键
+
+        Returns:
+            str: 由角色属性、完整战斗规则和模拟参数得到的SHA-256哈希
+        """
+        return self.cache.key(
+            player1, player2, rules, self.battles, self.seed, self.engine
+        )
+
+    def _row(
+        self,
+        point: Dict[str, Any],
+        player1: Dict[str, Any],
+        player2: Dict[str, Any],
+        stats: BattleOutcomeStats,
+    ) -> Dict[str, Any]:
+        summary = stats.to_dict()
+        row = dict(point)
+        row["player1"] = player1["class"]
+        row["player2"] = player2["class"]
+        row["battles"] = summary["battles"]
+        for column in RESULT_COLUMNS:
+            row[column] = summary[column]
+        return row
+
+    def _run_batch(self, batch: List[Tuple[Dict[str, Any], BattleRules]]) -> List[Dict[str, Any]]:
+        """计算一批网格点，缓存命中的对局不再模拟"""
+        entries = []
+        pending = []
+        for point, rules in batch:
+            for player1, player2 in self.matchups:
+                key = self.cache_key(rules, player1, player2)
+                cached = self.cache.load(key) if self.use_cache else None
+                entry = [point, player1, player2, cached]
+                entries.append(entry)
+                if cached is not None:
+                    self.cache_hits += 1
+                else:
+                    self.cache_misses += 1
+                    pending.append((entry, key, rules))
+
+        if pending:
+            runner = TournamentRunner(
+                workers=self.workers, engine=self.engine, rules=self.base_rules
+            )
+            # 种子由缓存键决定，结果与网格顺序和批次划分无关
+            stats_list = runner.run(
+                [(entry[1], entry[2]) for entry, _, _ in pending],
+                self.battles,
+                matchup_seeds=[ResultCache.seed_for(key) for _, key, _ in pending],
+                matchup_rules=[rules for _, _, rules in pending],
+            )
+            for (entry, key, _), stats in zip(pending, stats_list):
+                entry[3] = stats
+                if self.use_cache:
+                    self.cache.store(key, stats)
+
+        return [
+            self._row(point, player1, player2, stats)
+            for point, player1, player2, stats in entries
+        ]
+
+    def iter_rows(self) -> Iterator[Dict[str, Any]]:
+        """
+        逐批计算并产出结果行（网格键、player1、player2、battles 以及统计列）
+
+        无效的网格点（例如浮动下限大于上限）跳过并记录在 invalid_points 中
+        """
+        batch: List[Tuple[Dict[str, Any], BattleRules]] = []
+        for point in self.iter_points():
+            try:
+                rules = self.base_rules.replace(**point)
+            except (TypeError, ValueError) as e:
+                print(f"⚠️ 跳过无效的网格点 {point}: {e}")
+                self.invalid_points.append(point)
+                continue
+            batch.append((point, rules))
+            if len(batch) >= self.points_per_batch:
+                yield from self._run_batch(batch)
+                batch = []
+        if batch:
+            yield from self._run_batch(batch)
+
+    def run(self) -> List[Dict[str, Any]]:
+        """计算全部网格点，返回结果表"""
+        return list(self.iter_rows())
+
+    def columns(self) -> List[str]:
+        """结果表的列名"""
+        return list(self.grid) + ["player1", "player2", "battles"] + list(RESULT_COLUMNS)
+
+    def write_csv(self, rows: Sequence[Dict[str, Any]], path: str) -> None:
+        """
+        将结果表写为CSV
+
+        Args:
+            rows: run 返回的结果行
+            path: 输出路径
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=self.columns())
+            writer.writeheader()
+            writer.writerows(rows)
+
+    def format_table(self, rows: Sequence[Dict[str, Any]]) -> str:
+        """将结果表格式化为文本"""
+        columns = self.columns()
+        lines = [" | ".join(columns)]
+        for row in rows:
+            cells = []
+            for column in columns:
+                value = row[column]
+                if column.endswith("_rate"):
+                    cells.append(f"{value:.2%}")
+                elif isinstance(value, float):
+                    cells.append(f"{value:g}")
+                else:
+                    cells.append(str(value))
+            lines.append(" | ".join(cells))
+        return "\n".join(lines)
@@ -3,15 +3,82 @@
 定义玩家角色的基本属性和战斗能力
 """
 
-import random
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
+
+from .battle_rules import BattleRules
+from .config_manager import game_config
+from .inventory import Inventory, ItemRef
+from .rng import as_random_source
+
+# 未指定速度时的默认速度（与时间线调度器的基准回合长度对应）
+DEFAULT_SPEED = 10
+
+# 血条字符串缓存: 血条长度 -> 按填充格数索引的血条列表
+_HEALTH_BAR_CACHE: Dict[int, List[str]] = {}
+
+
+def get_health_bar(filled_length: int, bar_length: int = 20) -> str:
+    """
+    获取预先生成的血条字符串
+
+    Args:
+        filled_length: 已填充的格数
+        bar_length: 血条总长度
+
+    Returns:
+        str: 血条字符串
+    """
+    bars = _HEALTH_BAR_CACHE.get(bar_length)
+    if bars is None:
+        bars = [
+            "█" * filled + "░" * (bar_length - filled)
+            for filled in range(bar_length + 1)
+        ]
+        _HEALTH_BAR_CACHE[bar_length] = bars
+    return bars[filled_length]
+
+
+# 伤害表采样缓存: (战斗规则, 攻击力, {目标防御力: (桶数, 别名桶)})，规则或攻击力变化时整体失效
+DamageSamplerCache = Tuple[Optional[BattleRules], int, Dict[int, Tuple[int, List[Any]]]]
+
+_EMPTY_DAMAGE_SAMPLERS: DamageSamplerCache = (None, 0, {})
+
+
+def _damage_sampler(attacker: Any, defense: int) -> Tuple[int, List[Any]]:
+    """
+    获取攻击方对指定防御力的伤害表别名桶（未命中或缓存失效时调用）
+
+    Args:
+        attacker: 攻击方（Player 或 FastPlayer）
+        defense: 目标防御力
+
+    Returns:
+        (桶数, 别名桶)，桶内结果为 (基础伤害, 实际伤害, 是否暴击)
+    """
+    rules, attack, samplers = attacker._damage_samplers
+    if rules is not attacker.rules or attack != attacker.attack:
+        samplers = {}
+        attacker._damage_samplers = (attacker.rules, attacker.attack, samplers)
+    sampler = attacker.rules.damage_table(attacker.attack, defense).sampler
+    samplers[defense] = (sampler.size, sampler.buckets)
+    return samplers[defense]
 
 
 class Player:
     """玩家角色类"""
 
     def __init__(
-        self, name: str, character_class: str, health: int, attack: int, defense: int
+        self,
+        name: str,
+        character_class: str,
+        health: int,
+        attack: int,
+        defense: int,
+        rng: Any = None,
+        rules: Optional[BattleRules] = None,
+        speed: int = DEFAULT_SPEED,
+        damage_tables: bool = False,
+        inventory: Optional[Inventory] = None,
     ):
         """
         初始化角色
@@ -21,6 +88,11 @@ class Player:
             health: 生命值
             attack: 攻击力
             defense: 防御力
+            rng: 随机数源（random.Random、numpy Generator 等），默认使用全局 random
+            rules: 战斗规则，默认使用全局配置中的规则
+            speed: 速度（先攻），决定时间线战斗中的行动频率
+            damage_tables: 是否使用预先计算的伤害概率表采样（每次攻击一次随机数，分布相同）
+            inventory: 沿用的背包（已装备物品的加成立即计入属性），默认在首次访问时创建空背包
         """
         self.name = name
         self.character_class = character_class
@@ -28,9 +100,65 @@ class Player:
         self.current_health = health
         self.attack = attack
         self.defense = defense
+        self.speed = speed
+        self.damage_tables = damage_tables
+        self._damage_samplers = _EMPTY_DAMAGE_SAMPLERS
         self.is_alive = True
         self.pre_name = ""  # 称号前缀
         self.last_name = self.name.split("·")[-1]  # 名称后缀
+        self.rng = as_random_source(rng)
+        self.rules = rules or game_config.get_battle_rules()
+        self._inventory: Optional[Inventory] = None
+        if inventory is not None:
+            self.inventory = inventory
+
+    @property
+    def inventory(self) -> Inventory:
+        """角色背包（敌人和批量模拟中的角色通常用不到，首次访问时才创建）"""
+        if self._inventory is None:
+            self.inventory = Inventory()
+        return self._inventory
+
+    @inventory.setter
+    def inventory(self, inventory: Inventory) -> None:
+        if self._inventory is not None:
+            # 换背包时移除旧背包的装备加成
+            self._inventory.on_equipment_change = None
+            self._apply_equipment_change(
+                {stat: -value for stat, value in self._inventory.equipped_bonus().items()}
+            )
+        self._inventory = inventory
+        inventory.on_equipment_change = self._apply_equipment_change
+        self._apply_equipment_change(inventory.equipped_bonus())
+
+    def _apply_equipment_change(self, delta: Dict[str, int]) -> None:
+        """将装备加成的变化计入当前属性"""
+        self.attack += delta["attack"]
+        self.defense += delta["defense"]
+        self.max_health += delta["health"]
+        if self.is_alive:
+            self.current_health = max(1, min(self.max_health, self.current_health + delta["health"]))
+
+    def equip(self, item: ItemRef) -> bool:
+        """
+        装备背包中的物品，属性加成立即生效
+
+        Args:
+            item: 物品名称或ID
+
+        Returns:
+            bool: 是否新装备
+        """
+        return self.inventory.equip(item)
+
+    def unequip(self, item: ItemRef) -> bool:
+        """卸下物品并移除其属性加成"""
+        return self.inventory.unequip(item)
+
+    def reset(self) -> None:
+        """恢复满血存活状态"""
+        self.current_health = self.max_health
+        self.is_alive = True
 
     def take_damage(self, damage: int) -> int:
         """
@@ -53,26 +181,55 @@ class Player:
 
         return actual_damage
 
-    def attack_target(self, target: "Player") -> Dict[str, Any]:
+    def strike(self, target: "Player") -> Tuple[int, int, bool]:
         """
-        攻击目标
+        攻击目标（不生成结果字典，供战斗热路径使用）
 
         Args:
             target: 被攻击的目标
 
         Returns:
-            攻击结果信息
+            (基础伤害, 实际伤害, 是否暴击)
         """
-        # 基础伤害带有随机性（80%-120%）
-        damage_multiplier = random.uniform(0.8, 1.2)
+        rules = self.rules
+        if self.damage_tables:
+            # 内联别名采样：按目标防御力缓存别名桶，每次攻击一次字典查找与一次随机数
+            cached_rules, cached_attack, samplers = self._damage_samplers
+            sampler = samplers.get(target.defense)
+            if sampler is None or cached_rules is not rules or cached_attack != self.attack:
+                sampler = _damage_sampler(self, target.defense)
+            size, buckets = sampler
+            scaled = self.rng.random() * size
+            index = int(scaled)
+            threshold, value, alias_value = buckets[index]
+            base_damage, _, is_critical = value if scaled - index < threshold else alias_value
+            return base_damage, target.take_damage(base_damage), is_critical
+
+        # 基础伤害带有随机性（默认80%-120%）
+        damage_multiplier = self.rng.uniform(
+            rules.damage_variance_min, rules.damage_variance_max
+        )
         base_damage = int(self.attack * damage_multiplier)
 
-        # 暴击判定（10%概率）
-        is_critical = random.random() < 0.1
+        # 暴击判定（默认10%概率）
+        is_critical = self.rng.random() < rules.critical_hit_chance
         if is_critical:
-            base_damage = int(base_damage * 1.5)
+            base_damage = int(base_damage * rules.critical_hit_multiplier)
 
         actual_damage = target.take_damage(base_damage)
+        return base_damage, actual_damage, is_critical
+
+    def attack_target(self, target: "Player") -> Dict[str, Any]:
+        """
+        攻击目标
+
+        Args:
+            target: 被攻击的目标
+
+        Returns:
+            攻击结果信息
+        """
+        base_damage, actual_damage, is_critical = self.strike(target)
 
         return {
             "attacker": f"{self.pre_name} {self.last_name}",
@@ -116,6 +273,7 @@ class Player:
             "health_percentage": self.get_health_percentage(),
             "attack": self.attack,
             "defense": self.defense,
+            "speed": self.speed,
             "is_alive": self.is_alive,
         }
 
@@ -125,7 +283,7 @@ class Player:
         health_percentage = self.get_health_percentage()
         filled_length = int(health_bar_length * health_percentage / 100)
 
-        health_bar = "█" * filled_length + "░" * (health_bar_length - filled_length)
+        health_bar = get_health_bar(filled_length, health_bar_length)
         status = "存活" if self.is_alive else "阵亡"
 
         return (
@@ -137,3 +295,202 @@ class Player:
     def get_full_name(self) -> str:
         """获取带前缀的全名"""
         return f"{self.pre_name} {self.name} [{self.character_class}]"
+
+
+
+class FastPlayer:
+    """
+    使用 __slots__ 的轻量角色类，接口与 Player 兼容，可直接用于 Battle
+
+    显示名称在修改前缀时缓存，攻击热路径 strike 只返回元组且内联伤害结算
+    """
+
+    __slots__ = (
+        "name",
+        "character_class",
+        "max_health",
+        "current_health",
+        "attack",
+        "defense",
+        "speed",
+        "damage_tables",
+        "_damage_samplers",
+        "is_alive",
+        "last_name",
+        "rng",
+        "rules",
+        "_pre_name",
+        "display_name",
+        "full_name",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        character_class: str,
+        health: int,
+        attack: int,
+        defense: int,
+        rng: Any = None,
+        rules: Optional[BattleRules] = None,
+        speed: int = DEFAULT_SPEED,
+        damage_tables: bool = False,
+    ):
+        """
+        初始化角色
+
+        Args:
+            name: 角色名称
+            character_class: 职业
+            health: 生命值
+            attack: 攻击力
+            defense: 防御力
+            rng: 随机数源（random.Random、numpy Generator 等），默认使用全局 random
+            rules: 战斗规则，默认使用全局配置中的规则
+            speed: 速度（先攻），决定时间线战斗中的行动频率
+            damage_tables: 是否使用预先计算的伤害概率表采样（每次攻击一次随机数，分布相同）
+        """
+        self.name = name
+        self.character_class = character_class
+        self.max_health = health
+        self.current_health = health
+        self.attack = attack
+        self.defense = defense
+        self.speed = speed
+        self.damage_tables = damage_tables
+        self._damage_samplers = _EMPTY_DAMAGE_SAMPLERS
+        self.is_alive = True
+        self.last_name = name.split("·")[-1]
+        self.rng = as_random_source(rng)
+        self.rules = rules or game_config.get_battle_rules()
+        self.pre_name = ""
+
+    @property
+    def pre_name(self) -> str:
+        """称号前缀，修改时同步刷新缓存的显示名称"""
+        return self._pre_name
+
+    @pre_name.setter
+    def pre_name(self, value: str) -> None:
+        self._pre_name = value
+        self.display_name = f"{value} {self.last_name}"
+        self.full_name = f"{value} {self.name} [{self.character_class}]"
+
+    def reset(self) -> None:
+        """恢复满血存活状态"""
+        self.current_health = self.max_health
+        self.is_alive = True
+
+    def take_damage(self, damage: int) -> int:
+        """承受伤害，返回实际伤害（与 Player.take_damage 相同）"""
+        actual_damage = damage - self.defense
+        if actual_damage < 1:
+            actual_damage = 1
+        self.current_health -= actual_damage
+        if self.current_health <= 0:
+            self.current_health = 0
+            self.is_alive = False
+        return actual_damage
+
+    def strike(self, target: Any) -> Tuple[int, int, bool]:
+        """
+        攻击目标
+
+        Returns:
+            (基础伤害, 实际伤害, 是否暴击)
+        """
+        random_value = self.rng.random
+        rules = self.rules
+        if self.damage_tables:
+            cached_rules, cached_attack, samplers = self._damage_samplers
+            sampler = samplers.get(target.defense)
+            if sampler is None or cached_rules is not rules or cached_attack != self.attack:
+                sampler = _damage_sampler(self, target.defense)
+            size, buckets = sampler
+            scaled = random_value() * size
+            index = int(scaled)
+            threshold, value, alias_value = buckets[index]
+            base_damage, actual_damage, is_critical = (
+                value if scaled - index < threshold else alias_value
+            )
+        else:
+            base_damage = int(
+                self.attack
+                * (rules.damage_variance_min + rules.damage_variance_span * random_value())
+            )
+            is_critical = random_value() < rules.critical_hit_chance
+            if is_critical:
+                base_damage = int(base_damage * rules.critical_hit_multiplier)
+
+            actual_damage = base_damage - target.defense
+            if actual_damage < 1:
+                actual_damage = 1
+        health = target.current_health - actual_damage
+        if health <= 0:
+            health = 0
+            target.is_alive = False
+        target.current_health = health
+        return base_damage, actual_damage, is_critical
+
+    def attack_target(self, target: Any) -> Dict[str, Any]:
+        """攻击目标并返回与 Player.attack_target 相同格式的结果字典"""
+        base_damage, actual_damage, is_critical = self.strike(target)
+        return {
+            "attacker": self.display_name,
+            "target": f"{target.pre_name} {target.last_name}",
+            "base_damage": base_damage,
+            "actual_damage": actual_damage,
+            "is_critical": is_critical,
+            "target_health": target.current_health,
+            "target_alive": target.is_alive,
+        }
+
+    def heal(self, amount: int) -> int:
+        """治疗，返回实际治疗量"""
+        if not self.is_alive:
+            return 0
+        old_health = self.current_health
+        self.current_health = min(self.max_health, self.current_health + amount)
+        return self.current_health - old_health
+
+    def get_health_percentage(self) -> float:
+        """获取血量百分比"""
+        return (self.current_health / self.max_health) * 100
+
+    def get_status(self) -> Dict[str, Any]:
+        """获取角色状态信息"""
+        return {
+            "name": self.name,
+            "class": self.character_class,
+            "health": f"{self.current_health}/{self.max_health}",
+            "health_percentage": self.get_health_percentage(),
+            "attack": self.attack,
+            "defense": self.defense,
+            "speed": self.speed,
+            "is_alive": self.is_alive,
+        }
+
+    def get_full_name(self) -> str:
+        """获取带前缀的全名"""
+        return self.full_name
+
+    def format_status(self, health_bar_length: int = 20) -> str:
+        """
+        生成状态文本
+
+        Args:
+            health_bar_length: 血条长度
+        """
+        health_percentage = self.get_health_percentage()
+        filled_length = int(health_bar_length * health_percentage / 100)
+        status = "存活" if self.is_alive else "阵亡"
+        return (
+            f"{self.full_name} [{status}]\n"
+            f"生命值: {get_health_bar(filled_length, health_bar_length)} "
+            f"{self.current_health}/{self.max_health} ({health_percentage:.1f}%)\n"
+            f"攻击力: {self.attack} | 防御力: {self.defense}"
+        )
+
+    def __str__(self) -> str:
+        """字符串表示"""
+        return self.format_status()
@@ -0,0 +1,446 @@
+"""
+等级分模块
+以流的方式消费战斗结果，增量更新 Elo / Glicko 等级分
+
+等级分、评分偏差和场数保存在按下标索引的 NumPy 数组中（容量倍增），
+对局先写入缓冲区，每凑满 batch_size 场作为一个评分周期整体更新：
+期望胜率用周期开始时的等级分计算，各人的调整量用 np.bincount 一次累加，
+因此每秒可处理数十万到数百万场结果；可随时用 np.savez 保存检查点并恢复。
+
+周期内的期望胜率不随对局更新，一个人在同一周期的场数越多，按固定期望累加的调整越会过冲，
+因此每人每周期至多按 max_period_games 场计权：场数超出时其对局按比例缩小权重
+（一场对局取双方比例中较小者，Elo 总分仍守恒），周期很大时等级分也逐周期收敛而不会振荡发散
+"""
+
+import math
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # numpy 为可选依赖，仅等级分引擎需要
+    np = None
+
+from .battle import BattleOutcomeStats
+
+# Glicko 常数 q = ln(10) / 400
+GLICKO_Q = math.log(10) / 400
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError("等级分引擎需要安装 numpy (pipenv install numpy)")
+
+
+def _checkpoint_path(path: str) -> str:
+    """np.savez 会给没有 .npz 后缀的路径追加后缀，保存和加载统一使用带后缀的路径"""
+    return path if path.endswith(".npz") else path + ".npz"
+
+
+class RatingEngine:
+    """等级分引擎基类：管理参赛者下标、数组存储、对局缓冲与检查点"""
+
+    kind = ""
+
+    def __init__(
+        self,
+        initial_rating: float = 1500.0,
+        batch_size: int = 1 << 16,
+        capacity: int = 1024,
+        max_period_games: float = 8.0,
+    ):
+        """
+        初始化引擎
+
+        Args:
+            initial_rating: 新参赛者的初始等级分
+            batch_size: 每个评分周期的对局数（缓冲区满时自动更新）
+            capacity: 初始数组容量
+            max_period_games: 每人每个评分周期至多计权的场数，math.inf 表示不限
+        """
+        _require_numpy()
+        if batch_size <= 0:
+            raise ValueError("batch_size 必须为正数")
+        if max_period_games <= 0:
+            raise ValueError("max_period_games 必须为正数")
+        self.initial_rating = float(initial_rating)
+        self.batch_size = batch_size
+        self.max_period_games = float(max_period_games)
+        self.keys: List[str] = []
+        self.index_of: Dict[str, int] = {}
+        self.ratings = np.full(capacity, self.initial_rating)
+        self.games = np.zeros(capacity, dtype=np.int64)
+        self.periods = 0
+        # 缓冲区: 每项为 (参赛者1, 参赛者2, 参赛者1的得分之和, 场数)
+        self._first: List[int] = []
+        self._second: List[int] = []
+        self._score: List[float] = []
+        self._count: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def _grow(self, size: int) -> None:
+        """扩容到至少 size 个参赛者，子类扩展自己的数组"""
+        capacity = len(self.ratings)
+        new_capacity = max(size, capacity * 2)
+        ratings = np.full(new_capacity, self.initial_rating)
+        ratings[:capacity] = self.ratings
+        games = np.zeros(new_capacity, dtype=np.int64)
+        games[:capacity] = self.games
+        self.ratings, self.games = ratings, games
+
+    def player_index(self, key: str) -> int:
+        """
+        获取参赛者下标，不存在时注册
+
+        Args:
+            key: 参赛者标识（职业名或角色名）
+        """
+        index = self.index_of.get(key)
+        if index is None:
+            index = len(self.keys)
+            if index >= len(self.ratings):
+                self._grow(index + 1)
+            self.keys.append(key)
+            self.index_of[key] = index
+        return index
+
+    def add_match(self, first: str, second: str, score: float, games: int = 1) -> None:
+        """
+        加入一场（或一组）对局结果
+
+        Args:
+            first: 参赛者1
+            second: 参赛者2
+            score: 参赛者1的得分之和（胜1、平0.5、负0）
+            games: 这组结果包含的场数
+        """
+        self._first.append(self.player_index(first))
+        self._second.append(self.player_index(second))
+        self._score.append(score)
+        self._count.append(games)
+        if len(self._first) >= self.batch_size:
+            self.flush()
+
+    def add_battle_result(self, first: str, second: str, battle_result: Dict[str, Any]) -> None:
+        """
+        加入 Battle 的战斗结果
+
+        Args:
+            first: 玩家1名称
+            second: 玩家2名称
+            battle_result: Battle.fight_until_end 返回的结果，超时记为平局
+        """
+        winner = battle_result.get("winner")
+        if winner is None:
+            score = 0.5
+        elif winner == first:
+            score = 1.0
+        elif winner == second:
+            score = 0.0
+        else:
+            raise ValueError(f"胜者 {winner} 不是 {first} 或 {second}")
+        self.add_match(first, second, score)
+
+    def add_outcome_stats(self, first: str, second: str, stats: BattleOutcomeStats) -> None:
+        """
+        加入批量模拟的汇总结果（一次计入全部场次）
+
+        全部场次都以周期开始时的等级分计算期望，计权时与其他对局一样受 max_period_games 限制，
+        因此一组汇总结果在一个周期内只把等级分朝其胜率推进一步，需要多个周期才能收敛
+
+        Args:
+            first: 玩家1
+            second: 玩家2
+            stats: BattleSimulator / VectorizedBattleSimulator 的统计结果
+        """
+        if stats.battles:
+            self.add_match(
+                first, second, stats.player1_wins + 0.5 * stats.timeouts, stats.battles
+            )
+
+    def consume(self, results: Iterable[Tuple[str, str, float]]) -> int:
+        """
+        消费 (参赛者1, 参赛者2, 得分) 结果流
+
+        Returns:
+            int: 消费的结果数
+        """
+        consumed = 0
+        add_match = self.add_match
+        for first, second, score in results:
+            add_match(first, second, score)
+            consumed += 1
+        return consumed
+
+    def add_matches(
+        self,
+        first: Sequence[int],
+        second: Sequence[int],
+        scores: Sequence[float],
+        games: Optional[Sequence[int]] = None,
+    ) -> None:
+        """
+        按下标批量加入对局（下标需已通过 player_index 注册），每 batch_size 场一个评分周期
+
+        Args:
+            first: 参赛者1下标数组
+            second: 参赛者2下标数组
+            scores: 参赛者1得分数组
+            games: 每项的场数，默认均为1
+        """
+        self.flush()
+        first = np.asarray(first, dtype=np.int64)
+        second = np.asarray(second, dtype=np.int64)
+        scores = np.asarray(scores, dtype=np.float64)
+        games = np.ones(first.size, dtype=np.int64) if games is None else np.asarray(games)
+        if first.size and max(first.max(), second.max()) >= len(self.keys):
+            raise IndexError("对局中包含未注册的参赛者下标")
+        for start in range(0, first.size, self.batch_size):
+            end = start + self.batch_size
+            self._apply_period(
+                first[start:end], second[start:end], scores[start:end], games[start:end]
+            )
+
+    def flush(self) -> None:
+        """用缓冲区中的对局完成一个评分周期"""
+        if not self._first:
+            return
+        first = np.array(self._first, dtype=np.int64)
+        second = np.array(self._second, dtype=np.int64)
+        scores = np.array(self._score, dtype=np.float64)
+        games = np.array(self._count, dtype=np.int64)
+        self._first, self._second, self._score, self._count = [], [], [], []
+        self._apply_period(first, second, scores, games)
+
+    def _apply_period(self, first, second, scores, games) -> None:
+        size = len(self.keys)
+        period_games = np.bincount(first, games, minlength=size) + np.bincount(
+            second, games, minlength=size
+        )
+        self.games[:size] += period_games.astype(np.int64)
+        # 得分与场数按权重缩放，子类的更新公式对二者都是线性的
+        player_weights = np.minimum(1.0, self.max_period_games / np.maximum(period_games, 1.0))
+        weights = np.minimum(player_weights[first], player_weights[second])
+        self._update(first, second, scores * weights, games * weights)
+        self.periods += 1
+
+    def _update(self, first, second, scores, games) -> None:
+        """按一个评分周期的对局（已计权的得分与场数）更新等级分"""
+        raise NotImplementedError
+
+    def rating(self, key: str) -> float:
+        """获取参赛者的等级分（包含缓冲区中尚未更新的对局）"""
+        self.flush()
+        return float(self.ratings[self.index_of[key]])
+
+    def standings(self, top: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        按等级分从高到低排名
+
+        Args:
+            top: 只返回前若干名，None表示全部
+        """
+        self.flush()
+        size = len(self.keys)
+        order = np.argsort(-self.ratings[:size], kind="stable")
+        if top is not None:
+            order = order[:top]
+        return [
+            {
+                "rank": rank,
+                "key": self.keys[index],
+                "rating": float(self.ratings[index]),
+                "games": int(self.games[index]),
+                **self._extra_columns(index),
+            }
+            for rank, index in enumerate(order, 1)
+        ]
+
+    def _extra_columns(self, index: int) -> Dict[str, Any]:
+        return {}
+
+    def _parameters(self) -> Dict[str, float]:
+        return {"initial_rating": self.initial_rating, "max_period_games": self.max_period_games}
+
+    def _arrays(self) -> Dict[str, Any]:
+        size = len(self.keys)
+        return {"ratings": self.ratings[:size], "games": self.games[:size]}
+
+    def save(self, path: str) -> None:
+        """
+        保存检查点（先刷新缓冲区）
+
+        Args:
+            path: .npz 文件路径，没有后缀时自动追加 .npz
+        """
+        self.flush()
+        parameters = self._parameters()
+        np.savez(
+            _checkpoint_path(path),
+            kind=np.array(self.kind),
+            keys=np.array(self.keys, dtype=str),
+            parameter_names=np.array(list(parameters), dtype=str),
+            parameter_values=np.array(list(parameters.values()), dtype=np.float64),
+            periods=np.array(self.periods),
+            **self._arrays(),
+        )
+
+    @classmethod
+    def load(cls, path: str, batch_size: int = 1 << 16) -> "RatingEngine":
+        """
+        从检查点恢复
+
+        Args:
+            path: save 写入的 .npz 文件，没有后缀时自动追加 .npz（与 save 一致）
+            batch_size: 恢复后的评分周期大小
+        """
+        _require_numpy()
+        with np.load(_checkpoint_path(path)) as data:
+            kind = str(data["kind"])
+            if kind != cls.kind:
+                raise ValueError(f"检查点类型为 {kind}，无法用 {cls.__name__} 加载")
+            parameters = dict(
+                zip(data["parameter_names"].tolist(), data["parameter_values"].tolist())
+            )
+            engine = cls(batch_size=batch_size, capacity=max(len(data["keys"]), 1), **parameters)
+            for key in data["keys"].tolist():
+                engine.player_index(key)
+            engine._restore(data)
+            engine.periods = int(data["periods"])
+        return engine
+
+    def _restore(self, data: Any) -> None:
+        size = len(self.keys)
+        self.ratings[:size] = data["ratings"]
+        self.games[:size] = data["games"]
+
+
+class EloRatings(RatingEngine):
+    """
+    Elo 等级分：每个评分周期内 ΔR = K * Σ w * (实际得分 - 期望得分)
+
+    w = min(1, max_period_games / 本周期场数)，每周期的调整不超过 K * max_period_games，
+    默认参数下对任意大小的周期都不会过冲；batch_size 较小时与逐场更新的 Elo 一致
+    """
+
+    kind = "elo"
+
+    def __init__(self, k_factor: float = 32.0, initial_rating: float = 1500.0, **kwargs):
+        """
+        初始化 Elo 引擎
+
+        Args:
+            k_factor: K 系数
+            initial_rating: 初始等级分
+            **kwargs: batch_size / capacity / max_period_games
+        """
+        super().__init__(initial_rating=initial_rating, **kwargs)
+        self.k_factor = float(k_factor)
+
+    def _update(self, first, second, scores, games) -> None:
+        ratings = self.ratings
+        expected = 1.0 / (1.0 + 10.0 ** ((ratings[second] - ratings[first]) / 400.0))
+        delta = self.k_factor * (scores - games * expected)
+        size = len(self.keys)
+        ratings[:size] += np.bincount(first, delta, minlength=size)
+        ratings[:size] -= np.bincount(second, delta, minlength=size)
+
+    def _parameters(self) -> Dict[str, float]:
+        return {"k_factor": self.k_factor, **super()._parameters()}
+
+
+class GlickoRatings(RatingEngine):
+    """
+    Glicko（第一版）等级分：同时维护评分偏差 RD
+
+    每个评分周期开始时所有人的 RD 按 sqrt(RD² + c²) 增大（不超过初始 RD），
+    周期内对局越多 RD 越小，等级分调整幅度随之减小；
+    与 Elo 相同，每人每周期至多按 max_period_games 场计入，避免双方同时按对方固定的等级分
+    走满一步而使差距过冲、逐周期反号
+    """
+
+    kind = "glicko"
+
+    def __init__(
+        self,
+        initial_rating: float = 1500.0,
+        initial_rd: float = 350.0,
+        rd_growth: float = 30.0,
+        min_rd: float = 30.0,
+        **kwargs,
+    ):
+        """
+        初始化 Glicko 引擎
+
+        Args:
+            initial_rating: 初始等级分
+            initial_rd: 初始（最大）评分偏差
+            rd_growth: 每个评分周期 RD 的增长常数 c
+            min_rd: RD 下限，避免长期对局后等级分停止变化
+            **kwargs: batch_size / capacity / max_period_games
+        """
+        self.initial_rd = float(initial_rd)
+        self.rd_growth = float(rd_growth)
+        self.min_rd = float(min_rd)
+        super().__init__(initial_rating=initial_rating, **kwargs)
+        self.rd = np.full(len(self.ratings), self.initial_rd)
+
+    def _grow(self, size: int) -> None:
+        capacity = len(self.ratings)
+        super()._grow(size)
+        rd = np.full(len(self.ratings), self.initial_rd)
+        rd[:capacity] = self.rd
+        self.rd = rd
+
+    @staticmethod
+    def _g(rd):
+        return 1.0 / np.sqrt(1.0 + 3.0 * (GLICKO_Q * rd) ** 2 / math.pi**2)
+
+    def _update(self, first, second, scores, games) -> None:
+        size = len(self.keys)
+        ratings = self.ratings[:size]
+        rd = np.minimum(np.sqrt(self.rd[:size] ** 2 + self.rd_growth**2), self.initial_rd)
+
+        # 双方各自以对手的 RD 计算 g 与期望得分
+        g_second = self._g(rd[second])
+        g_first = self._g(rd[first])
+        diff = ratings[first] - ratings[second]
+        expected_first = 1.0 / (1.0 + 10.0 ** (-g_second * diff / 400.0))
+        expected_second = 1.0 / (1.0 + 10.0 ** (g_first * diff / 400.0))
+
+        variance_inv = np.bincount(
+            first, games * g_second**2 * expected_first * (1 - expected_first), minlength=size
+        ) + np.bincount(
+            second, games * g_first**2 * expected_second * (1 - expected_second), minlength=size
+        )
+        variance_inv *= GLICKO_Q**2
+        improvement = np.bincount(
+            first, g_second * (scores - games * expected_first), minlength=size
+        ) + np.bincount(
+            second, g_first * ((games - scores) - games * expected_second), minlength=size
+        )
+
+        precision = 1.0 / rd**2 + variance_inv
+        self.ratings[:size] = ratings + GLICKO_Q / precision * improvement
+        self.rd[:size] = np.maximum(np.sqrt(1.0 / precision), self.min_rd)
+
+    def _extra_columns(self, index: int) -> Dict[str, Any]:
+        return {"rd": float(self.rd[index])}
+
+    def _parameters(self) -> Dict[str, float]:
+        return {
+            **super()._parameters(),
+            "initial_rd": self.initial_rd,
+            "rd_growth": self.rd_growth,
+            "min_rd": self.min_rd,
+        }
+
+    def _arrays(self) -> Dict[str, Any]:
+        arrays = super()._arrays()
+        arrays["rd"] = self.rd[: len(self.keys)]
+        return arrays
+
+    def _restore(self, data: Any) -> None:
+        super()._restore(data)
+        self.rd[: len(self.keys)] = data["rd"]
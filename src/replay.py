@@ -0,0 +1,306 @@
+"""
+战斗回放模块
+回放文件只记录随机种子、双方属性、战斗规则和玩家输入，
+回放时以相同种子重新生成整场战斗，并通过逐回合的状态哈希检测结果是否与录制时一致
+"""
+
+import hashlib
+import json
+import random
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .battle import Battle
+from .battle_log import RoundView
+from .battle_rules import BattleRules
+from .clock import real_clock
+from .dungeon_master import DungeonMaster
+from .player import FastPlayer
+
+# 回放文件格式版本
+REPLAY_FORMAT_VERSION = 1
+
+# 第0回合之前的初始状态哈希
+INITIAL_STATE_HASH = "0" * 16
+
+
+class ReplayDivergenceError(ValueError):
+    """回放重新生成的战斗与录制时不一致"""
+
+    def __init__(self, round_number: int, expected: Optional[str], actual: Optional[str]):
+        self.round_number = round_number
+        self.expected = expected
+        self.actual = actual
+        super().__init__(
+            f"回放在第{round_number}回合出现分歧: 期望状态 {expected}，实际状态 {actual}"
+        )
+
+
+def state_hash(previous_hash: str, round_view: RoundView) -> str:
+    """
+    计算回合结束后的链式状态哈希
+
+    Args:
+        previous_hash: 上一回合的状态哈希
+        round_view: 本回合视图（事件行包含伤害与双方剩余血量）
+
+    Returns:
+        str: 16位十六进制哈希
+    """
+    material = f"{previous_hash}|{round_view['round']}|{round_view.event_rows()}"
+    return hashlib.sha256(material.encode("ascii")).hexdigest()[:16]
+
+
+def combatant_stats(player: Any) -> Dict[str, Any]:
+    """提取角色的属性块"""
+    return {
+        "name": player.name,
+        "class": player.character_class,
+        "health": player.max_health,
+        "attack": player.attack,
+        "defense": player.defense,
+        "pre_name": player.pre_name,
+    }
+
+
+class BattleReplay:
+    """战斗回放记录"""
+
+    def __init__(
+        self,
+        seed: int,
+        player1: Dict[str, Any],
+        player2: Dict[str, Any],
+        rules: BattleRules,
+        max_rounds: int,
+        inputs: Optional[List[Tuple[int, str]]] = None,
+        round_hashes: Optional[List[str]] = None,
+        rules_version: Optional[str] = None,
+    ):
+        """
+        初始化回放记录
+
+        Args:
+            seed: 本场战斗随机数源的种子
+            player1: 玩家1属性块（name, class, health, attack, defense, pre_name）
+            player2: 玩家2属性块
+            rules: 录制时使用的战斗规则
+            max_rounds: 录制时的最大回合数
+            inputs: 玩家输入 (输入后执行的回合数, 输入内容) 列表
+            round_hashes: 每回合结束后的链式状态哈希
+            rules_version: 录制时的规则版本，默认取 rules.version
+        """
+        self.seed = seed
+        self.player1 = player1
+        self.player2 = player2
+        self.rules = rules
+        self.max_rounds = max_rounds
+        self.inputs = list(inputs or [])
+        self.round_hashes = list(round_hashes or [])
+        self.rules_version = rules_version or rules.version
+
+    @classmethod
+    def from_battle(
+        cls, battle: Battle, seed: int, max_rounds: Optional[int] = None
+    ) -> "BattleReplay":
+        """
+        从已经结束的战斗生成回放记录
+
+        Args:
+            battle: 使用 random.Random(seed) 作为随机数源进行的战斗，需保留完整日志
+            seed: 随机种子
+            max_rounds: 战斗使用的最大回合数，默认取战斗规则中的设置
+        """
+        log = battle.battle_log
+        if log.dropped_actions or len(log) != battle.round_number:
+            raise ValueError("生成回放需要完整的战斗日志（log_retention 必须为 None）")
+        round_hashes = []
+        current = INITIAL_STATE_HASH
+        for round_view in log:
+            current = state_hash(current, round_view)
+            round_hashes.append(current)
+        return cls(
+            seed=seed,
+            player1=combatant_stats(battle.player1),
+            player2=combatant_stats(battle.player2),
+            rules=battle.rules,
+            max_rounds=battle.rules.max_rounds if max_rounds is None else max_rounds,
+            inputs=battle.inputs,
+            round_hashes=round_hashes,
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为可序列化的字典"""
+        return {
+            "format": REPLAY_FORMAT_VERSION,
+            "seed": self.seed,
+            "player1": self.player1,
+            "player2": self.player2,
+            "rules": self.rules.to_dict(),
+            "rules_version": self.rules_version,
+            "max_rounds": self.max_rounds,
+            "inputs": [list(entry) for entry in self.inputs],
+            "round_hashes": self.round_hashes,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "BattleReplay":
+        """从 to_dict 生成的字典恢复回放记录"""
+        if data.get("format") != REPLAY_FORMAT_VERSION:
+            raise ValueError(f"不支持的回放格式版本: {data.get('format')}")
+        rules = BattleRules.from_config(data["rules"])
+        if rules.version != data["rules_version"]:
+            print(f"⚠️ 回放的规则版本 {data['rules_version']} 与重建的规则 {rules.version} 不一致")
+        return cls(
+            seed=int(data["seed"]),
+            player1=data["player1"],
+            player2=data["player2"],
+            rules=rules,
+            max_rounds=int(data["max_rounds"]),
+            inputs=[(int(r), str(text)) for r, text in data["inputs"]],
+            round_hashes=list(data["round_hashes"]),
+            rules_version=data["rules_version"],
+        )
+
+    def save(self, path: str) -> None:
+        """保存为JSON文件"""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+
+    @classmethod
+    def load(cls, path: str) -> "BattleReplay":
+        """从JSON文件读取"""
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+
+class BattleReplayer:
+    """根据回放记录重新生成战斗"""
+
+    def __init__(self, replay: BattleReplay):
+        """
+        初始化回放器
+
+        Args:
+            replay: 回放记录
+        """
+        self.replay = replay
+
+    @staticmethod
+    def _create_player(stats: Dict[str, Any]) -> FastPlayer:
+        player = FastPlayer(
+            name=stats["name"],
+            character_class=stats["class"],
+            health=stats["health"],
+            attack=stats["attack"],
+            defense=stats["defense"],
+        )
+        player.pre_name = stats.get("pre_name", "")
+        return player
+
+    def create_battle(self, dungeon_master: Optional[DungeonMaster] = None) -> Battle:
+        """以录制时的种子、属性和规则创建一场新的战斗"""
+        replay = self.replay
+        return Battle(
+            self._create_player(replay.player1),
+            self._create_player(replay.player2),
+            dungeon_master,
+            rng=random.Random(replay.seed),
+            rules=replay.rules,
+        )
+
+    def iter_rounds(
+        self, battle: Optional[Battle] = None
+    ) -> Iterator[Tuple[RoundView, str]]:
+        """
+        全速逐回合重新生成战斗，并校验每回合的状态哈希
+
+        Args:
+            battle: create_battle 创建的战斗，默认新建
+
+        Yields:
+            (回合视图, 状态哈希)
+
+        Raises:
+            ReplayDivergenceError: 某回合的状态哈希或战斗长度与录制时不一致
+        """
+        if battle is None:
+            battle = self.create_battle()
+        expected_hashes = self.replay.round_hashes
+        current = INITIAL_STATE_HASH
+        while not battle.battle_ended and battle.round_number < self.replay.max_rounds:
+            round_view = battle.execute_round()
+            round_number = battle.round_number
+            current = state_hash(current, round_view)
+            expected = (
+                expected_hashes[round_number - 1]
+                if round_number <= len(expected_hashes)
+                else None
+            )
+            if current != expected:
+                raise ReplayDivergenceError(round_number, expected, current)
+            yield round_view, current
+        if battle.round_number < len(expected_hashes):
+            # 录制时战斗持续了更多回合
+            raise ReplayDivergenceError(
+                battle.round_number + 1, expected_hashes[battle.round_number], None
+            )
+
+    def run(self) -> Battle:
+        """
+        全速重新生成整场战斗并校验
+
+        Returns:
+            Battle: 已结束的战斗（包含完整日志与统计）
+        """
+        battle = self.create_battle()
+        for _ in self.iter_rounds(battle):
+            pass
+        return battle
+
+    def verify(self) -> bool:
+        """校验当前代码重新生成的战斗是否与录制时一致"""
+        try:
+            self.run()
+        except ReplayDivergenceError as e:
+            print(f"⚠️ {e}")
+            return False
+        return True
+
+    def play(
+        self,
+        dungeon_master: DungeonMaster,
+        delay: Optional[float] = None,
+        clock: Any = None,
+    ) -> Dict[str, Any]:
+        """
+        通过 DungeonMaster 按节奏显示回放
+
+        录制时的玩家输入不会再次询问，回合之间固定停顿 delay 秒
+
+        Args:
+            dungeon_master: 负责输出的DM
+            delay: 回合之间的停顿秒数，默认读取 display.battle_delay_seconds
+            clock: 控制停顿的时钟，默认为真实时钟
+
+        Returns:
+            战斗结果（与 Battle.fight_until_end 相同）
+        """
+        clock = clock or real_clock
+        battle = self.create_battle(dungeon_master)
+        if delay is None:
+            delay = battle.battle_delay
+        dungeon_master.log_message(f"\n🎬 战斗回放（种子 {self.replay.seed}）")
+        dungeon_master.log_message(
+            f"{battle.player1.get_full_name()} VS {battle.player2.get_full_name()}"
+        )
+        dungeon_master.log_message("=" * 60)
+        battle._display_battle_status()
+        for round_view, _ in self.iter_rounds(battle):
+            battle._display_round_result(round_view)
+            battle._display_battle_status()
+            if not battle.battle_ended:
+                clock.sleep(delay)
+
+        battle_result = battle._generate_battle_result(self.replay.max_rounds)
+        battle._display_battle_end(battle_result)
+        return battle_result
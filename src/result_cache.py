@@ -0,0 +1,94 @@
+"""
+模拟结果缓存模块
+以角色属性、完整战斗规则和模拟参数的内容哈希为键，把 BattleOutcomeStats 缓存为磁盘上的 JSON 文件；
+对战矩阵与参数扫描共用同一套键计算、种子派生和原子写入
+"""
+
+import hashlib
+import json
+import os
+from typing import Any, Dict, Optional
+
+from .battle import BattleOutcomeStats
+from .battle_rules import BattleRules
+
+
+class ResultCache:
+    """按内容哈希存取模拟结果的磁盘缓存"""
+
+    def __init__(self, directory: str, version: int, label: str = "结果缓存"):
+        """
+        初始化缓存
+
+        Args:
+            directory: 缓存目录（首次写入时创建）
+            version: 缓存格式版本，模拟逻辑变化时递增以使旧缓存失效
+            label: 警告信息中的缓存名称，如 "对战缓存"
+        """
+        self.directory = directory
+        self.version = version
+        self.label = label
+
+    def key(
+        self,
+        player1: Dict[str, Any],
+        player2: Dict[str, Any],
+        rules: BattleRules,
+        battles: int,
+        seed: int,
+        engine: str,
+    ) -> str:
+        """
+        计算对局的缓存键
+
+        Args:
+            player1: 玩家1角色数据
+            player2: 玩家2角色数据
+            rules: 战斗规则
+            battles: 模拟场数
+            seed: 主随机种子
+            engine: 模拟引擎
+
+        Returns:
+            str: 由角色属性、战斗规则和模拟参数得到的SHA-256哈希
+        """
+        payload = {
+            "version": self.version,
+            "player1": player1,
+            "player2": player2,
+            "battle": rules.to_dict(),
+            "battles": battles,
+            "seed": seed,
+            "engine": engine,
+        }
+        material = json.dumps(payload, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def seed_for(key: str) -> int:
+        """由缓存键派生对局的随机种子，结果与对局的计算顺序无关"""
+        return int(key[:16], 16)
+
+    def path(self, key: str) -> str:
+        """缓存文件路径"""
+        return os.path.join(self.directory, f"{key}.json")
+
+    def load(self, key: str) -> Optional[BattleOutcomeStats]:
+        """读取缓存结果，文件不存在或已损坏时返回None"""
+        try:
+            with open(self.path(key), "r", encoding="utf-8") as f:
+                return BattleOutcomeStats.from_dict(json.load(f))
+        except FileNotFoundError:
+            return None
+        except (ValueError, KeyError, TypeError) as e:
+            print(f"⚠️ {self.label}已损坏，重新计算: {key} ({e})")
+            return None
+
+    def store(self, key: str, stats: BattleOutcomeStats) -> None:
+        """原子写入缓存结果"""
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.path(key)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(stats.to_dict(), f, ensure_ascii=False)
+        os.replace(temp_path, path)
@@ -0,0 +1,88 @@
+"""
+随机数流模块
+为战斗和角色生成提供可注入的独立随机数源，替代共享的全局 random 状态
+"""
+
+import random
+from typing import Any, Iterator, List, MutableSequence, Sequence, TypeVar
+
+T = TypeVar("T")
+
+
+class RandomStream:
+    """
+    独立的随机数流
+
+    对 numpy.random.Generator 按块预取随机数，热路径上每次取数只是一次缓冲读取；
+    对 random.Random 则直接使用其C实现的 random 方法
+    """
+
+    def __init__(self, source: Any = None, block_size: int = 4096):
+        """
+        初始化随机数流
+
+        Args:
+            source: 随机数来源，可以是 None（新的 random.Random）、整数种子、
+                random.Random 实例或 numpy.random.Generator
+            block_size: numpy 来源每次预取的随机数个数
+        """
+        if source is None or isinstance(source, int):
+            source = random.Random(source)
+        self.source = source
+        self.block_size = block_size
+
+        if isinstance(source, random.Random):
+            self.random = source.random
+        else:
+            # numpy.random.Generator: 按块批量生成，逐个消费
+            self.random = self._buffered().__next__
+
+    def _buffered(self) -> Iterator[float]:
+        while True:
+            yield from self.source.random(self.block_size).tolist()
+
+    def uniform(self, a: float, b: float) -> float:
+        """返回 [a, b) 区间内的均匀随机数（与 random.uniform 公式一致）"""
+        return a + (b - a) * self.random()
+
+    def choice(self, seq: Sequence[T]) -> T:
+        """从非空序列中随机选择一个元素"""
+        if not seq:
+            raise IndexError("Cannot choose from an empty sequence")
+        return seq[int(self.random() * len(seq))]
+
+    def shuffle(self, x: MutableSequence[Any]) -> None:
+        """原地随机打乱序列（Fisher-Yates）"""
+        random_value = self.random
+        for i in range(len(x) - 1, 0, -1):
+            j = int(random_value() * (i + 1))
+            x[i], x[j] = x[j], x[i]
+
+    def sample(self, population: Sequence[T], k: int) -> List[T]:
+        """不放回地随机抽取k个元素"""
+        if not 0 <= k <= len(population):
+            raise ValueError("Sample larger than population or is negative")
+        pool = list(population)
+        random_value = self.random
+        for i in range(k):
+            j = i + int(random_value() * (len(pool) - i))
+            pool[i], pool[j] = pool[j], pool[i]
+        return pool[:k]
+
+
+def as_random_source(rng: Any = None) -> Any:
+    """
+    将各种随机数来源统一为提供 random/uniform/choice/shuffle/sample 方法的对象
+
+    Args:
+        rng: None（使用全局 random 模块，保持原有行为）、整数种子、
+            random.Random、numpy.random.Generator 或 RandomStream
+
+    Returns:
+        可直接用于战斗与生成器的随机数源
+    """
+    if rng is None:
+        return random
+    if isinstance(rng, (random.Random, RandomStream)):
+        return rng
+    return RandomStream(rng)
@@ -0,0 +1,315 @@
+"""
+团队战斗模块
+支持 N vs M 的大规模战斗：存活成员保存在可交换删除的下标数组中，随机选目标为 O(1)；
+集火血量最低目标时使用按血量排序的惰性删除堆，每次行动为均摊 O(log n)，无需扫描整支队伍
+"""
+
+import heapq
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .battle_log import BattleEventLog, RoundView
+from .battle_rules import BattleRules
+from .battle_stats import BattleStats
+from .config_manager import game_config
+from .rng import as_random_source
+
+# 目标选择策略
+TARGET_RANDOM = "random"
+TARGET_LOWEST_HEALTH = "lowest_health"
+
+
+class AliveIndex:
+    """存活成员下标集合，支持 O(1) 删除与随机选择"""
+
+    __slots__ = ("members", "positions")
+
+    def __init__(self, indices: Sequence[int]):
+        """
+        初始化集合
+
+        Args:
+            indices: 初始存活成员的下标
+        """
+        self.members: List[int] = list(indices)
+        # positions[下标] 为该成员在 members 中的位置
+        self.positions: Dict[int, int] = {m: i for i, m in enumerate(self.members)}
+
+    def remove(self, index: int) -> None:
+        """移除成员（与末尾元素交换后弹出）"""
+        position = self.positions.pop(index)
+        last = self.members.pop()
+        if last != index:
+            self.members[position] = last
+            self.positions[last] = position
+
+    def random_choice(self, random_value) -> int:
+        """
+        随机选择一个成员
+
+        Args:
+            random_value: 返回 [0, 1) 随机数的函数
+        """
+        members = self.members
+        return members[int(random_value() * len(members))]
+
+    def __contains__(self, index: int) -> bool:
+        return index in self.positions
+
+    def __len__(self) -> int:
+        return len(self.members)
+
+
+class LowestHealthHeap:
+    """按当前血量排序的最小堆，血量变化时压入新条目，过期条目在取堆顶时惰性丢弃"""
+
+    __slots__ = ("heap", "combatants")
+
+    def __init__(self, combatants: Sequence[Any], indices: Sequence[int]):
+        """
+        初始化堆
+
+        Args:
+            combatants: 全部参战角色（按全局下标）
+            indices: 纳入堆中的成员下标
+        """
+        self.combatants = combatants
+        self.heap: List[Tuple[int, int]] = [
+            (combatants[i].current_health, i) for i in indices
+        ]
+        heapq.heapify(self.heap)
+
+    def update(self, index: int) -> None:
+        """成员血量变化后调用"""
+        combatant = self.combatants[index]
+        if combatant.is_alive:
+            heapq.heappush(self.heap, (combatant.current_health, index))
+
+    def peek(self) -> Optional[int]:
+        """返回血量最低的存活成员下标，没有时返回None"""
+        heap = self.heap
+        combatants = self.combatants
+        while heap:
+            health, index = heap[0]
+            combatant = combatants[index]
+            if combatant.is_alive and combatant.current_health == health:
+                return index
+            heapq.heappop(heap)
+        return None
+
+    def __len__(self) -> int:
+        return len(self.heap)
+
+
+class TeamBattle:
+    """N vs M 团队战斗，每回合所有存活角色以随机顺序各行动一次"""
+
+    def __init__(
+        self,
+        team1: Sequence[Any],
+        team2: Sequence[Any],
+        rng: Any = None,
+        rules: Optional[BattleRules] = None,
+        targeting: str = TARGET_RANDOM,
+        log_retention: Optional[int] = None,
+    ):
+        """
+        初始化团队战斗
+
+        Args:
+            team1: 队伍1的角色列表（Player 或 FastPlayer）
+            team2: 队伍2的角色列表
+            rng: 本场战斗独立的随机数源，指定时所有角色也改用该随机数源
+            rules: 战斗规则，指定时所有角色也改用该规则；默认使用全局配置中的规则
+            targeting: 目标选择策略，"random" 随机目标或 "lowest_health" 集火血量最低目标
+            log_retention: battle_log 在内存中保留的回合数，None表示全部保留
+        """
+        if not team1 or not team2:
+            raise ValueError("双方队伍都至少需要一名角色")
+        if targeting not in (TARGET_RANDOM, TARGET_LOWEST_HEALTH):
+            raise ValueError(f"未知目标选择策略: {targeting}")
+
+        # 全局下标: 队伍1为 [0, len(team1))，队伍2紧随其后
+        self.combatants: List[Any] = list(team1) + list(team2)
+        self.team_sizes = (len(team1), len(team2))
+        self.team_of = [0] * len(team1) + [1] * len(team2)
+        self.targeting = targeting
+        self.log_retention = log_retention
+        self.rng = as_random_source(rng)
+        self.rules = rules or game_config.get_battle_rules()
+        for combatant in self.combatants:
+            if rng is not None:
+                combatant.rng = self.rng
+            if rules is not None:
+                combatant.rules = rules
+        self.reset_state()
+
+    def reset_state(self) -> None:
+        """根据角色当前状态重建索引、日志和统计"""
+        first, second = self.team_sizes
+        team_indices = (range(first), range(first, first + second))
+        self.alive = tuple(
+            AliveIndex([i for i in indices if self.combatants[i].is_alive])
+            for indices in team_indices
+        )
+        self.health_heaps: Optional[Tuple[LowestHealthHeap, LowestHealthHeap]] = None
+        if self.targeting == TARGET_LOWEST_HEALTH:
+            self.health_heaps = tuple(
+                LowestHealthHeap(self.combatants, alive.members) for alive in self.alive
+            )
+        self.battle_log = BattleEventLog(self.combatants)
+        self.stats = BattleStats(len(self.combatants))
+        self.round_number = 0
+        self.winning_team: Optional[int] = None
+        self.battle_ended = False
+
+    def _choose_target(self, team: int) -> int:
+        """
+        为攻击方选择敌方目标
+
+        Args:
+            team: 被攻击的队伍编号
+
+        Returns:
+            int: 目标的全局下标
+        """
+        if self.health_heaps is not None:
+            return self.health_heaps[team].peek()
+        return self.alive[team].random_choice(self.rng.random)
+
+    def execute_round(self) -> Dict[str, Any]:
+        """
+        执行一个战斗回合
+
+        Returns:
+            回合结果信息（与 battle_log 中条目相同的只读字典视图）
+        """
+        if self.battle_ended:
+            return {"error": "Battle has already ended"}
+
+        self.round_number += 1
+        round_number = self.round_number
+        self._begin_round(round_number)
+
+        turn_order = self.alive[0].members + self.alive[1].members
+        self.rng.shuffle(turn_order)
+
+        combatants = self.combatants
+        resolve_attack = self._resolve_attack
+        for attacker_index in turn_order:
+            if not combatants[attacker_index].is_alive:
+                continue
+            resolve_attack(attacker_index, round_number)
+            if self.battle_ended:
+                break
+
+        self.stats.end_round([combatant.is_alive for combatant in combatants])
+        return RoundView(self.battle_log, len(self.battle_log) - 1)
+
+    def _begin_round(self, round_number: int) -> None:
+        """在战斗日志中开始新回合的索引条目"""
+        battle_log = self.battle_log
+        if self.log_retention is not None:
+            battle_log.trim(max(self.log_retention - 1, 0))
+        battle_log.round_index.extend(
+            (round_number, battle_log.dropped_actions + battle_log.action_count())
+        )
+
+    def _resolve_attack(self, attacker_index: int, round_number: int) -> int:
+        """
+        结算一次攻击：选择目标、记录日志与统计、维护存活索引
+
+        Args:
+            attacker_index: 攻击方的全局下标
+            round_number: 记录到日志中的回合数
+
+        Returns:
+            int: 目标的全局下标
+        """
+        combatants = self.combatants
+        target_team = 1 - self.team_of[attacker_index]
+        target_index = self._choose_target(target_team)
+        target = combatants[target_index]
+
+        target_health_before = target.current_health
+        base_damage, actual_damage, is_critical = combatants[attacker_index].strike(target)
+        self.stats.record_hit(
+            attacker_index, target_index, actual_damage, is_critical, target_health_before
+        )
+        self.battle_log.events.extend(
+            (
+                round_number,
+                attacker_index,
+                target_index,
+                base_damage,
+                actual_damage,
+                is_critical,
+                target.current_health,
+            )
+        )
+
+        if target.is_alive:
+            if self.health_heaps is not None:
+                self.health_heaps[target_team].update(target_index)
+        else:
+            self._on_defeated(target_index)
+        return target_index
+
+    def _on_defeated(self, index: int) -> None:
+        """角色阵亡后从存活索引中移除，并判定胜负"""
+        team = self.team_of[index]
+        self.alive[team].remove(index)
+        if not self.alive[team]:
+            self.winning_team = 1 - team
+            self.battle_ended = True
+
+    def fight(self, max_rounds: Optional[int] = None) -> Dict[str, Any]:
+        """
+        无界面战斗直到一方全灭或达到最大回合数
+
+        Args:
+            max_rounds: 最大回合数，默认使用战斗规则中的设置
+
+        Returns:
+            战斗结果
+        """
+        if max_rounds is None:
+            max_rounds = self.rules.max_rounds
+        while not self.battle_ended and self.round_number < max_rounds:
+            self.execute_round()
+        return self._build_result()
+
+    def _build_result(self) -> Dict[str, Any]:
+        """战斗结束后整理结果字典"""
+        if self.log_retention is not None:
+            self.battle_log.trim(self.log_retention)
+        return {
+            "outcome": "victory" if self.battle_ended else "timeout",
+            "winning_team": self.winning_team,
+            "total_rounds": self.round_number,
+            "survivors": (len(self.alive[0]), len(self.alive[1])),
+            "actions": self.battle_log.dropped_actions + self.battle_log.action_count(),
+            "battle_log": self.battle_log,
+        }
+
+    def get_team_summary(self) -> Dict[str, Any]:
+        """获取双方队伍的汇总统计"""
+        first = self.team_sizes[0]
+        teams = []
+        for team, indices in enumerate(
+            (range(first), range(first, len(self.combatants)))
+        ):
+            stats = [self.stats[i] for i in indices]
+            teams.append(
+                {
+                    "size": len(indices),
+                    "survivors": len(self.alive[team]),
+                    "damage_dealt": sum(s.damage_dealt for s in stats),
+                    "critical_hits": sum(s.critical_hits for s in stats),
+                }
+            )
+        return {
+            "total_rounds": self.round_number,
+            "winning_team": self.winning_team,
+            "battle_ended": self.battle_ended,
+            "teams": teams,
+        }
@@ -0,0 +1,250 @@
+"""
+先攻时间线模块
+按"下次行动时间"组织的事件驱动调度：速度为 speed 的角色每 ACTION_INTERVAL_BASE / speed
+个时间单位行动一次，调度器是以 (行动时间, 序号, 下标) 为键的最小堆，取下一个行动者为 O(log n)；
+延后行动、阵亡移除均为惰性删除，战斗直接跳到下一次行动的时间点，不再逐回合洗牌或空转
+"""
+
+import heapq
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .battle_log import RoundView
+from .battle_rules import BattleRules
+from .player import DEFAULT_SPEED
+from .team_battle import TARGET_RANDOM, TeamBattle
+
+# 行动间隔基准: 速度为 speed 的角色每 ACTION_INTERVAL_BASE / speed 个时间单位行动一次
+ACTION_INTERVAL_BASE = 100.0
+# 一个回合的时间长度，即默认速度角色的行动间隔；日志中的回合数按行动时间换算
+ROUND_LENGTH = ACTION_INTERVAL_BASE / DEFAULT_SPEED
+
+
+class InitiativeTimeline:
+    """先攻时间线：以下次行动时间排序的最小堆，同一时间按入队顺序先后行动"""
+
+    __slots__ = ("heap", "scheduled", "_sequence")
+
+    def __init__(self):
+        self.heap: List[Tuple[float, int, int]] = []
+        # scheduled[下标] 为该角色当前有效的行动时间，堆中与之不符的条目已过期
+        self.scheduled: Dict[int, float] = {}
+        self._sequence = 0
+
+    def schedule(self, index: int, action_time: float) -> None:
+        """
+        安排（或改期）角色的下次行动
+
+        Args:
+            index: 角色下标
+            action_time: 行动时间，已有安排时覆盖旧的时间
+        """
+        self.scheduled[index] = action_time
+        heapq.heappush(self.heap, (action_time, self._sequence, index))
+        self._sequence += 1
+
+    def delay(self, index: int, amount: float) -> float:
+        """
+        将角色已安排的行动延后
+
+        Args:
+            index: 角色下标
+            amount: 延后的时间单位
+
+        Returns:
+            float: 新的行动时间
+        """
+        action_time = self.scheduled[index] + amount
+        self.schedule(index, action_time)
+        return action_time
+
+    def remove(self, index: int) -> None:
+        """取消角色的行动安排（如阵亡），堆中的条目在出堆时丢弃"""
+        self.scheduled.pop(index, None)
+
+    def _discard_stale(self) -> None:
+        """弹出堆顶已被改期或取消的条目"""
+        heap = self.heap
+        scheduled = self.scheduled
+        while heap:
+            action_time, _, index = heap[0]
+            if scheduled.get(index) == action_time:
+                return
+            heapq.heappop(heap)
+
+    def peek_time(self) -> Optional[float]:
+        """返回下一次行动的时间，时间线为空时返回None"""
+        self._discard_stale()
+        return self.heap[0][0] if self.heap else None
+
+    def pop(self) -> Optional[Tuple[float, int]]:
+        """
+        取出下一次行动
+
+        Returns:
+            (行动时间, 角色下标)，时间线为空时返回None
+        """
+        self._discard_stale()
+        if not self.heap:
+            return None
+        action_time, _, index = heapq.heappop(self.heap)
+        del self.scheduled[index]
+        return action_time, index
+
+    def __contains__(self, index: int) -> bool:
+        return index in self.scheduled
+
+    def __len__(self) -> int:
+        return len(self.scheduled)
+
+
+def round_of(action_time: float) -> int:
+    """行动时间所在的回合数（从1开始）"""
+    return int(action_time // ROUND_LENGTH) + 1
+
+
+class TimelineBattle(TeamBattle):
+    """
+    按先攻时间线进行的 N vs M 战斗
+
+    速度高的角色行动更频繁；没有角色行动的回合直接跳过，日志与统计只包含有行动的回合
+    """
+
+    def __init__(
+        self,
+        team1: Sequence[Any],
+        team2: Sequence[Any],
+        rng: Any = None,
+        rules: Optional[BattleRules] = None,
+        targeting: str = TARGET_RANDOM,
+        log_retention: Optional[int] = None,
+    ):
+        """
+        初始化时间线战斗
+
+        Args:
+            team1: 队伍1的角色列表（Player 或 FastPlayer，使用其 speed 属性）
+            team2: 队伍2的角色列表
+            rng: 本场战斗独立的随机数源，指定时所有角色也改用该随机数源
+            rules: 战斗规则，指定时所有角色也改用该规则；默认使用全局配置中的规则
+            targeting: 目标选择策略，"random" 随机目标或 "lowest_health" 集火血量最低目标
+            log_retention: battle_log 在内存中保留的回合数，None表示全部保留
+        """
+        for combatant in list(team1) + list(team2):
+            if combatant.speed <= 0:
+                raise ValueError(f"角色速度必须为正数: {combatant.name}")
+        super().__init__(team1, team2, rng, rules, targeting, log_retention)
+
+    def reset_state(self) -> None:
+        """根据角色当前状态重建索引、日志、统计和时间线"""
+        super().reset_state()
+        self.time = 0.0
+        self._round_open = False
+        self.timeline = InitiativeTimeline()
+        # 首次行动时间在各自的一个行动间隔内随机错开
+        random_value = self.rng.random
+        for alive in self.alive:
+            for index in alive.members:
+                self.timeline.schedule(index, self.action_interval(index) * random_value())
+
+    def action_interval(self, index: int) -> float:
+        """角色两次行动之间的时间间隔"""
+        return ACTION_INTERVAL_BASE / self.combatants[index].speed
+
+    def delay_action(self, index: int, amount: float) -> float:
+        """
+        延后角色的下次行动（如被眩晕）
+
+        Args:
+            index: 角色的全局下标
+            amount: 延后的时间单位（ROUND_LENGTH 为一回合）
+
+        Returns:
+            float: 新的行动时间
+        """
+        return self.timeline.delay(index, amount)
+
+    def _on_defeated(self, index: int) -> None:
+        """阵亡角色同时从时间线上移除"""
+        self.timeline.remove(index)
+        super()._on_defeated(index)
+
+    def _close_round(self) -> None:
+        """结束当前回合的统计"""
+        if self._round_open:
+            self.stats.end_round([combatant.is_alive for combatant in self.combatants])
+            self._round_open = False
+
+    def step(self) -> Optional[Tuple[float, int, int]]:
+        """
+        执行时间线上的下一次行动
+
+        Returns:
+            (行动时间, 攻击方下标, 目标下标)，战斗已结束时返回None
+        """
+        if self.battle_ended:
+            return None
+        entry = self.timeline.pop()
+        if entry is None:
+            return None
+        action_time, attacker_index = entry
+        self.time = action_time
+
+        round_number = round_of(action_time)
+        if round_number != self.round_number:
+            self._close_round()
+            self.round_number = round_number
+            self._begin_round(round_number)
+            self._round_open = True
+
+        self.timeline.schedule(
+            attacker_index, action_time + self.action_interval(attacker_index)
+        )
+        target_index = self._resolve_attack(attacker_index, round_number)
+        return action_time, attacker_index, target_index
+
+    def execute_round(self) -> Dict[str, Any]:
+        """
+        执行下一个有行动的回合（跳过其间的空闲时间）
+
+        Returns:
+            回合结果信息（与 battle_log 中条目相同的只读字典视图）
+        """
+        if self.battle_ended:
+            return {"error": "Battle has already ended"}
+
+        next_time = self.timeline.peek_time()
+        if next_time is None:
+            return {"error": "No combatant is scheduled"}
+        target_round = round_of(next_time)
+        while not self.battle_ended:
+            next_time = self.timeline.peek_time()
+            if next_time is None or round_of(next_time) != target_round:
+                break
+            self.step()
+        self._close_round()
+        return RoundView(self.battle_log, len(self.battle_log) - 1)
+
+    def fight(self, max_rounds: Optional[int] = None) -> Dict[str, Any]:
+        """
+        无界面战斗直到一方全灭或时间超过最大回合数
+
+        Args:
+            max_rounds: 最大回合数（换算为 max_rounds * ROUND_LENGTH 的时间上限），默认使用战斗规则中的设置
+
+        Returns:
+            战斗结果，另含结束时的时间线时间 time
+        """
+        if max_rounds is None:
+            max_rounds = self.rules.max_rounds
+        time_limit = max_rounds * ROUND_LENGTH
+        timeline = self.timeline
+        step = self.step
+        while not self.battle_ended:
+            next_time = timeline.peek_time()
+            if next_time is None or next_time >= time_limit:
+                break
+            step()
+        self._close_round()
+        result = self._build_result()
+        result["time"] = self.time
+        return result
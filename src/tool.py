@@ -1,24 +1,176 @@
-from io import TextIOWrapper
+import atexit
+import os
+import threading
+import time
+import weakref
+from collections import deque
+from typing import IO, Any, Dict, List, Optional
+
+from .config_manager import game_config
+from .log_archive import open_log_stream, segment_path
+
+# 尚未关闭的日志记录器，解释器退出时统一关闭以免丢失缓冲的日志
+_open_loggers: "weakref.WeakSet[Logger]" = weakref.WeakSet()
+
+
+def _close_open_loggers() -> None:
+    for logger in list(_open_loggers):
+        logger.close()
+
+
+atexit.register(_close_open_loggers)
 
 
 class Logger:
     """
     简单的日志记录器，写入到指定文件并同步输出到终端。
+
+    默认由后台线程批量写入文件：log 只把消息追加到线程安全的双端队列，
+    缓冲达到 flush_max_messages 条时唤醒写入线程，否则写入线程每 flush_interval_seconds 写出一次；
+    持久模式（durable）下 log 唤醒写入线程并阻塞到消息所在的批次写出并 fsync 后才返回，
+    多个线程同时记录的消息共用一次 fsync（组提交）。
+
+    日志可以流式压缩（gzip / bz2 / lzma），并在分段超过 rotate_max_chars 个字符或
+    打开超过 rotate_max_age_seconds 秒后轮转到 x.1.log.gz、x.2.log.gz……
+    （后台模式按批检查，一批消息总是写入同一分段）。
+    压缩时非持久模式不在每批后刷新压缩器，以免降低压缩率。
     """
 
-    def __init__(self):
-        self.log_file: TextIOWrapper
+    def __init__(self, settings: Optional[Dict[str, Any]] = None, echo: bool = True):
+        """
+        Args:
+            settings: 日志写入配置（background、flush_interval_seconds、flush_max_messages、durable、
+                compression、rotate_max_chars、rotate_max_age_seconds），默认读取配置文件的 logging 部分
+            echo: 是否同步输出到终端
+        """
+        settings = settings if settings is not None else game_config.get_logging_config()
+        self.background = bool(settings.get("background", True))
+        self.flush_interval = float(settings.get("flush_interval_seconds", 0.5))
+        self.flush_max_messages = max(1, int(settings.get("flush_max_messages", 8192)))
+        self.durable = bool(settings.get("durable", False))
+        self.compression = settings.get("compression", "none")
+        self.rotate_max_chars = int(settings.get("rotate_max_chars", 0))
+        self.rotate_max_age = float(settings.get("rotate_max_age_seconds", 0))
+        self.echo = echo
+        self.log_file: Optional[IO[str]] = None
+        # 当前分段路径与本日志写过的全部分段
+        self.log_path: Optional[str] = None
+        self.segments: List[str] = []
+        self._base_path = ""
+        self._segment_chars = 0
+        self._segment_opened = 0.0
+        self.error: Optional[OSError] = None
+        self._buffer: "deque[str]" = deque()
+        self._barriers: List[threading.Event] = []
+        self._wake = threading.Event()
+        self._stopping = False
+        self._writer: Optional[threading.Thread] = None
 
     def init_logger(self, log_file_path):
-        self.log_file = open(log_file_path, "w", encoding="utf-8")
+        """
+        打开新的日志文件（已打开的日志文件先关闭）
+
+        Args:
+            log_file_path: 日志基础路径，压缩时实际文件名追加 .gz / .bz2 / .xz
+        """
+        self.close()
+        self.error = None
+        self._base_path = log_file_path
+        self.segments = []
+        self._open_segment()
+        if self.background:
+            self._stopping = False
+            self._writer = threading.Thread(
+                target=self._writer_loop, name="LoggerWriter", daemon=True
+            )
+            self._writer.start()
+        _open_loggers.add(self)
 
     def log(self, msg):
-        print(msg)
-        self.log_file.write(msg + "\n")
-        self.log_file.flush()
+        """输出到终端并记录到日志文件（后台模式下只放入写入缓冲，持久模式下等待落盘）"""
+        if self.echo:
+            print(msg)
+        if self._writer is not None:
+            buffer = self._buffer
+            buffer.append(msg + "\n")
+            if self.durable:
+                self.flush()
+            elif len(buffer) >= self.flush_max_messages:
+                self._wake.set()
+        else:
+            self._write_text(msg + "\n")
+
+    def _open_segment(self) -> None:
+        path = segment_path(self._base_path, len(self.segments), self.compression)
+        self.log_file = open_log_stream(path, "wt", self.compression)
+        self.log_path = path
+        self.segments.append(path)
+        self._segment_chars = 0
+        self._segment_opened = time.monotonic()
+
+    def _write_text(self, text: str) -> None:
+        """写入一段文本，必要时先轮转到新分段"""
+        if self._segment_chars and (
+            (self.rotate_max_chars and self._segment_chars + len(text) > self.rotate_max_chars)
+            or (self.rotate_max_age and time.monotonic() - self._segment_opened >= self.rotate_max_age)
+        ):
+            self.log_file.close()
+            self._open_segment()
+        self.log_file.write(text)
+        self._segment_chars += len(text)
+        if self.durable or self.compression == "none":
+            self.log_file.flush()
+        if self.durable:
+            os.fsync(self.log_file.fileno())
+
+    def _write_pending(self) -> None:
+        """写出缓冲中的全部消息，失败时记录错误并丢弃（不中断游戏）"""
+        buffer = self._buffer
+        popleft = buffer.popleft
+        pending = [popleft() for _ in range(len(buffer))]
+        if not pending or self.error is not None:
+            return
+        try:
+            self._write_text("".join(pending))
+        except OSError as e:
+            self.error = e
+            print(f"❌ 写入日志文件失败，后续日志将不再写入: {e}")
+
+    def _writer_loop(self) -> None:
+        wake = self._wake
+        while True:
+            wake.wait(self.flush_interval)
+            wake.clear()
+            # 先取走屏障再写出：屏障之前记录的消息一定已在缓冲中
+            barriers, self._barriers = self._barriers, []
+            stopping = self._stopping
+            self._write_pending()
+            for barrier in barriers:
+                barrier.set()
+            if stopping:
+                return
+
+    def flush(self):
+        """阻塞直到此前记录的全部消息都已写入文件（持久模式下已 fsync）"""
+        if self._writer is not None:
+            barrier = threading.Event()
+            self._barriers.append(barrier)
+            self._wake.set()
+            barrier.wait()
+        elif self.log_file is not None:
+            self.log_file.flush()
 
     def close(self):
-        self.log_file.close()
+        """写出全部缓冲的消息，停止写入线程并关闭文件（可重复调用）"""
+        if self._writer is not None:
+            self._stopping = True
+            self._wake.set()
+            self._writer.join()
+            self._writer = None
+        if self.log_file is not None:
+            self.log_file.close()
+            self.log_file = None
+        _open_loggers.discard(self)
 
     def get_log_func(self):
         """
@@ -0,0 +1,503 @@
+"""
+锦标赛模块
+支持单循环（轮转法）、单败淘汰、双败淘汰和瑞士轮四种赛制
+
+每个阶段（轮次）的配对按需生成，不预先展开全部对阵，上万名参赛者也只占用 O(n) 内存；
+同一阶段的对局相互独立，分发到进程池并行模拟，每场对局的种子只由主种子、阶段和对局编号决定，
+因此结果与进程数量无关；run() 每完成一个阶段就产出一次战况与排名
+"""
+
+import heapq
+import math
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .battle import BattleSimulator
+from .battle_rules import BattleRules
+from .character_generator import (
+    CharacterDataLoader,
+    CharacterNameGenerator,
+    character_data_loader,
+    character_name_generator,
+)
+from .config_manager import game_config
+from .parallel_runner import derive_seed
+
+FORMAT_ROUND_ROBIN = "round_robin"
+FORMAT_SINGLE_ELIMINATION = "single_elimination"
+FORMAT_DOUBLE_ELIMINATION = "double_elimination"
+FORMAT_SWISS = "swiss"
+
+# 单场对局任务: (玩家1数据, 玩家2数据, 战斗场数, 最大回合数, 种子, 战斗规则)
+MatchTask = Tuple[Dict[str, Any], Dict[str, Any], int, int, int, BattleRules]
+# 配对: (参赛者下标, 对手下标)，对手为None表示轮空
+Pairing = Tuple[int, Optional[int]]
+
+
+def generate_entrants(
+    count: int,
+    seed: int = 0,
+    data_loader: Optional[CharacterDataLoader] = None,
+    name_generator: Optional[CharacterNameGenerator] = None,
+) -> List[Dict[str, Any]]:
+    """
+    由预设职业和随机名称生成参赛者
+
+    Args:
+        count: 参赛人数
+        seed: 随机种子
+        data_loader: 角色数据加载器，默认使用全局实例
+        name_generator: 角色名称生成器，默认使用全局实例
+
+    Returns:
+        List[Dict]: 参赛者角色数据，名称带编号以保证唯一
+    """
+    data_loader = data_loader or character_data_loader
+    name_generator = name_generator or character_name_generator
+    presets = data_loader.get_character_presets()
+    if not presets:
+        raise ValueError("没有可用的角色预制数据")
+    rng = random.Random(seed)
+    entrants = []
+    for number in range(1, count + 1):
+        preset = rng.choice(presets)
+        entrant = dict(preset)
+        entrant["name"] = f"{name_generator.get_random_name(rng=rng)}#{number}"
+        entrants.append(entrant)
+    return entrants
+
+
+def _play_match(task: MatchTask) -> Tuple[int, int]:
+    """在工作进程中模拟一场对局，返回 (玩家1胜场, 玩家2胜场)"""
+    player1, player2, games, max_rounds, seed, rules = task
+    simulator = BattleSimulator(player1, player2, max_rounds=max_rounds, rules=rules)
+    stats = simulator.run(games, rng=random.Random(seed))
+    return stats.player1_wins, stats.player2_wins
+
+
+class Tournament:
+    """锦标赛基类，子类通过 _pairings 生成每个阶段的配对"""
+
+    format_name = ""
+    # 是否允许平局；淘汰赛中胜场相同时由种子决定的抽签分出胜负
+    allow_draws = True
+    # 轮空获得的积分
+    bye_points = 0.0
+
+    def __init__(
+        self,
+        entrants: Sequence[Dict[str, Any]],
+        games_per_match: int = 1,
+        seed: int = 0,
+        workers: Optional[int] = 1,
+        rules: Optional[BattleRules] = None,
+        max_rounds: Optional[int] = None,
+        report_top: int = 10,
+    ):
+        """
+        初始化锦标赛
+
+        Args:
+            entrants: 参赛者角色数据（包含 name, class, health, attack, defense）
+            games_per_match: 每场对局的战斗场数，胜场多者获胜
+            seed: 主随机种子
+            workers: 进程数量，None或0表示使用全部CPU核心，1表示在当前进程中运行
+            rules: 战斗规则，默认使用全局配置中的规则
+            max_rounds: 单场战斗最大回合数，默认使用战斗规则中的设置
+            report_top: 每个阶段产出的排名条数
+        """
+        if len(entrants) < 2:
+            raise ValueError("锦标赛至少需要两名参赛者")
+        if games_per_match <= 0:
+            raise ValueError("games_per_match 必须为正数")
+        self.entrants = list(entrants)
+        self.games_per_match = games_per_match
+        self.seed = seed
+        self.workers = workers or os.cpu_count() or 1
+        self.rules = rules or game_config.get_battle_rules()
+        self.max_rounds = self.rules.max_rounds if max_rounds is None else max_rounds
+        self.report_top = report_top
+
+        count = len(self.entrants)
+        self.points = [0.0] * count
+        self.wins = [0] * count
+        self.losses = [0] * count
+        self.draws = [0] * count
+        self.byes = [0] * count
+        self.stage = 0
+        self.matches_played = 0
+
+    def _pairings(self) -> Optional[List[Pairing]]:
+        """生成下一阶段的配对，赛事结束时返回None"""
+        raise NotImplementedError
+
+    def _after_stage(self, results: List[Tuple[int, int, Optional[int]]]) -> None:
+        """
+        阶段结束后更新赛制内部状态
+
+        Args:
+            results: 本阶段对局结果 (参赛者, 对手, 胜者)，平局时胜者为None
+        """
+
+    def _tiebreak(self, match_index: int, first: int, second: int) -> int:
+        """胜场相同时由种子决定的抽签"""
+        coin = derive_seed(self.seed, self.stage, match_index, 1) & 1
+        return first if coin == 0 else second
+
+    def _record(self, first: int, second: int, winner: Optional[int]) -> None:
+        if winner is None:
+            for index in (first, second):
+                self.draws[index] += 1
+                self.points[index] += 0.5
+            return
+        loser = second if winner == first else first
+        self.wins[winner] += 1
+        self.points[winner] += 1.0
+        self.losses[loser] += 1
+
+    def _iter_tasks(self, matches: Sequence[Pairing]) -> Iterator[MatchTask]:
+        entrants = self.entrants
+        for match_index, (first, second) in enumerate(matches):
+            yield (
+                entrants[first],
+                entrants[second],
+                self.games_per_match,
+                self.max_rounds,
+                derive_seed(self.seed, self.stage, match_index),
+                self.rules,
+            )
+
+    def _play_stage(self, executor: Any, pairings: List[Pairing]) -> Dict[str, Any]:
+        """模拟一个阶段的全部对局并记录结果"""
+        self.stage += 1
+        matches = [pair for pair in pairings if pair[1] is not None]
+        byes = [first for first, second in pairings if second is None]
+
+        tasks = self._iter_tasks(matches)
+        if executor is None:
+            outcomes = map(_play_match, tasks)
+        else:
+            chunksize = max(1, len(matches) // (self.workers * 4))
+            outcomes = executor.map(_play_match, tasks, chunksize=chunksize)
+
+        results: List[Tuple[int, int, Optional[int]]] = []
+        for match_index, ((first, second), (first_wins, second_wins)) in enumerate(
+            zip(matches, outcomes)
+        ):
+            if first_wins > second_wins:
+                winner: Optional[int] = first
+            elif second_wins > first_wins:
+                winner = second
+            elif self.allow_draws:
+                winner = None
+            else:
+                winner = self._tiebreak(match_index, first, second)
+            self._record(first, second, winner)
+            results.append((first, second, winner))
+
+        for index in byes:
+            self.byes[index] += 1
+            self.points[index] += self.bye_points
+        self.matches_played += len(matches)
+        self._after_stage(results)
+
+        return {
+            "stage": self.stage,
+            "matches": len(matches),
+            "byes": len(byes),
+            "results": results,
+            "standings": self.standings(self.report_top),
+        }
+
+    def run(self) -> Iterator[Dict[str, Any]]:
+        """
+        逐阶段进行比赛
+
+        Yields:
+            每个阶段的战况: stage, matches, byes, results 以及当前排名 standings
+        """
+        executor = None
+        if self.workers > 1:
+            executor = ProcessPoolExecutor(max_workers=self.workers)
+        try:
+            while True:
+                pairings = self._pairings()
+                if pairings is None:
+                    break
+                yield self._play_stage(executor, pairings)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+    def play(self) -> List[Dict[str, Any]]:
+        """进行全部阶段并返回最终排名"""
+        for _ in self.run():
+            pass
+        return self.standings()
+
+    def _rank_key(self, index: int) -> Tuple:
+        return (-self.points[index], -self.wins[index], self.losses[index], index)
+
+    def standings(self, top: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        当前排名
+
+        Args:
+            top: 只返回前若干名，None表示全部
+
+        Returns:
+            List[Dict]: 按名次排序的 rank, name, class, points, wins, losses, draws, byes
+        """
+        count = len(self.entrants)
+        if top is None or top >= count:
+            order = sorted(range(count), key=self._rank_key)
+        else:
+            order = heapq.nsmallest(top, range(count), key=self._rank_key)
+        return [
+            {
+                "rank": rank,
+                "index": index,
+                "name": self.entrants[index]["name"],
+                "class": self.entrants[index]["class"],
+                "points": self.points[index],
+                "wins": self.wins[index],
+                "losses": self.losses[index],
+                "draws": self.draws[index],
+                "byes": self.byes[index],
+            }
+            for rank, index in enumerate(order, 1)
+        ]
+
+    @property
+    def champion(self) -> Dict[str, Any]:
+        """当前排名第一的参赛者"""
+        return self.standings(1)[0]
+
+
+class RoundRobinTournament(Tournament):
+    """
+    单循环赛：轮转法（circle method）排出每一轮
+
+    第 r 轮中固定 0 号位置，其余位置按 r 旋转，第 i 个位置与第 m-1-i 个位置对阵；
+    每轮的配对由公式直接算出，n 名参赛者共 n-1 轮（奇数时补一个轮空位）
+    """
+
+    format_name = FORMAT_ROUND_ROBIN
+
+    def __init__(self, entrants: Sequence[Dict[str, Any]], rounds: Optional[int] = None, **kwargs):
+        """
+        初始化单循环赛
+
+        Args:
+            entrants: 参赛者角色数据
+            rounds: 只进行前若干轮，None表示完整单循环
+            **kwargs: 传给 Tournament 的其他参数
+        """
+        super().__init__(entrants, **kwargs)
+        count = len(self.entrants)
+        self.slots = count + (count % 2)
+        full_rounds = self.slots - 1
+        self.total_rounds = full_rounds if rounds is None else min(rounds, full_rounds)
+
+    def _slot(self, position: int, round_index: int) -> int:
+        if position == 0:
+            return 0
+        return (position - 1 + round_index) % (self.slots - 1) + 1
+
+    def _pairings(self) -> Optional[List[Pairing]]:
+        if self.stage >= self.total_rounds:
+            return None
+        count = len(self.entrants)
+        slots = self.slots
+        round_index = self.stage
+        pairings: List[Pairing] = []
+        for position in range(slots // 2):
+            first = self._slot(position, round_index)
+            second = self._slot(slots - 1 - position, round_index)
+            # 超出人数的位置为轮空位
+            if first >= count:
+                pairings.append((second, None))
+            elif second >= count:
+                pairings.append((first, None))
+            else:
+                pairings.append((first, second))
+        return pairings
+
+
+class SingleEliminationTournament(Tournament):
+    """单败淘汰赛：签位由种子打乱，相邻签位对阵，人数为奇数时最后一名轮空"""
+
+    format_name = FORMAT_SINGLE_ELIMINATION
+    allow_draws = False
+
+    def __init__(self, entrants: Sequence[Dict[str, Any]], **kwargs):
+        super().__init__(entrants, **kwargs)
+        self.bracket = list(range(len(self.entrants)))
+        random.Random(derive_seed(self.seed, 0)).shuffle(self.bracket)
+
+    def _pairings(self) -> Optional[List[Pairing]]:
+        bracket = self.bracket
+        if len(bracket) <= 1:
+            return None
+        pairings: List[Pairing] = [
+            (bracket[i], bracket[i + 1]) for i in range(0, len(bracket) - 1, 2)
+        ]
+        if len(bracket) % 2:
+            pairings.append((bracket[-1], None))
+        return pairings
+
+    def _after_stage(self, results: List[Tuple[int, int, Optional[int]]]) -> None:
+        losses = self.losses
+        self.bracket = [index for index in self.bracket if losses[index] == 0]
+
+    def _rank_key(self, index: int) -> Tuple:
+        # 晋级越远排名越高
+        return (self.losses[index], -self.wins[index], index)
+
+
+class DoubleEliminationTournament(Tournament):
+    """
+    双败淘汰赛：输两场被淘汰
+
+    胜者组（0负）与败者组（1负）在同一阶段内各自相邻配对，胜者组的败者落入败者组末尾；
+    两组各剩一人时进行总决赛，败者组选手获胜后两人均为1负，再赛一场决出冠军
+    """
+
+    format_name = FORMAT_DOUBLE_ELIMINATION
+    allow_draws = False
+
+    def __init__(self, entrants: Sequence[Dict[str, Any]], **kwargs):
+        super().__init__(entrants, **kwargs)
+        self.winners_bracket = list(range(len(self.entrants)))
+        random.Random(derive_seed(self.seed, 0)).shuffle(self.winners_bracket)
+        self.losers_bracket: List[int] = []
+
+    @staticmethod
+    def _pair_adjacent(bracket: List[int], pairings: List[Pairing]) -> None:
+        for i in range(0, len(bracket) - 1, 2):
+            pairings.append((bracket[i], bracket[i + 1]))
+        if len(bracket) % 2:
+            pairings.append((bracket[-1], None))
+
+    def _pairings(self) -> Optional[List[Pairing]]:
+        winners, losers = self.winners_bracket, self.losers_bracket
+        if len(winners) + len(losers) <= 1:
+            return None
+        pairings: List[Pairing] = []
+        if len(winners) == 1 and len(losers) == 1:
+            pairings.append((winners[0], losers[0]))
+            return pairings
+        self._pair_adjacent(winners, pairings)
+        self._pair_adjacent(losers, pairings)
+        return pairings
+
+    def _after_stage(self, results: List[Tuple[int, int, Optional[int]]]) -> None:
+        losses = self.losses
+        winners = self.winners_bracket
+        self.winners_bracket = [index for index in winners if losses[index] == 0]
+        self.losers_bracket = [
+            index for index in self.losers_bracket if losses[index] == 1
+        ] + [index for index in winners if losses[index] == 1]
+
+    def _rank_key(self, index: int) -> Tuple:
+        return (self.losses[index], -self.wins[index], index)
+
+
+class SwissTournament(Tournament):
+    """
+    瑞士轮：每轮按积分排序后相邻配对，尽量避免重复对阵
+
+    人数为奇数时积分最低且未轮空过的参赛者轮空并获得1分；默认进行 ceil(log2 n) 轮
+    """
+
+    format_name = FORMAT_SWISS
+    bye_points = 1.0
+    # 寻找未交手对手时向后查找的最大距离，保证大规模配对为近似线性
+    pairing_window = 32
+
+    def __init__(self, entrants: Sequence[Dict[str, Any]], rounds: Optional[int] = None, **kwargs):
+        """
+        初始化瑞士轮
+
+        Args:
+            entrants: 参赛者角色数据
+            rounds: 轮数，默认 ceil(log2 参赛人数)
+            **kwargs: 传给 Tournament 的其他参数
+        """
+        super().__init__(entrants, **kwargs)
+        count = len(self.entrants)
+        self.total_rounds = rounds or max(1, math.ceil(math.log2(count)))
+        self.opponents: List[set] = [set() for _ in range(count)]
+
+    def _pairings(self) -> Optional[List[Pairing]]:
+        if self.stage >= self.total_rounds:
+            return None
+        order = sorted(range(len(self.entrants)), key=self._rank_key)
+        pairings: List[Pairing] = []
+        if len(order) % 2:
+            # 从排名末尾找第一个未轮空过的参赛者
+            bye_position = len(order) - 1
+            for position in range(len(order) - 1, -1, -1):
+                if self.byes[order[position]] == 0:
+                    bye_position = position
+                    break
+            pairings.append((order.pop(bye_position), None))
+
+        opponents = self.opponents
+        window = self.pairing_window
+        paired = bytearray(len(order))
+        for position, first in enumerate(order):
+            if paired[position]:
+                continue
+            partner = None
+            checked = 0
+            for candidate in range(position + 1, len(order)):
+                if paired[candidate]:
+                    continue
+                if partner is None:
+                    partner = candidate
+                if order[candidate] not in opponents[first]:
+                    partner = candidate
+                    break
+                checked += 1
+                if checked >= window:
+                    break
+            paired[position] = paired[partner] = 1
+            pairings.append((first, order[partner]))
+        return pairings
+
+    def _after_stage(self, results: List[Tuple[int, int, Optional[int]]]) -> None:
+        opponents = self.opponents
+        for first, second, _ in results:
+            opponents[first].add(second)
+            opponents[second].add(first)
+
+
+TOURNAMENT_FORMATS = {
+    FORMAT_ROUND_ROBIN: RoundRobinTournament,
+    FORMAT_SINGLE_ELIMINATION: SingleEliminationTournament,
+    FORMAT_DOUBLE_ELIMINATION: DoubleEliminationTournament,
+    FORMAT_SWISS: SwissTournament,
+}
+
+
+def create_tournament(
+    tournament_format: str, entrants: Sequence[Dict[str, Any]], **kwargs
+) -> Tournament:
+    """
+    按赛制名称创建锦标赛
+
+    Args:
+        tournament_format: round_robin / single_elimination / double_elimination / swiss
+        entrants: 参赛者角色数据
+        **kwargs: 传给对应赛制的其他参数
+
+    Returns:
+        Tournament: 锦标赛实例
+    """
+    tournament_class = TOURNAMENT_FORMATS.get(tournament_format)
+    if tournament_class is None:
+        raise ValueError(f"未知赛制: {tournament_format}")
+    return tournament_class(entrants, **kwargs)
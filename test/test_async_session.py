@@ -0,0 +1,188 @@
+"""
+测试异步会话服务器与战斗输入路由
+"""
+
+import sys
+import os
+import asyncio
+import random
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import async_session
+from src.async_session import PROMPT_PREFIX, BattleSessionServer
+from src.battle import Battle
+from src.clock import VirtualClock
+from src.player import Player
+
+
+class _ScriptedDungeonMaster:
+    """按脚本回答提示的同步DM"""
+
+    def __init__(self, answers):
+        self.answers = list(answers)
+        self.prompts = []
+        self.messages = []
+
+    def input_prompt(self, prompt, with_dm=False):
+        self.prompts.append(prompt)
+        return self.answers.pop(0) if self.answers else ""
+
+    def log_message(self, message, with_dm=False):
+        self.messages.append(message)
+
+
+class _DrainCountingDungeonMaster(_ScriptedDungeonMaster):
+    """记录 drain 次数的异步DM"""
+
+    def __init__(self):
+        super().__init__([])
+        self.drains = 0
+
+    async def input_prompt(self, prompt, with_dm=False):
+        return super().input_prompt(prompt, with_dm)
+
+    async def drain(self):
+        self.drains += 1
+
+
+async def _play_session(port, battles):
+    """脚本化客户端：进行若干场自动战斗后退出"""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    transcript = []
+    remaining = battles
+    while True:
+        line = await reader.readline()
+        if not line:
+            break
+        text = line.decode("utf-8")
+        transcript.append(text)
+        if not text.startswith(PROMPT_PREFIX):
+            continue
+        if "请输入选项" in text:
+            answer = "1" if remaining else "3"
+            remaining -= 1 if remaining else 0
+        elif "玩家请选择角色" in text:
+            answer = "2"
+        elif "随机角色名称" in text:
+            answer = "y"
+        elif "继续下一回合" in text:
+            answer = "a"
+        else:
+            answer = ""
+        writer.write((answer + "\n").encode("utf-8"))
+        await writer.drain()
+    writer.close()
+    await writer.wait_closed()
+    return "".join(transcript)
+
+
+def test_battle_input_goes_through_dungeon_master():
+    """测试 fight_until_end 通过DM获取输入并记录"""
+    print("=== 战斗输入路由测试 ===")
+    player1 = Player("测试·剑士", "剑士", 100, 25, 8)
+    player2 = Player("测试·刺客", "刺客", 70, 40, 4)
+    dungeon_master = _ScriptedDungeonMaster(["", "a"])
+    battle = Battle(
+        player1, player2, dungeon_master, rng=random.Random(2), clock=VirtualClock()
+    )
+    result = battle.fight_until_end()
+    assert len(dungeon_master.prompts) == min(2, result["total_rounds"])
+    assert battle.inputs[0] == (1, "")
+    print("✅ 战斗输入路由测试通过")
+
+
+def test_auto_battle_drains_every_round():
+    """测试异步自动战斗每回合等待一次 drain（输出受背压约束）"""
+    player1 = Player("测试·剑士", "剑士", 100, 25, 8)
+    player2 = Player("测试·刺客", "刺客", 70, 40, 4)
+    dungeon_master = _DrainCountingDungeonMaster()
+    battle = Battle(
+        player1,
+        player2,
+        dungeon_master,
+        rng=random.Random(3),
+        clock=VirtualClock(),
+        battle_delay=0,
+        auto_advance=True,
+    )
+    result = asyncio.run(battle.fight_until_end_async())
+    assert dungeon_master.prompts == []
+    assert dungeon_master.drains == result["total_rounds"]
+
+
+def test_concurrent_sessions():
+    """测试单个事件循环同时服务多个会话"""
+
+    async def scenario():
+        server = BattleSessionServer(port=0, seed=1, clock=VirtualClock())
+        port = await server.start()
+        transcripts = await asyncio.gather(*(_play_session(port, 2) for _ in range(20)))
+        await server.close()
+        return server, transcripts
+
+    server, transcripts = asyncio.run(scenario())
+    assert server.completed_sessions == 20
+    assert server.dropped_sessions == 0
+    assert server.active_sessions == 0
+    for transcript in transcripts:
+        assert transcript.count("战斗开始") == 2
+        assert "进入自动战斗模式" in transcript
+
+
+def test_disconnected_session():
+    """测试客户端中途断开时会话被计为断开"""
+
+    async def scenario():
+        server = BattleSessionServer(port=0, battle_delay=0)
+        port = await server.start()
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        await reader.readuntil(PROMPT_PREFIX.encode("utf-8"))
+        writer.close()
+        await writer.wait_closed()
+        for _ in range(100):
+            if server.dropped_sessions:
+                break
+            await asyncio.sleep(0.01)
+        await server.close()
+        return server
+
+    server = asyncio.run(scenario())
+    assert server.dropped_sessions == 1
+    assert server.active_sessions == 0
+
+
+def test_failed_session_is_contained():
+    """测试会话内部的程序异常只终止该会话并被计数"""
+
+    async def broken_run(self):
+        raise RuntimeError("测试异常")
+
+    async def scenario():
+        server = BattleSessionServer(port=0, battle_delay=0)
+        port = await server.start()
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        # 服务器出错后关闭连接
+        assert await reader.read() == b""
+        writer.close()
+        await writer.wait_closed()
+        await server.close()
+        return server
+
+    original_run = async_session.GameSession.run
+    async_session.GameSession.run = broken_run
+    try:
+        server = asyncio.run(scenario())
+    finally:
+        async_session.GameSession.run = original_run
+    assert server.failed_sessions == 1 and server.dropped_sessions == 0
+    assert server.active_sessions == 0
+
+
+if __name__ == "__main__":
+    test_battle_input_goes_through_dungeon_master()
+    test_auto_battle_drains_every_round()
+    test_concurrent_sessions()
+    test_disconnected_session()
+    test_failed_session_is_contained()
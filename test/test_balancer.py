@@ -0,0 +1,74 @@
+"""
+测试预设职业属性自动平衡器
+"""
+
+import sys
+import os
+import json
+import tempfile
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.balancer import StatBalancer
+from src.character_generator import CharacterDataLoader
+from src.config_manager import GameConfig
+
+PRESETS = [
+    {"class": "剑士", "health": 100, "attack": 25, "defense": 8, "speed": 10},
+    {"class": "盾卫", "health": 120, "attack": 20, "defense": 12, "speed": 7},
+    {"class": "刺客", "health": 70, "attack": 40, "defense": 4, "speed": 15},
+]
+
+
+def _config(**balance):
+    config = GameConfig(config_path=os.path.join(tempfile.gettempdir(), "不存在的配置.yaml"))
+    for key, value in balance.items():
+        config.set_config_value("balance", key, value)
+    return config
+
+
+def test_win_rate_memoized():
+    """测试胜率记忆化与对称性"""
+    print("=== 自动平衡测试 ===")
+    balancer = StatBalancer(PRESETS, config=_config())
+    first, second = (StatBalancer.stat_tuple(preset) for preset in PRESETS[:2])
+    rate = balancer.win_rate(first, second)
+    assert balancer.evaluations == 1
+    assert balancer.win_rate(first, second) == rate
+    assert abs(balancer.win_rate(second, first) - (1 - rate)) < 1e-12
+    assert balancer.evaluations == 1 and balancer.cache_hits == 2
+
+
+def test_optimize_reduces_loss():
+    """测试搜索降低胜率偏差并保留其他字段"""
+    balancer = StatBalancer(PRESETS, config=_config(max_iterations=4))
+    result = balancer.optimize()
+    assert result["final_loss"] < result["initial_loss"]
+    assert result["cache_hits"] > 0
+    assert [preset["class"] for preset in result["presets"]] == ["剑士", "盾卫", "刺客"]
+    assert [preset["speed"] for preset in result["presets"]] == [10, 7, 15]
+    for preset in result["presets"]:
+        low, high = balancer.stat_bounds["health"]
+        assert low <= preset["health"] <= high
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = balancer.write_proposal(result["presets"], os.path.join(temp_dir, "proposed.json"))
+        with open(path, "r", encoding="utf-8") as f:
+            assert json.load(f)["character_presets"] == result["presets"]
+        assert CharacterDataLoader(path).get_character_presets() == result["presets"]
+    print("✅ 自动平衡测试通过")
+
+
+def test_pair_targets():
+    """测试指定职业对的目标胜率"""
+    balancer = StatBalancer(PRESETS, config=_config(pair_targets={"刺客/盾卫": 0.6}))
+    assert balancer.target("刺客", "盾卫") == 0.6
+    assert abs(balancer.target("盾卫", "刺客") - 0.4) < 1e-12
+    assert balancer.target("剑士", "刺客") == 0.5
+
+
+if __name__ == "__main__":
+    test_win_rate_memoized()
+    test_optimize_reduces_loss()
+    test_pair_targets()
@@ -0,0 +1,77 @@
+"""
+测试向量化战斗内核与逐回合战斗的统计等价性
+"""
+
+import sys
+import os
+import math
+import random
+
+import numpy as np
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.battle import BattleSimulator
+from src.battle_kernel import VectorizedBattleSimulator, roll_damage, simulate_battles
+from src.player import Player
+
+SWORDSMAN = {"class": "剑士", "health": 100, "attack": 25, "defense": 8}
+ASSASSIN = {"class": "刺客", "health": 70, "attack": 40, "defense": 4}
+GUARDIAN = {"class": "盾卫", "health": 120, "attack": 20, "defense": 12}
+
+
+def test_roll_damage_matches_scalar_distribution():
+    """测试单次攻击伤害分布与 Player.attack_target 一致"""
+    random.seed(1)
+    attacker = Player("A", "剑士", 100, 25, 8)
+    target = Player("B", "盾卫", 10**9, 20, 12)
+    scalar = [attacker.attack_target(target)["actual_damage"] for _ in range(20000)]
+
+    rng = np.random.default_rng(1)
+    vectorized = roll_damage(np.full(200000, 25), np.full(200000, 12), rng)
+
+    assert set(np.unique(vectorized)) == set(scalar)
+    assert abs(np.mean(vectorized) - np.mean(scalar)) < 0.15
+    print(f"   伤害均值: 逐次 {np.mean(scalar):.3f} | 向量化 {np.mean(vectorized):.3f}")
+
+
+def test_statistical_equivalence():
+    """测试胜率和回合分布与逐回合模拟统计等价"""
+    print("=== 向量化内核等价性测试 ===")
+    for player1, player2 in ((SWORDSMAN, ASSASSIN), (GUARDIAN, SWORDSMAN)):
+        random.seed(2024)
+        scalar = BattleSimulator(player1, player2).run(4000)
+        vectorized = VectorizedBattleSimulator(player1, player2).run(
+            200000, rng=np.random.default_rng(2024)
+        )
+
+        p_scalar = scalar.player1_wins / scalar.battles
+        p_vector = vectorized.player1_wins / vectorized.battles
+        tolerance = 4 * math.sqrt(p_vector * (1 - p_vector) / scalar.battles)
+        print(f"   {player1['class']} 胜率: 逐回合 {p_scalar:.3f} | 向量化 {p_vector:.3f}")
+        assert abs(p_scalar - p_vector) <= tolerance
+
+        for count_s, count_v in zip(scalar.round_histogram, vectorized.round_histogram):
+            assert abs(count_s / scalar.battles - count_v / vectorized.battles) < 0.04
+    print("✅ 向量化内核等价性测试通过")
+
+
+def test_vectorized_seed_and_invariants():
+    """测试相同种子结果一致以及每场战斗恰有一方阵亡"""
+    first = simulate_battles(5000, SWORDSMAN, ASSASSIN, 50, np.random.default_rng(3))
+    second = simulate_battles(5000, SWORDSMAN, ASSASSIN, 50, np.random.default_rng(3))
+    for a, b in zip(first, second):
+        assert np.array_equal(a, b)
+
+    outcome, rounds, damage1, damage2 = first
+    assert np.all(rounds >= 1)
+    # 胜者造成的有效伤害恰好等于败者满血值
+    assert np.all(damage1[outcome == 1] == ASSASSIN["health"])
+    assert np.all(damage2[outcome == 2] == SWORDSMAN["health"])
+
+
+if __name__ == "__main__":
+    test_roll_damage_matches_scalar_distribution()
+    test_statistical_equivalence()
+    test_vectorized_seed_and_invariants()
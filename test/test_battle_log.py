@@ -0,0 +1,88 @@
+"""
+测试紧凑战斗事件日志
+"""
+
+import sys
+import os
+import random
+import tracemalloc
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.battle import Battle
+from src.battle_log import BattleEventLog, EVENT_ACTUAL_DAMAGE
+from src.player import Player
+
+
+def _long_battle(seed=1):
+    player1 = Player("测试·盾卫甲", "盾卫", 5000, 20, 12)
+    player2 = Player("测试·盾卫乙", "盾卫", 5000, 20, 12)
+    player1.pre_name = "【玩家】"
+    battle = Battle(player1, player2, rng=random.Random(seed))
+    while not battle.battle_ended and battle.round_number < 500:
+        battle.execute_round()
+    return battle
+
+
+def test_views_match_legacy_format():
+    """测试日志视图与原先的回合字典格式一致"""
+    print("=== 紧凑战斗日志测试 ===")
+    battle = _long_battle()
+    log = battle.battle_log
+    assert isinstance(log, BattleEventLog)
+    assert len(log) == battle.round_number
+
+    first_round = log[0]
+    assert first_round["round"] == 1
+    action = first_round["actions"][0]
+    assert set(action.keys()) == {
+        "attacker", "target", "base_damage", "actual_damage",
+        "is_critical", "target_health", "target_alive",
+    }
+    assert action["attacker"] in ("【玩家】 盾卫甲", " 盾卫乙")
+    assert action["target"] != action["attacker"]
+    assert action["target_alive"] is True
+    assert log[-1]["round"] == battle.round_number
+    assert log.to_list()[0] == first_round
+    print(f"   第1回合: {first_round}")
+
+    # 列访问与逐条访问一致
+    damages = [a["actual_damage"] for r in log for a in r["actions"]]
+    assert list(log.column(EVENT_ACTUAL_DAMAGE)) == damages
+
+
+def test_execute_round_returns_current_round():
+    """测试 execute_round 返回当前回合视图"""
+    battle = Battle(Player("甲", "剑士", 100, 25, 8), Player("乙", "刺客", 70, 40, 4), rng=random.Random(3))
+    while not battle.battle_ended:
+        round_result = battle.execute_round()
+        assert round_result["round"] == battle.round_number
+        last = round_result["actions"][-1]
+        assert last["target_health"] >= 0
+    assert last["target_alive"] is False
+    assert battle.execute_round() == {"error": "Battle has already ended"}
+
+
+def test_memory_reduction():
+    """测试每次攻击的内存占用比字典格式至少低一个数量级"""
+    battle = _long_battle()
+    log = battle.battle_log
+
+    tracemalloc.start()
+    legacy = log.to_list()
+    legacy_bytes, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    per_action_compact = log.nbytes() / log.action_count()
+    per_action_legacy = legacy_bytes / log.action_count()
+    print(f"   每次攻击: 紧凑 {per_action_compact:.1f} 字节 | 字典 {per_action_legacy:.1f} 字节")
+    assert len(legacy) == len(log)
+    assert per_action_compact * 10 <= per_action_legacy
+    print("✅ 紧凑战斗日志测试通过")
+
+
+if __name__ == "__main__":
+    test_views_match_legacy_format()
+    test_execute_round_returns_current_round()
+    test_memory_reduction()
@@ -0,0 +1,154 @@
+"""
+测试战斗日志流式写入与内存保留策略
+"""
+
+import sys
+import os
+import random
+import tempfile
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.battle import Battle, BattleSimulator
+from src.battle_log import (
+    BINARY_RECORD,
+    BattleEventLog,
+    BinaryBattleLogSink,
+    JsonlBattleLogSink,
+    read_binary_battle_log,
+    read_jsonl_battle_log,
+)
+from src.player import Player
+
+SWORDSMAN = {"class": "剑士", "health": 100, "attack": 25, "defense": 8}
+ASSASSIN = {"class": "刺客", "health": 70, "attack": 40, "defense": 4}
+
+
+def _tank_battle(**kwargs):
+    return Battle(
+        Player("甲", "盾卫", 3000, 20, 12),
+        Player("乙", "盾卫", 3000, 20, 12),
+        rng=random.Random(8),
+        **kwargs,
+    )
+
+
+def test_retention_keeps_memory_flat():
+    """测试只保留最近K个回合时内存占用不随回合数增长"""
+    print("=== 战斗日志保留策略测试 ===")
+    full = _tank_battle()
+    limited = _tank_battle(log_retention=3)
+    sizes = []
+    for _ in range(300):
+        full.execute_round()
+        round_view = limited.execute_round()
+        assert round_view["round"] == limited.round_number
+        assert len(limited.battle_log) <= 3
+        sizes.append(limited.battle_log.nbytes())
+
+    assert max(sizes[10:]) == max(sizes[-10:])
+    # 保留的回合与完整日志的最后几个回合一致
+    assert limited.battle_log.to_list() == full.battle_log.to_list()[-3:]
+    print(f"   完整日志 {full.battle_log.nbytes()} 字节 | 保留3回合 {limited.battle_log.nbytes()} 字节")
+
+    result = _tank_battle(log_retention=0)
+    result.execute_round()
+    assert len(result._generate_battle_result(50)["battle_log"]) == 0
+
+
+def test_round_view_across_trim():
+    """测试跨回合持有的视图在回合被丢弃前保持原回合，丢弃后报错而不是指向其他回合"""
+    for retention in (0, 1, 2):
+        battle = _tank_battle(log_retention=retention)
+        first = battle.execute_round()
+        snapshot = first.to_dict()
+        second = battle.execute_round()
+        if retention >= 2:
+            assert first.to_dict() == snapshot and first["round"] == 1
+        else:
+            for key in ("round", "actions"):
+                try:
+                    first[key]
+                    assert False, "已丢弃的回合应当报错"
+                except IndexError:
+                    pass
+        assert second["round"] == 2
+        battle.execute_round()
+        battle.execute_round()
+        assert battle.battle_log[-1]["round"] == 4
+        if retention == 2:
+            try:
+                second.to_dict()
+                assert False, "已丢弃的回合应当报错"
+            except IndexError:
+                pass
+
+
+def test_jsonl_sink_roundtrip():
+    """测试 JSON Lines 写入内容与内存日志一致"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "battle.jsonl")
+        with JsonlBattleLogSink(path) as sink:
+            battle = Battle(
+                Player("甲", "剑士", 100, 25, 8),
+                Player("乙", "刺客", 70, 40, 4),
+                rng=random.Random(4),
+                log_sink=sink,
+                battle_id=7,
+            )
+            while not battle.battle_ended:
+                battle.execute_round()
+
+        records = list(read_jsonl_battle_log(path))
+        assert records[0] == {"battle": 7, "combatants": ["甲", "乙"]}
+        assert len(records) == 1 + battle.round_number
+        for record, round_view in zip(records[1:], battle.battle_log):
+            assert record["round"] == round_view["round"]
+            assert [a["actual_damage"] for a in record["actions"]] == [
+                a["actual_damage"] for a in round_view["actions"]
+            ]
+
+
+def test_binary_sink_with_simulator():
+    """测试批量模拟写入二进制日志并逐块读回"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "battles.bin")
+        with BinaryBattleLogSink(path) as sink:
+            stats = BattleSimulator(SWORDSMAN, ASSASSIN, log_sink=sink).run(
+                500, rng=random.Random(6)
+            )
+
+        records = list(read_binary_battle_log(path, chunk_records=100))
+        assert {r[0] for r in records} == set(range(500))
+        # 每场战斗恰有一次致命攻击
+        assert sum(1 for r in records if r[7] <= 0) == stats.player1_wins + stats.player2_wins
+        assert sum(r[5] for r in records if r[2] == 1) >= stats.player2_damage
+        assert os.path.getsize(path) == BINARY_RECORD.size * len(records)
+
+
+def test_binary_sink_many_combatants():
+    """测试超过255名参战角色时二进制日志仍能写入角色下标"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "team.bin")
+        log = BattleEventLog([None] * 300)
+        log.begin_round(1)
+        log.record(299, 256, 30, 25, False, 75)
+        with BinaryBattleLogSink(path) as sink:
+            sink.begin_battle(3, log.combatants)
+            sink.write_round(3, log[0])
+            try:
+                sink.begin_battle(4, [None] * 70000)
+                assert False, "角色下标超出记录范围应当报错"
+            except ValueError:
+                pass
+        assert list(read_binary_battle_log(path)) == [(3, 1, 299, 256, 30, 25, 0, 75)]
+        print("✅ 战斗日志流式写入测试通过")
+
+
+if __name__ == "__main__":
+    test_retention_keeps_memory_flat()
+    test_round_view_across_trim()
+    test_jsonl_sink_roundtrip()
+    test_binary_sink_with_simulator()
+    test_binary_sink_many_combatants()
@@ -0,0 +1,95 @@
+"""
+测试预编译战斗规则 BattleRules 及其在战斗各模块中的生效情况
+"""
+
+import sys
+import os
+import pickle
+import random
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.battle import Battle, BattleSimulator
+from src.battle_rules import BattleRules
+from src.config_manager import GameConfig
+from src.exact_solver import solve_battle
+from src.player import FastPlayer, Player
+
+
+def test_rules_from_config():
+    """测试规则从配置构建、缓存并在修改配置后失效"""
+    print("=== 战斗规则构建测试 ===")
+    config = GameConfig()
+    rules = config.get_battle_rules()
+    assert rules is config.get_battle_rules()
+    assert config.get_battle_config() == rules.to_dict()
+
+    config.set_config_value("battle", "critical_hit_chance", 0.5)
+    updated = config.get_battle_rules()
+    assert updated is not rules
+    assert updated.critical_hit_chance == 0.5
+    assert updated.version != rules.version
+
+    defaults = BattleRules.from_config({"max_rounds": 7})
+    assert defaults.max_rounds == 7
+    assert defaults.damage_variance_min == 0.8
+    print("✅ 战斗规则构建测试通过")
+
+
+def test_rules_are_immutable():
+    """测试规则不可修改、可比较、可序列化"""
+    rules = BattleRules(max_rounds=10)
+    try:
+        rules.max_rounds = 20
+        assert False, "BattleRules 应当不可修改"
+    except AttributeError:
+        pass
+    assert rules.replace(max_rounds=20).max_rounds == 20
+    assert rules == BattleRules(max_rounds=10)
+    assert pickle.loads(pickle.dumps(rules)) == rules
+
+    # 攻击力25：80%-120% 浮动后基础伤害为20到29
+    assert rules.damage_range(25) == (20, 29)
+    assert BattleRules(damage_variance_min=1, damage_variance_max=1).damage_range(25) == (25, 25)
+
+
+def test_rules_are_honored():
+    """测试战斗按规则结算伤害、暴击与最大回合数"""
+    always_crit = BattleRules(
+        critical_hit_chance=1.0,
+        critical_hit_multiplier=2.0,
+        damage_variance_min=1.0,
+        damage_variance_max=1.0,
+    )
+    for player_class in (Player, FastPlayer):
+        attacker = player_class("测试·剑士", "剑士", 100, 25, 8, rules=always_crit)
+        target = player_class("靶子", "盾卫", 1000, 20, 10)
+        assert attacker.strike(target) == (50, 40, True)
+
+    player1 = Player("测试·剑士", "剑士", 100, 25, 8)
+    player2 = Player("测试·刺客", "刺客", 70, 40, 4)
+    battle = Battle(player1, player2, rng=random.Random(3), rules=always_crit)
+    assert player1.rules is always_crit and player2.rules is always_crit
+    battle.execute_round()
+    assert all(action["is_critical"] for action in battle.battle_log[0]["actions"])
+
+    tank = {"class": "盾卫", "health": 10000, "attack": 1, "defense": 100}
+    short = BattleRules(max_rounds=3)
+    stats = BattleSimulator(tank, tank, rules=short).run(5, rng=random.Random(0))
+    assert stats.max_rounds == 3 and stats.timeouts == 5
+    assert solve_battle(tank, tank, rules=short)["timeout"] == 1.0
+
+    # 暴击概率为0时精确求解结果与默认规则不同
+    warrior = {"health": 100, "attack": 25, "defense": 8}
+    rogue = {"health": 70, "attack": 40, "defense": 4}
+    no_crit = BattleRules(critical_hit_chance=0.0)
+    assert solve_battle(warrior, rogue, rules=no_crit) != solve_battle(
+        warrior, rogue, rules=BattleRules()
+    )
+
+
+if __name__ == "__main__":
+    test_rules_from_config()
+    test_rules_are_immutable()
+    test_rules_are_honored()
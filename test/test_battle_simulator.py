@@ -0,0 +1,73 @@
+"""
+测试无界面批量战斗模拟器
+"""
+
+import sys
+import os
+import random
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.battle import (
+    BattleSimulator,
+    BattleOutcomeStats,
+    OUTCOME_PLAYER1_WIN,
+    OUTCOME_PLAYER2_WIN,
+    OUTCOME_TIMEOUT,
+)
+
+SWORDSMAN = {"class": "剑士", "health": 100, "attack": 25, "defense": 8}
+ASSASSIN = {"class": "刺客", "health": 70, "attack": 40, "defense": 4}
+
+
+def test_simulator_aggregates():
+    """测试模拟器汇总结果的一致性"""
+    print("=== 批量模拟器测试 ===")
+    random.seed(42)
+    stats = BattleSimulator(SWORDSMAN, ASSASSIN).run(2000)
+    result = stats.to_dict()
+    print(f"   结果: {result}")
+
+    assert result["battles"] == 2000
+    assert (
+        result["player1_wins"] + result["player2_wins"] + result["timeouts"] == 2000
+    )
+    assert sum(stats.round_histogram) == 2000
+    assert 1 <= result["rounds_p50"] <= result["rounds_p90"] <= result["rounds_p99"]
+    # 每场战斗败者的有效伤害承受量等于其满血值
+    assert result["player2_damage_dealt"] >= result["player2_wins"] * 100
+    assert result["player1_damage_dealt"] >= result["player1_wins"] * 70
+    print("✅ 批量模拟器测试通过")
+
+
+def test_simulator_seed_reproducible():
+    """测试相同随机种子结果一致"""
+    random.seed(7)
+    first = BattleSimulator(SWORDSMAN, ASSASSIN).run(300).to_dict()
+    random.seed(7)
+    second = BattleSimulator(SWORDSMAN, ASSASSIN).run(300).to_dict()
+    assert first == second
+
+
+def test_outcome_stats_merge():
+    """测试统计结果合并与分位数"""
+    a = BattleOutcomeStats(max_rounds=10)
+    b = BattleOutcomeStats(max_rounds=10)
+    a.record(OUTCOME_PLAYER1_WIN, 2, 50, 10)
+    a.record(OUTCOME_PLAYER2_WIN, 4, 20, 60)
+    b.record(OUTCOME_TIMEOUT, 10, 30, 30)
+    a.merge(b)
+
+    assert a.battles == 3
+    assert (a.player1_wins, a.player2_wins, a.timeouts) == (1, 1, 1)
+    assert a.player1_damage == 100 and a.player2_damage == 100
+    assert a.mean_rounds() == (2 + 4 + 10) / 3
+    assert a.rounds_percentile(50) == 4
+    assert a.rounds_percentile(100) == 10
+
+
+if __name__ == "__main__":
+    test_simulator_aggregates()
+    test_simulator_seed_reproducible()
+    test_outcome_stats_merge()
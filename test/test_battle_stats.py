@@ -0,0 +1,66 @@
+"""
+测试战斗增量统计
+"""
+
+import sys
+import os
+import random
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.battle import Battle
+from src.player import Player
+
+
+def test_summary_matches_log():
+    """测试增量统计与完整日志重新计算的结果一致"""
+    print("=== 战斗增量统计测试 ===")
+    for seed in range(20):
+        player1 = Player("测试·剑士", "剑士", 100, 25, 8)
+        player2 = Player("测试·刺客", "刺客", 70, 40, 4)
+        player1.pre_name = "【玩家】"
+        battle = Battle(player1, player2, rng=random.Random(seed))
+
+        while not battle.battle_ended:
+            battle.execute_round()
+            # 每回合都可以随时读取摘要
+            summary = battle.get_battle_summary()
+            assert summary["total_rounds"] == battle.round_number
+
+        dealt = [0, 0]
+        crits = [0, 0]
+        for round_log in battle.battle_log:
+            for action in round_log["actions"]:
+                index = 0 if action["attacker"].endswith("剑士") else 1
+                dealt[index] += action["actual_damage"]
+                crits[index] += action["is_critical"]
+
+        assert summary["player1_damage_dealt"] == dealt[0]
+        assert summary["player2_damage_dealt"] == dealt[1]
+        assert summary["player1_stats"]["critical_hits"] == crits[0]
+        assert summary["player2_stats"]["damage_taken"] == dealt[0]
+
+        loser_stats = summary["player2_stats"] if battle.winner is player1 else summary["player1_stats"]
+        winner_stats = summary["player1_stats"] if battle.winner is player1 else summary["player2_stats"]
+        loser_health = player2.max_health if battle.winner is player1 else player1.max_health
+        assert winner_stats["damage_dealt"] - winner_stats["overkill"] == loser_health
+        assert winner_stats["rounds_survived"] == battle.round_number
+        assert loser_stats["rounds_survived"] == battle.round_number - 1
+    print(f"   最后一场摘要: {summary}")
+    print("✅ 战斗增量统计测试通过")
+
+
+def test_reset_clears_stats():
+    """测试重置战斗时统计清零"""
+    battle = Battle(Player("甲", "剑士", 100, 25, 8), Player("乙", "刺客", 70, 40, 4), rng=random.Random(1))
+    battle.execute_round()
+    assert battle.stats[0].hits + battle.stats[1].hits > 0
+    battle.reset()
+    assert battle.get_battle_summary()["player1_stats"]["hits"] == 0
+    assert battle.stats.rounds == 0
+
+
+if __name__ == "__main__":
+    test_summary_matches_log()
+    test_reset_clears_stats()
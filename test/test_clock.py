@@ -0,0 +1,121 @@
+"""
+测试可替换时钟与战斗节奏配置
+"""
+
+import sys
+import os
+import asyncio
+import random
+import time
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.battle import Battle
+from src.clock import AcceleratedClock, RealClock, VirtualClock, clock_from_speed, real_clock
+from src.player import Player
+
+
+class _ScriptedDungeonMaster:
+    """按脚本回答提示的DM"""
+
+    def __init__(self, answers=()):
+        self.answers = list(answers)
+        self.prompts = []
+
+    def input_prompt(self, prompt, with_dm=False):
+        self.prompts.append(prompt)
+        return self.answers.pop(0) if self.answers else ""
+
+    def log_message(self, message, with_dm=False):
+        pass
+
+
+class _AsyncScriptedDungeonMaster(_ScriptedDungeonMaster):
+    async def input_prompt(self, prompt, with_dm=False):
+        return _ScriptedDungeonMaster.input_prompt(self, prompt, with_dm)
+
+
+def _battle(dungeon_master, **kwargs):
+    player1 = Player("测试·剑士", "剑士", 300, 25, 8)
+    player2 = Player("测试·盾卫", "盾卫", 300, 20, 12)
+    return Battle(player1, player2, dungeon_master, rng=random.Random(4), **kwargs)
+
+
+def test_clocks():
+    """测试三种时钟的时间推进"""
+    print("=== 时钟测试 ===")
+    clock = VirtualClock()
+    start = time.monotonic()
+    clock.sleep(30)
+    asyncio.run(clock.async_sleep(15))
+    assert clock.now() == 45 and clock.sleeps == 2
+    assert time.monotonic() - start < 1
+
+    accelerated = AcceleratedClock(1000)
+    start = time.monotonic()
+    accelerated.sleep(0.5)
+    assert time.monotonic() - start < 0.4
+    assert accelerated.now() >= 0.5
+
+    assert clock_from_speed(None) is real_clock
+    assert isinstance(clock_from_speed(0), VirtualClock)
+    assert isinstance(clock_from_speed(4), AcceleratedClock)
+    assert isinstance(real_clock, RealClock)
+    print("✅ 时钟测试通过")
+
+
+def test_battle_uses_clock_and_delay():
+    """测试战斗按配置的停顿时长通过时钟等待"""
+    clock = VirtualClock()
+    dungeon_master = _ScriptedDungeonMaster(["a"])
+    battle = _battle(dungeon_master, clock=clock, battle_delay=2.5)
+    result = battle.fight_until_end()
+    pauses = result["total_rounds"] - (0 if result["outcome"] == "timeout" else 1)
+    assert clock.sleeps == pauses
+    assert clock.now() == 2.5 * pauses
+    assert len(dungeon_master.prompts) == 1
+
+
+def test_auto_advance_battle():
+    """测试 auto_advance 为真时不等待输入"""
+    clock = VirtualClock()
+    dungeon_master = _ScriptedDungeonMaster()
+    battle = _battle(dungeon_master, clock=clock, battle_delay=0, auto_advance=True)
+    battle.fight_until_end()
+    assert dungeon_master.prompts == []
+    assert battle.battle_ended or battle.round_number == battle.rules.max_rounds
+
+    # 默认读取配置文件（auto_advance_battle: false）
+    assert _battle(dungeon_master).auto_advance is False
+
+
+def test_async_battle_uses_clock():
+    """测试异步战斗通过时钟停顿"""
+    clock = VirtualClock()
+    battle = _battle(_AsyncScriptedDungeonMaster(["a"]), clock=clock, battle_delay=1)
+    result = asyncio.run(battle.fight_until_end_async())
+    assert clock.sleeps >= result["total_rounds"] - 1
+
+
+def test_speed_argument_validation():
+    """测试命令行 --speed 拒绝负数，参数错误时退出而不是抛出异常"""
+    import main
+
+    parser = main.build_arg_parser()
+    assert parser.parse_args(["--speed", "0"]).speed == 0
+    assert parser.parse_args(["--speed", "2.5"]).speed == 2.5
+    for value in ("-1", "nan", "abc"):
+        try:
+            parser.parse_args(["--speed", value])
+            assert False, "无效的速度倍率应当报错"
+        except SystemExit:
+            pass
+
+
+if __name__ == "__main__":
+    test_clocks()
+    test_battle_uses_clock_and_delay()
+    test_auto_advance_battle()
+    test_async_battle_uses_clock()
+    test_speed_argument_validation()
@@ -0,0 +1,124 @@
+"""
+测试别名采样器与伤害概率表
+"""
+
+import sys
+import os
+import random
+from fractions import Fraction
+
+import numpy as np
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.alias_sampler import AliasSampler
+from src.battle import BattleSimulator
+from src.battle_kernel import VectorizedBattleSimulator
+from src.battle_rules import BattleRules
+from src.exact_solver import damage_pmf
+from src.player import FastPlayer, Player
+
+
+def test_alias_sampler_distribution():
+    """测试别名表精确表示给定分布，且采样频率与之吻合"""
+    print("=== 伤害概率表测试 ===")
+    weights = [Fraction(1, 2), Fraction(1, 3), Fraction(1, 12), Fraction(1, 12)]
+    sampler = AliasSampler(weights, values="abcd")
+    for expected, actual in zip(weights, sampler.probabilities()):
+        assert abs(float(expected) - actual) < 1e-12
+
+    rng = random.Random(0)
+    counts = {value: 0 for value in "abcd"}
+    for _ in range(60000):
+        counts[sampler.sample(rng.random)] += 1
+    assert abs(counts["a"] / 60000 - 0.5) < 0.01
+    assert abs(counts["b"] / 60000 - 1 / 3) < 0.01
+
+    indices = sampler.sample_indices(np.random.default_rng(0), 60000)
+    frequencies = np.bincount(indices, minlength=4) / 60000
+    assert np.allclose(frequencies, [float(w) for w in weights], atol=0.01)
+
+    assert AliasSampler([3.0]).sample(rng.random) == 0
+    for bad in ([], [-1, 2], [0, 0]):
+        try:
+            AliasSampler(bad)
+            assert False, f"应当拒绝权重 {bad}"
+        except ValueError:
+            pass
+
+
+def test_damage_table_matches_exact_pmf():
+    """测试伤害表与精确伤害分布一致，并按攻防组合缓存"""
+    rules = BattleRules()
+    table = rules.damage_table(25, 8)
+    assert rules.damage_table(25, 8) is table
+    assert table.actual_damage_pmf() == damage_pmf(25, 8)
+    assert sum(table.probabilities) == 1
+    assert rules.damage_table(40, 4).actual_damage_pmf() == damage_pmf(40, 4)
+
+    # 低攻击对高防御：全部结果都被压到1点
+    assert rules.damage_table(5, 50).actual_damage_pmf() == {1: Fraction(1)}
+    # 规则变化得到新的表
+    assert rules.replace(critical_hit_chance=0.0).damage_table(25, 8) is not table
+
+
+def test_players_sample_from_table():
+    """测试角色启用伤害表后的伤害分布与逐次掷骰一致"""
+    for player_class in (Player, FastPlayer):
+        attacker = player_class("测试·刺客", "刺客", 70, 40, 4, rng=random.Random(1), damage_tables=True)
+        target = player_class("靶子", "盾卫", 10**9, 20, 12)
+        pmf = damage_pmf(40, 12)
+        counts = {}
+        for _ in range(40000):
+            base_damage, actual_damage, is_critical = attacker.strike(target)
+            assert actual_damage == max(1, base_damage - 12)
+            counts[actual_damage] = counts.get(actual_damage, 0) + 1
+        assert set(counts) <= set(pmf)
+        for actual, probability in pmf.items():
+            assert abs(counts.get(actual, 0) / 40000 - float(probability)) < 0.01
+        assert target.current_health == 10**9 - sum(k * v for k, v in counts.items())
+
+
+
+def test_player_sampler_cache_follows_stats():
+    """测试角色缓存的别名桶在攻击力、目标防御力或规则变化后随之更新"""
+    for player_class in (Player, FastPlayer):
+        attacker = player_class("测试·刺客", "刺客", 70, 40, 4, rng=random.Random(1), damage_tables=True)
+        target = player_class("靶子", "盾卫", 10**9, 20, 12)
+        for attack, defense, rules in (
+            (40, 12, attacker.rules),
+            (60, 12, attacker.rules),
+            (60, 30, attacker.rules),
+            (60, 30, BattleRules(critical_hit_chance=0.0)),
+        ):
+            attacker.attack = attack
+            target.defense = defense
+            attacker.rules = rules
+            outcomes = set(rules.damage_table(attack, defense).outcomes)
+            for _ in range(500):
+                assert attacker.strike(target) in outcomes
+        assert all(not is_critical for _, _, is_critical in outcomes)
+
+def test_simulators_with_tables():
+    """测试批量模拟器启用伤害表后的胜率与默认路径一致"""
+    player1 = {"class": "剑士", "health": 100, "attack": 25, "defense": 8}
+    player2 = {"class": "刺客", "health": 70, "attack": 40, "defense": 4}
+    rolled = VectorizedBattleSimulator(player1, player2).run(50000, rng=np.random.default_rng(0))
+    tabled = VectorizedBattleSimulator(player1, player2, damage_tables=True).run(
+        50000, rng=np.random.default_rng(0)
+    )
+    scalar = BattleSimulator(player1, player2, damage_tables=True).run(5000, rng=random.Random(0))
+    rate = rolled.player1_wins / rolled.battles
+    assert abs(tabled.player1_wins / tabled.battles - rate) < 0.015
+    assert abs(scalar.player1_wins / scalar.battles - rate) < 0.03
+    assert abs(tabled.mean_rounds() - rolled.mean_rounds()) < 0.1
+    print("✅ 伤害概率表测试通过")
+
+
+if __name__ == "__main__":
+    test_alias_sampler_distribution()
+    test_damage_table_matches_exact_pmf()
+    test_players_sample_from_table()
+    test_player_sampler_cache_follows_stats()
+    test_simulators_with_tables()
@@ -0,0 +1,74 @@
+"""
+测试精确胜率求解器
+"""
+
+import sys
+import os
+import math
+from fractions import Fraction
+
+import numpy as np
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.battle_kernel import VectorizedBattleSimulator
+from src.exact_solver import base_damage_pmf, damage_pmf, solve_battle
+
+SWORDSMAN = {"class": "剑士", "health": 100, "attack": 25, "defense": 8}
+ASSASSIN = {"class": "刺客", "health": 70, "attack": 40, "defense": 4}
+GUARDIAN = {"class": "盾卫", "health": 120, "attack": 20, "defense": 12}
+
+
+def test_damage_pmf():
+    """测试伤害分布的精确性"""
+    # 25 * U(0.8, 1.2) 落在 [20, 30)，每个整数区间宽度相同
+    base = base_damage_pmf(25)
+    assert base == {k: Fraction(1, 10) for k in range(20, 30)}
+
+    pmf = damage_pmf(25, 12)
+    assert sum(pmf.values()) == 1
+    # 非暴击: 8..17，暴击: int(k*1.5)-12
+    assert min(pmf) == 8 and max(pmf) == int(29 * 1.5) - 12
+    # 防御极高时每次至少造成1点伤害
+    assert damage_pmf(10, 100) == {1: Fraction(1)}
+
+
+def test_solver_matches_monte_carlo():
+    """测试精确解与向量化蒙特卡洛结果一致"""
+    print("=== 精确求解器测试 ===")
+    for player1, player2 in ((SWORDSMAN, ASSASSIN), (GUARDIAN, SWORDSMAN)):
+        exact = solve_battle(player1, player2)
+        total = exact["player1_win"] + exact["player2_win"] + exact["timeout"]
+        assert abs(total - 1) < 1e-9
+        assert abs(sum(exact["round_distribution"]) - 1) < 1e-9
+
+        battles = 200000
+        sampled = VectorizedBattleSimulator(player1, player2).run(
+            battles, rng=np.random.default_rng(5)
+        )
+        p = exact["player1_win"]
+        rate = sampled.player1_wins / battles
+        print(f"   {player1['class']} 胜率: 精确 {p:.4f} | 模拟 {rate:.4f}")
+        assert abs(rate - p) <= 5 * math.sqrt(p * (1 - p) / battles)
+        assert abs(sampled.mean_rounds() - exact["mean_rounds"]) < 0.05
+    print("✅ 精确求解器测试通过")
+
+
+def test_solver_edge_cases():
+    """测试一击必杀与超时的边界情况"""
+    weak = {"health": 1, "attack": 10, "defense": 0}
+    result = solve_battle(weak, weak)
+    assert abs(result["player1_win"] - 0.5) < 1e-12
+    assert abs(result["round_distribution"][1] - 1) < 1e-12
+
+    tank = {"health": 1000, "attack": 5, "defense": 50}
+    result = solve_battle(tank, tank, max_rounds=3)
+    assert result["timeout"] == 1.0
+    assert result["mean_rounds"] == 3
+
+
+if __name__ == "__main__":
+    test_damage_pmf()
+    test_solver_matches_monte_carlo()
+    test_solver_edge_cases()
@@ -0,0 +1,58 @@
+"""
+测试轻量角色类 FastPlayer 与 Player 的行为一致性
+"""
+
+import sys
+import os
+import random
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.battle import Battle
+from src.player import FastPlayer, Player, get_health_bar
+
+
+def _fight(player_class, seed):
+    player1 = player_class("测试·剑士", "剑士", 100, 25, 8)
+    player2 = player_class("测试·刺客", "刺客", 70, 40, 4)
+    player1.pre_name = "【玩家】"
+    battle = Battle(player1, player2, rng=random.Random(seed))
+    while not battle.battle_ended:
+        battle.execute_round()
+    return battle.battle_log.to_list(), battle.get_battle_summary(), str(player1), str(player2)
+
+
+def test_fast_player_matches_player():
+    """测试相同随机种子下两种角色类的战斗过程完全一致"""
+    print("=== FastPlayer 一致性测试 ===")
+    for seed in range(10):
+        assert _fight(Player, seed) == _fight(FastPlayer, seed)
+
+    player = Player("测试·剑士", "剑士", 100, 25, 8, rng=random.Random(1))
+    fast = FastPlayer("测试·剑士", "剑士", 100, 25, 8, rng=random.Random(1))
+    target = Player("靶子", "盾卫", 1000, 20, 12)
+    fast_target = FastPlayer("靶子", "盾卫", 1000, 20, 12)
+    assert player.attack_target(target) == fast.attack_target(fast_target)
+    print("✅ FastPlayer 一致性测试通过")
+
+
+def test_cached_names_and_health_bar():
+    """测试缓存的显示名称与血条"""
+    fast = FastPlayer("阿尔·勇者", "剑士", 100, 25, 8)
+    assert fast.display_name == " 勇者"
+    fast.pre_name = "【玩家】"
+    assert fast.display_name == "【玩家】 勇者"
+    assert fast.get_full_name() == "【玩家】 阿尔·勇者 [剑士]"
+    assert not hasattr(fast, "__dict__")
+
+    assert get_health_bar(5, 10) == "█████░░░░░"
+    assert get_health_bar(5, 10) is get_health_bar(5, 10)
+    fast.current_health = 50
+    assert "██████████░░░░░░░░░░ 50/100" in str(fast)
+    assert "█████░░░░░" in fast.format_status(10)
+
+
+if __name__ == "__main__":
+    test_fast_player_matches_player()
+    test_cached_names_and_health_bar()
@@ -0,0 +1,166 @@
+"""
+测试数组存储的背包与物品目录
+"""
+
+import sys
+import os
+import gc
+import random
+import weakref
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.inventory import Inventory, ItemCatalog
+from src.player import Player
+
+
+def _catalog():
+    catalog = ItemCatalog()
+    catalog.register("金币", "普通", 0)
+    catalog.register("铁剑", "普通", 0, {"attack": 3})
+    catalog.register("塔盾", "稀有", 2, {"defense": 4, "health": 10})
+    catalog.register("屠龙剑", "传说", 4, {"attack": 12})
+    return catalog
+
+
+def test_add_remove_and_indexes():
+    """测试放入、取出、槽位填补与稀有度索引"""
+    print("=== 背包测试 ===")
+    inventory = Inventory(_catalog())
+    inventory.add_many([("金币", 50), ("铁剑", 2), ("塔盾", 1), ("屠龙剑", 1)])
+    assert inventory.add("金币", 25) == 75
+    assert len(inventory) == 4 and inventory.total_count == 79
+    assert inventory.items_by_rarity("普通") == [("金币", 75), ("铁剑", 2)]
+
+    # 取出第一个槽位的全部物品，最后一个槽位移到空位
+    assert inventory.remove("金币", 75) == 0
+    assert "金币" not in inventory and inventory.count("屠龙剑") == 1
+    assert list(inventory) == [("屠龙剑", 1), ("铁剑", 2), ("塔盾", 1)]
+    assert inventory.slot_of == {3: 0, 1: 1, 2: 2}
+    assert inventory.items_by_rarity(4) == [("屠龙剑", 1)]
+
+    try:
+        inventory.remove("铁剑", 3)
+        assert False, "数量不足应当报错"
+    except ValueError:
+        pass
+    # 批量取出在数量不足时不修改背包
+    try:
+        inventory.remove_many([("铁剑", 1), ("塔盾", 2)])
+        assert False, "数量不足应当报错"
+    except ValueError:
+        pass
+    assert inventory.count("铁剑") == 2 and inventory.count("塔盾") == 1
+    inventory.remove_many([("铁剑", 1), ("铁剑", 1)])
+    assert inventory.to_dict() == {"items": {"屠龙剑": 1, "塔盾": 1}, "equipped": []}
+
+    # 只有放入物品会注册新名称，查询和失败的操作不会让目录增长
+    size = len(inventory.catalog)
+    for operation in (inventory.remove, inventory.equip, inventory.unequip):
+        try:
+            operation("不存在的物品")
+            assert False, "未知物品应当报错"
+        except KeyError:
+            pass
+    try:
+        inventory.remove_many([("塔盾", 1), ("不存在的物品", 1)])
+        assert False, "未知物品应当报错"
+    except KeyError:
+        pass
+    assert len(inventory.catalog) == size and inventory.count("塔盾") == 1
+    assert inventory.count("不存在的物品") == 0 and "不存在的物品" not in inventory
+    inventory.add("新物品")
+    assert len(inventory.catalog) == size + 1
+
+
+def test_running_totals_match_recount():
+    """测试随机操作后累计值与完整重算一致"""
+    catalog = _catalog()
+    inventory = Inventory(catalog)
+    rng = random.Random(0)
+    names = catalog.names
+    for _ in range(5000):
+        name = rng.choice(names)
+        if rng.random() < 0.6 or inventory.count(name) == 0:
+            inventory.add(name, rng.randint(1, 5))
+        else:
+            inventory.remove(name, rng.randint(1, inventory.count(name)))
+        if rng.random() < 0.1 and name in inventory:
+            inventory.equip(name)
+
+    expected = {stat: 0 for stat in catalog.stats}
+    for name, count in inventory:
+        item_id = catalog.id_of[name]
+        for stat in expected:
+            expected[stat] += catalog.stats[stat][item_id] * count
+    assert inventory.total_bonus() == expected
+    assert inventory.total_count == sum(count for _, count in inventory)
+    equipped = {stat: 0 for stat in catalog.stats}
+    for item_id in inventory.equipped:
+        for stat in equipped:
+            equipped[stat] += catalog.stats[stat][item_id]
+    assert inventory.equipped_bonus() == equipped
+
+
+def test_player_equipment():
+    """测试角色装备加成与卸下"""
+    player = Player("测试·剑士", "剑士", 100, 25, 8)
+    player.inventory.add_drops(
+        [{"item": "屠龙剑", "rarity": "传说", "count": 1}, {"item": "塔盾", "rarity": "稀有", "count": 1}]
+    )
+    assert player.equip("屠龙剑") and not player.equip("屠龙剑")
+    player.equip("塔盾")
+    assert (player.attack, player.defense, player.max_health) == (37, 12, 110)
+    assert player.current_health == 110
+
+    # 取出已装备的物品会自动卸下
+    player.inventory.remove("塔盾")
+    assert (player.defense, player.max_health, player.current_health) == (8, 100, 100)
+    assert player.unequip("屠龙剑") and player.attack == 25
+    try:
+        player.equip("塔盾")
+        assert False, "装备背包中没有的物品应当报错"
+    except ValueError:
+        pass
+
+    # 背包只弱引用角色，角色不构成引用循环，无需垃圾回收即可释放
+    gc.disable()
+    try:
+        player = Player("测试·法师", "法师", 80, 35, 5)
+        player_ref = weakref.ref(player)
+        del player
+        assert player_ref() is None
+    finally:
+        gc.enable()
+    print("✅ 背包测试通过")
+
+
+def test_inventory_is_lazy_and_carried_over():
+    """测试背包按需创建，并可带着已装备物品交给新角色"""
+    enemy = Player("测试·敌人", "剑士", 100, 25, 8)
+    assert enemy._inventory is None
+    assert enemy.inventory is enemy.inventory and len(enemy.inventory) == 0
+
+    first = Player("测试·剑士", "剑士", 100, 25, 8)
+    first.inventory.add_drops([{"item": "屠龙剑", "rarity": "传说", "count": 1}])
+    first.equip("屠龙剑")
+    inventory = first.inventory
+
+    # 下一场战斗按预制数据重建角色，沿用背包后装备加成仍然有效
+    second = Player("测试·剑士", "剑士", 100, 25, 8, inventory=inventory)
+    assert second.attack == 37 and second.inventory is inventory
+    assert second.unequip("屠龙剑") and second.attack == 25
+    assert first.attack == 37
+
+    # 换背包时移除旧背包的加成
+    second.equip("屠龙剑")
+    second.inventory = Inventory(inventory.catalog)
+    assert second.attack == 25 and inventory.on_equipment_change is None
+
+
+if __name__ == "__main__":
+    test_add_remove_and_indexes()
+    test_running_totals_match_recount()
+    test_player_equipment()
+    test_inventory_is_lazy_and_carried_over()
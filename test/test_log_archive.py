@@ -0,0 +1,133 @@
+"""
+测试战斗日志的压缩、轮转、保留策略与流式读取
+"""
+
+import sys
+import os
+import tempfile
+import time
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.log_archive import (
+    apply_retention,
+    detect_compression,
+    find_log_segments,
+    iter_log_lines,
+    iter_log_segments,
+    segment_path,
+)
+from src.tool import Logger
+
+
+def test_compressed_round_trip():
+    """测试各压缩方式在后台与同步模式下都能完整读回"""
+    print("=== 日志归档测试 ===")
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for compression in ("gzip", "bz2", "lzma"):
+            for background in (True, False):
+                path = os.path.join(temp_dir, f"{compression}_{background}.log")
+                logger = Logger({"compression": compression, "background": background}, echo=False)
+                logger.init_logger(path)
+                for i in range(500):
+                    logger.log(f"第 {i} 回合 剑士 造成 {i % 37} 点伤害")
+                logger.close()
+                assert logger.log_path == segment_path(path, 0, compression)
+                assert detect_compression(logger.log_path) == compression
+                lines = list(iter_log_lines(logger.log_path))
+                assert lines == [f"第 {i} 回合 剑士 造成 {i % 37} 点伤害" for i in range(500)]
+
+        # gzip 持久模式每批同步压缩数据，关闭前即可读到已写出的部分
+        path = os.path.join(temp_dir, "durable.log")
+        logger = Logger({"compression": "gzip", "durable": True, "background": False}, echo=False)
+        logger.init_logger(path)
+        logger.log("已落盘")
+        assert list(iter_log_lines(logger.log_path)) == ["已落盘"]
+        logger.close()
+
+        try:
+            Logger({"compression": "zip"}, echo=False).init_logger(path)
+            assert False, "未知压缩方式应当报错"
+        except ValueError:
+            pass
+
+
+def test_rotation_segments():
+    """测试按大小轮转并按顺序读取全部分段"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "battle_x.log")
+        logger = Logger(
+            {"compression": "gzip", "rotate_max_chars": 100, "background": False},
+            echo=False,
+        )
+        logger.init_logger(path)
+        messages = [f"消息 {i:03d}" for i in range(60)]
+        for message in messages:
+            logger.log(message)
+        logger.close()
+
+        assert len(logger.segments) > 1
+        assert logger.segments[1] == os.path.join(temp_dir, "battle_x.1.log.gz")
+        assert find_log_segments(path) == logger.segments
+        assert find_log_segments(logger.segments[0]) == logger.segments
+        assert list(iter_log_segments(path)) == messages
+
+        # 其他日志不会被当作分段
+        open(os.path.join(temp_dir, "battle_x2.log"), "w").close()
+        assert find_log_segments(path) == logger.segments
+
+        # 按时间轮转
+        aged = os.path.join(temp_dir, "aged.log")
+        logger = Logger({"background": False, "rotate_max_age_seconds": 0.01}, echo=False)
+        logger.init_logger(aged)
+        logger.log("第一段")
+        time.sleep(0.02)
+        logger.log("第二段")
+        logger.close()
+        assert len(logger.segments) == 2
+        assert list(iter_log_segments(aged)) == ["第一段", "第二段"]
+
+
+def test_retention_policy():
+    """测试按时间、数量与总大小整组清理旧日志（日志分段与回放同组）"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        now = 1_000_000_000.0
+        groups = []
+        for i in range(6):
+            # 每场战斗: 两个日志分段与一个回放，共 100 字节；battle_0 最旧，相隔一天
+            names = [f"battle_{i}.log.gz", f"battle_{i}.1.log.gz", f"battle_{i}.replay.json"]
+            paths = [os.path.join(temp_dir, name) for name in names]
+            for path, size in zip(paths, (40, 40, 20)):
+                with open(path, "wb") as f:
+                    f.write(b"x" * size)
+                mtime = now - (6 - i) * 86400
+                os.utime(path, (mtime, mtime))
+            groups.append(paths)
+        # 第一段比后面的分段更旧，也不会被单独删除
+        os.utime(groups[2][0], (now - 30 * 86400, now - 30 * 86400))
+        other = os.path.join(temp_dir, "replay_0.log")
+        open(other, "w").close()
+        os.utime(other, (0, 0))
+
+        removed = apply_retention(temp_dir, max_age_days=5.5, now=now)
+        assert sorted(removed) == sorted(groups[0])
+
+        # 最旧的组被保护时跳过它（整组保留），删除次旧的组
+        removed = apply_retention(temp_dir, max_logs=3, keep=[groups[1][0]], now=now)
+        assert sorted(removed) == sorted(groups[2] + groups[3])
+        assert find_log_segments(groups[1][0]) == groups[1][:2]
+
+        removed = apply_retention(temp_dir, max_total_bytes=150, now=now)
+        assert sorted(removed) == sorted(groups[1] + groups[4])
+        assert sorted(os.listdir(temp_dir)) == sorted(
+            [os.path.basename(path) for path in groups[5]] + ["replay_0.log"]
+        )
+        assert apply_retention(temp_dir, max_logs=0, max_age_days=0, now=now) == []
+        assert apply_retention(temp_dir, "replay_*", max_age_days=1, now=now) == [other]
+    print("✅ 日志归档测试通过")
+
+if __name__ == "__main__":
+    test_compressed_round_trip()
+    test_rotation_segments()
+    test_retention_policy()
@@ -0,0 +1,95 @@
+"""
+测试日志记录器的后台批量写入
+"""
+
+import sys
+import os
+import tempfile
+import time
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.dungeon_master import DungeonMaster
+from src.log_archive import iter_log_lines
+from src.tool import Logger
+
+
+def _lines(path):
+    return list(iter_log_lines(path))
+
+
+def test_background_writer_order_and_flush():
+    """测试后台写入保持顺序，flush 为屏障，close 写出全部缓冲"""
+    print("=== 日志写入测试 ===")
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "battle.log")
+        logger = Logger({"flush_interval_seconds": 60, "flush_max_messages": 100}, echo=False)
+        logger.init_logger(path)
+        for i in range(250):
+            logger.log(f"消息 {i}")
+        logger.flush()
+        assert _lines(path) == [f"消息 {i}" for i in range(250)]
+
+        logger.log("最后一条")
+        logger.close()
+        logger.close()
+        assert _lines(path)[-1] == "最后一条" and len(_lines(path)) == 251
+        assert logger.log_file is None
+
+
+def test_interval_flush_and_modes():
+    """测试按时间间隔写出、持久模式与同步模式"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "interval.log")
+        logger = Logger({"flush_interval_seconds": 0.05}, echo=False)
+        logger.init_logger(path)
+        logger.log("第一回合")
+        deadline = time.monotonic() + 5
+        while not _lines(path) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert _lines(path) == ["第一回合"]
+
+        # 重新打开新文件前先写出并关闭旧文件
+        second = os.path.join(temp_dir, "second.log")
+        logger.log("旧文件")
+        logger.init_logger(second)
+        logger.log("新文件")
+        logger.close()
+        assert _lines(path) == ["第一回合", "旧文件"] and _lines(second) == ["新文件"]
+
+        # 持久模式下 log 返回时消息已经写入文件，不需要 flush
+        logger = Logger({"durable": True, "flush_interval_seconds": 60}, echo=False)
+        logger.init_logger(path)
+        for i in range(3):
+            logger.log(f"落盘 {i}")
+            assert _lines(path)[-1] == f"落盘 {i}"
+        logger.close()
+
+        for settings in ({"durable": True}, {"background": False}, {"background": False, "durable": True}):
+            logger = Logger(settings, echo=False)
+            logger.init_logger(path)
+            for i in range(20):
+                logger.log(str(i))
+            logger.flush()
+            assert _lines(path) == [str(i) for i in range(20)]
+            logger.close()
+
+
+def test_dungeon_master_close_logger():
+    """测试 DungeonMaster.close_logger 写出缓冲的日志"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "dm.log")
+        dungeon_master = DungeonMaster({"dungeon_dm": "DM"})
+        dungeon_master.init_logger(path)
+        dungeon_master.log_message("欢迎", with_dm=True)
+        dungeon_master.close_logger()
+        # 配置文件可能开启压缩，实际文件名以 log_path 为准
+        assert _lines(dungeon_master.logger.log_path) == ["DM:欢迎"]
+    print("✅ 日志写入测试通过")
+
+
+if __name__ == "__main__":
+    test_background_writer_order_and_flush()
+    test_interval_flush_and_modes()
+    test_dungeon_master_close_logger()
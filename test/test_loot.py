@@ -0,0 +1,164 @@
+"""
+测试战利品掉落表加载、编译与掉落
+"""
+
+import sys
+import os
+import json
+import random
+import tempfile
+from fractions import Fraction
+
+import numpy as np
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.battle import Battle
+from src.loot import LootGenerator, LootTableLoader
+from src.player import Player
+
+LOOT_DATA = {
+    "rarities": {"普通": {"rank": 0}, "稀有": {"rank": 2, "multiplier": 0.5}},
+    "tables": {
+        "root": {
+            "rolls": 3,
+            "entries": [
+                {"weight": 1},
+                {"item": "金币", "rarity": "普通", "weight": 2, "count": [1, 4]},
+                {"table": "weapons", "weight": 1},
+                {"item": "坏条目", "rarity": "未知", "weight": 1},
+            ],
+        },
+        "weapons": {
+            "entries": [
+                {"item": "铁剑", "rarity": "普通", "weight": 1, "tags": ["剑"]},
+                {"item": "魔杖", "rarity": "稀有", "weight": 2, "tags": ["法杖"]},
+            ]
+        },
+    },
+    "class_modifiers": {"法师": {"tags": {"法杖": 3}}},
+}
+
+
+def _generator(data, temp_dir):
+    path = os.path.join(temp_dir, "loot_tables.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+    return LootGenerator(LootTableLoader(path))
+
+
+def test_compile_flattens_nested_tables():
+    """测试嵌套子表、稀有度倍率和职业修正展开后的精确概率"""
+    print("=== 战利品掉落测试 ===")
+    with tempfile.TemporaryDirectory() as temp_dir:
+        generator = _generator(LOOT_DATA, temp_dir)
+        assert generator.loader.all_load_success
+        # 坏条目被跳过：空 1/4，金币 2/4，武器 1/4
+        compiled = generator.compile("root")
+        assert generator.compile("root") is compiled
+        probabilities = dict(zip(compiled.outcomes, compiled.probabilities))
+        assert probabilities[None] == Fraction(1, 4)
+        assert probabilities[("金币", "普通", 3)] == Fraction(1, 8)
+        # 魔杖权重 2 × 稀有度倍率 0.5 = 1，与铁剑各占武器的一半
+        assert probabilities[("铁剑", "普通", 1)] == Fraction(1, 8)
+        assert probabilities[("魔杖", "稀有", 1)] == Fraction(1, 8)
+        assert compiled.drop_rates()["金币"]["expected_count"] == 0.5 * 2.5
+
+        # 职业修正只改变子表内部的比例
+        mage_table = generator.compile("root", "法师")
+        mage = dict(zip(mage_table.outcomes, mage_table.probabilities))
+        assert mage[("魔杖", "稀有", 1)] == Fraction(3, 16)
+        assert mage[("铁剑", "普通", 1)] == Fraction(1, 16)
+
+        try:
+            generator.compile("不存在")
+            assert False, "未知掉落表应当报错"
+        except KeyError:
+            pass
+
+
+def test_roll_and_batch_rates():
+    """测试单次掉落合并结果，批量掷骰频率与精确概率一致"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        generator = _generator(LOOT_DATA, temp_dir)
+        drops = generator.roll("root", rng=random.Random(3), rolls=50)
+        assert drops[0]["rarity"] == "稀有"
+        assert len({drop["item"] for drop in drops}) == len(drops)
+        assert generator.roll("root", rng=random.Random(3)) == generator.roll(
+            "root", rng=random.Random(3)
+        )
+
+        result = generator.roll_batch("root", 400000, "法师", np.random.default_rng(0))
+        rates = generator.compile("root", "法师").drop_rates()
+        assert result["empty"] + sum(result["drops"].values()) == 400000
+        for item, rate in rates.items():
+            assert abs(result["drops"][item] / 400000 - rate["probability"]) < 0.005
+            assert abs(result["counts"][item] / 400000 - rate["expected_count"]) < 0.01
+
+
+def test_invalid_data():
+    """测试循环引用与缺失文件"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cyclic = {
+            "rarities": {"普通": {}},
+            "tables": {
+                "a": {"entries": [{"table": "b", "weight": 1}]},
+                "b": {"entries": [{"table": "a", "weight": 1}]},
+            },
+        }
+        generator = _generator(cyclic, temp_dir)
+        assert not generator.loader.all_load_success
+        assert generator.loader.get_table_names() == []
+        missing = LootTableLoader(os.path.join(temp_dir, "不存在.json"))
+        assert not missing.all_load_success
+
+
+
+def test_non_positive_multipliers():
+    """测试非正数的稀有度与职业修正倍率在加载时被跳过，总权重为0的表视为不掉落"""
+    data = json.loads(json.dumps(LOOT_DATA))
+    data["rarities"]["史诗"] = {"rank": 3, "multiplier": 0}
+    data["tables"]["weapons"]["entries"].append(
+        {"item": "神器", "rarity": "史诗", "weight": 5, "tags": ["剑"]}
+    )
+    data["class_modifiers"] = {
+        "法师": {"tags": {"法杖": 0, "剑": -1}, "rarities": {"稀有": 3, "普通": "x"}}
+    }
+    with tempfile.TemporaryDirectory() as temp_dir:
+        generator = _generator(data, temp_dir)
+        assert generator.loader.all_load_success
+        assert len(generator.loader.get_table("weapons")["entries"]) == 2
+        mage_table = generator.compile("root", "法师")
+        mage = dict(zip(mage_table.outcomes, mage_table.probabilities))
+        assert all(probability > 0 for probability in mage.values())
+        assert sum(mage.values()) == 1
+        # 只有稀有度修正 ×3 生效：魔杖 3 : 铁剑 1
+        assert mage[("魔杖", "稀有", 1)] == Fraction(3, 16)
+
+        generator.loader.entry_weight = lambda entry, character_class=None: Fraction(0)
+        empty = generator.compile("weapons", "剑士")
+        assert empty.outcomes == [None] and empty.probabilities == [Fraction(1)]
+
+def test_battle_loot():
+    """测试默认掉落表的战斗结算"""
+    generator = LootGenerator()
+    player1 = Player("甲", "刺客", 70, 40, 4)
+    player2 = Player("乙", "剑士", 100, 25, 8)
+    battle = Battle(player1, player2, rng=random.Random(0))
+    while not battle.battle_ended and battle.round_number < battle.rules.max_rounds:
+        battle.execute_round()
+    result = battle._generate_battle_result(battle.rules.max_rounds)
+    for seed in range(20):
+        for drop in generator.roll_battle_loot(result, "刺客", random.Random(seed)):
+            assert drop["count"] >= 1 and drop["rarity"]
+    assert generator.compile("battle_victory", "刺客").rolls == 2
+    print("✅ 战利品掉落测试通过")
+
+
+if __name__ == "__main__":
+    test_compile_flattens_nested_tables()
+    test_roll_and_batch_rates()
+    test_invalid_data()
+    test_non_positive_multipliers()
+    test_battle_loot()
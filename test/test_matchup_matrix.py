@@ -0,0 +1,78 @@
+"""
+测试职业对战矩阵及其磁盘缓存
+"""
+
+import sys
+import os
+import json
+import tempfile
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.character_generator import CharacterDataLoader
+from src.config_manager import GameConfig
+from src.matchup_matrix import MatchupMatrix
+
+PRESETS = [
+    {"class": "剑士", "health": 100, "attack": 25, "defense": 8},
+    {"class": "刺客", "health": 70, "attack": 40, "defense": 4},
+]
+
+
+def _write_presets(directory, presets):
+    path = os.path.join(directory, "character_data.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"character_presets": presets}, f, ensure_ascii=False)
+    return CharacterDataLoader(path)
+
+
+def test_matrix_cache_roundtrip():
+    """测试对战矩阵结果可从缓存读取且与重新计算一致"""
+    print("=== 对战矩阵缓存测试 ===")
+    with tempfile.TemporaryDirectory() as temp_dir:
+        loader = _write_presets(temp_dir, PRESETS)
+        config = GameConfig()
+        cache_dir = os.path.join(temp_dir, "cache")
+
+        first = MatchupMatrix(loader, config, battles=5000, cache_dir=cache_dir)
+        results = first.compute()
+        assert len(results) == 4
+        assert (first.cache_hits, first.cache_misses) == (0, 4)
+
+        second = MatchupMatrix(loader, config, battles=5000, cache_dir=cache_dir)
+        cached = second.compute()
+        assert (second.cache_hits, second.cache_misses) == (4, 0)
+        for pair, stats in results.items():
+            assert cached[pair].to_dict() == stats.to_dict()
+
+        print(MatchupMatrix.format_table(cached, ["剑士", "刺客"]))
+        print("✅ 对战矩阵缓存测试通过")
+
+
+def test_matrix_cache_invalidation():
+    """测试角色属性或战斗配置变化后只重新计算受影响的对局"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        config = GameConfig()
+        cache_dir = os.path.join(temp_dir, "cache")
+        loader = _write_presets(temp_dir, PRESETS)
+        baseline = MatchupMatrix(loader, config, battles=2000, cache_dir=cache_dir).compute()
+
+        changed = [PRESETS[0], dict(PRESETS[1], attack=30)]
+        loader = _write_presets(temp_dir, changed)
+        matrix = MatchupMatrix(loader, config, battles=2000, cache_dir=cache_dir)
+        results = matrix.compute()
+        # 只有 剑士 VS 剑士 未受影响
+        assert (matrix.cache_hits, matrix.cache_misses) == (1, 3)
+        assert results[("剑士", "剑士")].to_dict() == baseline[("剑士", "剑士")].to_dict()
+
+        config.set_config_value("battle", "max_rounds", 3)
+        matrix = MatchupMatrix(loader, config, battles=2000, cache_dir=cache_dir)
+        results = matrix.compute()
+        assert matrix.cache_hits == 0
+        assert results[("剑士", "剑士")].max_rounds == 3
+
+
+if __name__ == "__main__":
+    test_matrix_cache_roundtrip()
+    test_matrix_cache_invalidation()
@@ -0,0 +1,62 @@
+"""
+测试多进程对局运行器的确定性
+"""
+
+import sys
+import os
+import random
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.parallel_runner import TournamentRunner, derive_seed
+
+SWORDSMAN = {"class": "剑士", "health": 100, "attack": 25, "defense": 8}
+ASSASSIN = {"class": "刺客", "health": 70, "attack": 40, "defense": 4}
+MAGE = {"class": "法师", "health": 80, "attack": 35, "defense": 5}
+MATCHUPS = [(SWORDSMAN, ASSASSIN), (ASSASSIN, MAGE), (MAGE, SWORDSMAN)]
+
+
+def _snapshot(results):
+    return [(r.to_dict(), r.round_histogram) for r in results]
+
+
+def test_derive_seed():
+    """测试子种子派生的确定性与独立性"""
+    assert derive_seed(1, 0, 0) == derive_seed(1, 0, 0)
+    assert derive_seed(1, 0, 1) != derive_seed(1, 1, 0)
+    assert derive_seed(1, 0, 0) != derive_seed(2, 0, 0)
+
+
+def test_result_independent_of_worker_count():
+    """测试结果与进程数量无关"""
+    print("=== 多进程运行器确定性测试 ===")
+    single = TournamentRunner(workers=1, chunk_size=3000).run(MATCHUPS, 10000, seed=9)
+    pooled = TournamentRunner(workers=2, chunk_size=3000).run(MATCHUPS, 10000, seed=9)
+    assert _snapshot(single) == _snapshot(pooled)
+    assert all(r.battles == 10000 for r in pooled)
+    print(f"   剑士 VS 刺客: {pooled[0].to_dict()['player1_win_rate']:.3f}")
+
+    other_seed = TournamentRunner(workers=1, chunk_size=3000).run(MATCHUPS, 10000, seed=10)
+    assert _snapshot(single) != _snapshot(other_seed)
+    print("✅ 多进程运行器确定性测试通过")
+
+
+def test_scalar_engine_deterministic():
+    """测试逐回合引擎同样可复现且不影响全局随机状态"""
+    random.seed(123)
+    state = random.getstate()
+    first = TournamentRunner(workers=1, chunk_size=200, engine="scalar").run(
+        MATCHUPS[:1], 500, seed=4
+    )
+    assert random.getstate() == state
+    second = TournamentRunner(workers=2, chunk_size=200, engine="scalar").run(
+        MATCHUPS[:1], 500, seed=4
+    )
+    assert _snapshot(first) == _snapshot(second)
+
+
+if __name__ == "__main__":
+    test_derive_seed()
+    test_result_independent_of_worker_count()
+    test_scalar_engine_deterministic()
@@ -0,0 +1,94 @@
+"""
+测试战斗配置参数扫描与结果缓存
+"""
+
+import sys
+import os
+import csv
+import tempfile
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.param_sweep import ParameterSweep, parse_grid_spec
+from src.parallel_runner import TournamentRunner
+
+CLASSES = ["剑士", "刺客", "盾卫"]
+
+
+def test_parse_grid_spec():
+    """测试网格定义解析"""
+    print("=== 参数扫描测试 ===")
+    assert parse_grid_spec("critical_hit_chance=0.05:0.25:0.05") == (
+        "critical_hit_chance",
+        [0.05, 0.1, 0.15, 0.2, 0.25],
+    )
+    assert parse_grid_spec("max_rounds=20,50") == ("max_rounds", [20, 50])
+    for spec in ("unknown=1,2", "critical_hit_chance", "critical_hit_chance=0:1:0"):
+        try:
+            parse_grid_spec(spec)
+            assert False, f"应当拒绝 {spec}"
+        except ValueError:
+            pass
+
+
+def test_matchup_rules_per_task():
+    """测试运行器按对局使用各自的规则和最大回合数"""
+    runner = TournamentRunner(workers=1, engine="scalar")
+    player = {"class": "盾卫", "health": 500, "attack": 20, "defense": 12}
+    base = runner.rules
+    results = runner.run(
+        [(player, player), (player, player)],
+        200,
+        matchup_rules=[base.replace(max_rounds=3), base.replace(max_rounds=200)],
+    )
+    assert results[0].max_rounds == 3 and results[0].timeouts == 200
+    assert results[1].max_rounds == 200 and results[1].timeouts == 0
+
+
+def test_sweep_cache_and_resume():
+    """测试扫描结果缓存、续跑以及无效网格点"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        options = dict(classes=CLASSES, battles=500, cache_dir=temp_dir, points_per_batch=2)
+        first = ParameterSweep({"critical_hit_chance": [0.05, 0.25]}, **options)
+        first_rows = first.run()
+        assert len(first_rows) == 2 * 3 and first.cache_misses == 6
+
+        # 网格扩大后，已计算的网格点全部命中缓存
+        second = ParameterSweep(
+            {"critical_hit_chance": [0.05, 0.15, 0.25], "damage_variance_min": [0.8, 1.5]},
+            **options,
+        )
+        rows = second.run()
+        assert second.invalid_points == [
+            {"critical_hit_chance": value, "damage_variance_min": 1.5}
+            for value in (0.05, 0.15, 0.25)
+        ]
+        assert second.cache_hits == 6 and second.cache_misses == 3
+        cached_rows = [row for row in rows if row["critical_hit_chance"] != 0.15]
+        for row, expected in zip(cached_rows, first_rows):
+            assert row["player1_win_rate"] == expected["player1_win_rate"]
+
+        # 批次划分不影响结果
+        fresh = ParameterSweep(
+            {"critical_hit_chance": [0.05, 0.25]},
+            classes=CLASSES,
+            battles=500,
+            use_cache=False,
+            points_per_batch=1,
+        )
+        assert fresh.run() == first_rows
+
+        path = os.path.join(temp_dir, "sweep.csv")
+        second.write_csv(rows, path)
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            table = list(csv.DictReader(f))
+        assert len(table) == 9 and table[0]["player1"] == "剑士"
+        assert list(table[0]) == second.columns()
+    print("✅ 参数扫描测试通过")
+
+
+if __name__ == "__main__":
+    test_parse_grid_spec()
+    test_matchup_rules_per_task()
+    test_sweep_cache_and_resume()
@@ -0,0 +1,123 @@
+"""
+测试 Elo / Glicko 等级分引擎
+"""
+
+import sys
+import os
+import random
+import tempfile
+
+import numpy as np
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.battle import Battle, BattleSimulator
+from src.player import Player
+from src.rating import EloRatings, GlickoRatings
+
+
+def test_elo_single_update():
+    """测试单场 Elo 更新与逐场增量结果"""
+    print("=== 等级分测试 ===")
+    elo = EloRatings(k_factor=32, batch_size=1)
+    elo.add_match("剑士", "刺客", 1.0)
+    assert abs(elo.rating("剑士") - 1516) < 1e-9
+    assert abs(elo.rating("刺客") - 1484) < 1e-9
+
+    # batch_size=1 时与逐场计算的 Elo 完全一致
+    rng = random.Random(0)
+    ratings = {"a": 1500.0, "b": 1500.0, "c": 1500.0}
+    for _ in range(200):
+        first, second = rng.sample(sorted(ratings), 2)
+        score = rng.choice((0.0, 0.5, 1.0))
+        expected = 1 / (1 + 10 ** ((ratings[second] - ratings[first]) / 400))
+        ratings[first] += 32 * (score - expected)
+        ratings[second] -= 32 * (score - expected)
+        elo.add_match(first, second, score)
+    for key, value in ratings.items():
+        assert abs(elo.rating(key) - value) < 1e-6
+    print("✅ Elo 测试通过")
+
+
+def test_batch_ratings_recover_skill():
+    """测试批量评分周期能恢复真实实力排序，Elo 总分守恒"""
+    rng = np.random.default_rng(1)
+    skill = np.linspace(-400, 400, 50)
+    first = rng.integers(0, 50, 200000)
+    second = (first + rng.integers(1, 50, first.size)) % 50
+    win_probability = 1 / (1 + 10 ** ((skill[second] - skill[first]) / 400))
+    scores = (rng.random(first.size) < win_probability).astype(float)
+
+    for engine in (EloRatings(k_factor=16, batch_size=256), GlickoRatings(batch_size=4096)):
+        for index in range(50):
+            engine.player_index(f"p{index}")
+        engine.add_matches(first, second, scores)
+        ratings = engine.ratings[:50]
+        assert np.corrcoef(ratings, skill)[0, 1] > 0.98
+        assert engine.games[:50].sum() == 2 * first.size
+        assert engine.standings(1)[0]["key"] == "p49"
+        if isinstance(engine, EloRatings):
+            assert abs(ratings.mean() - 1500) < 1e-6
+        else:
+            assert engine.rd[:50].max() < 100
+
+
+def test_skewed_pair_converges_with_defaults():
+    """测试默认的大评分周期下，胜率 60% 的一方排名更高且等级分有限（不过冲、不反号）"""
+    rng = np.random.default_rng(3)
+    scores = (rng.random(200000) < 0.6).astype(float)
+    # 胜率 60% 对应的等级分差
+    expected_gap = 400 * np.log10(0.6 / 0.4)
+    for engine in (EloRatings(), GlickoRatings(), GlickoRatings(min_rd=1e-6)):
+        engine.player_index("强")
+        engine.player_index("弱")
+        with np.errstate(all="raise"):
+            engine.add_matches(np.zeros(scores.size, int), np.ones(scores.size, int), scores)
+        ratings = engine.ratings[:2]
+        assert np.isfinite(ratings).all()
+        assert engine.standings(1)[0]["key"] == "强"
+        assert abs(ratings[0] - ratings[1] - expected_gap) < 25
+
+
+def test_stream_sources_and_checkpoint():
+    """测试消费 Battle 结果、批量统计，并保存/恢复检查点"""
+    glicko = GlickoRatings(batch_size=8)
+    for seed in range(20):
+        player1 = Player("甲", "剑士", 100, 25, 8)
+        player2 = Player("乙", "刺客", 70, 40, 4)
+        battle = Battle(player1, player2, rng=random.Random(seed))
+        while not battle.battle_ended and battle.round_number < battle.rules.max_rounds:
+            battle.execute_round()
+        glicko.add_battle_result("甲", "乙", battle._generate_battle_result(battle.rules.max_rounds))
+    stats = BattleSimulator(
+        {"class": "盾卫", "health": 120, "attack": 20, "defense": 12},
+        {"class": "法师", "health": 80, "attack": 35, "defense": 5},
+    ).run(500, rng=random.Random(2))
+    glicko.add_outcome_stats("盾卫", "法师", stats)
+    assert glicko.consume([("甲", "盾卫", 1.0), ("乙", "法师", 0.5)]) == 2
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "ratings.npz")
+        glicko.save(path)
+        restored = GlickoRatings.load(path)
+        assert restored.keys == glicko.keys and restored.periods == glicko.periods
+        assert restored.standings() == glicko.standings()
+        assert int(restored.games[restored.index_of["盾卫"]]) == 501
+        # 没有 .npz 后缀的路径在保存和加载时一致
+        bare = os.path.join(temp_dir, "ratings_checkpoint")
+        glicko.save(bare)
+        assert GlickoRatings.load(bare).standings() == glicko.standings()
+        try:
+            EloRatings.load(path)
+            assert False, "类型不符的检查点应当报错"
+        except ValueError:
+            pass
+    print("✅ 等级分检查点测试通过")
+
+
+if __name__ == "__main__":
+    test_elo_single_update()
+    test_batch_ratings_recover_skill()
+    test_skewed_pair_converges_with_defaults()
+    test_stream_sources_and_checkpoint()
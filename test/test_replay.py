@@ -0,0 +1,98 @@
+"""
+测试基于种子的战斗回放
+"""
+
+import sys
+import os
+import random
+import tempfile
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.battle import Battle
+from src.battle_rules import BattleRules
+from src.clock import VirtualClock
+from src.player import Player
+from src.replay import BattleReplay, BattleReplayer, ReplayDivergenceError
+
+
+class _SilentDungeonMaster:
+    """只收集消息的DM"""
+
+    def __init__(self):
+        self.messages = []
+
+    def log_message(self, message, with_dm=False):
+        self.messages.append(message)
+
+
+def _record(seed, rules=None):
+    player1 = Player("测试·剑士", "剑士", 100, 25, 8)
+    player1.pre_name = "【玩家】"
+    player2 = Player("测试·刺客", "刺客", 70, 40, 4)
+    battle = Battle(player1, player2, rng=random.Random(seed), rules=rules)
+    while not battle.battle_ended and battle.round_number < battle.rules.max_rounds:
+        battle.execute_round()
+    return battle, BattleReplay.from_battle(battle, seed)
+
+
+def test_replay_regenerates_battle():
+    """测试回放重新生成的战斗与原战斗完全一致"""
+    print("=== 战斗回放测试 ===")
+    for seed in range(20):
+        battle, replay = _record(seed)
+        replayed = BattleReplayer(replay).run()
+        assert replayed.battle_log.to_list() == battle.battle_log.to_list()
+        assert replayed.get_battle_summary() == battle.get_battle_summary()
+        assert len(replay.round_hashes) == battle.round_number
+    print("✅ 战斗回放测试通过")
+
+
+def test_replay_file_roundtrip():
+    """测试回放文件读写，以及文件中不保存战斗日志"""
+    battle, replay = _record(7, BattleRules(critical_hit_chance=0.3))
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "battle.replay.json")
+        replay.save(path)
+        loaded = BattleReplay.load(path)
+        with open(path, encoding="utf-8") as f:
+            assert "actions" not in f.read()
+
+    assert loaded.to_dict() == replay.to_dict()
+    assert loaded.rules.critical_hit_chance == 0.3
+    assert BattleReplayer(loaded).verify()
+
+
+def test_replay_detects_divergence():
+    """测试属性或哈希被改动时能检测到分歧回合"""
+    _, replay = _record(3)
+    replay.round_hashes[1] = "f" * 16
+    try:
+        BattleReplayer(replay).run()
+        assert False, "应当检测到分歧"
+    except ReplayDivergenceError as e:
+        assert e.round_number == 2
+
+    _, replay = _record(3)
+    replay.player2["attack"] += 5
+    assert not BattleReplayer(replay).verify()
+
+
+def test_replay_play():
+    """测试按节奏显示回放"""
+    battle, replay = _record(11)
+    dungeon_master = _SilentDungeonMaster()
+    clock = VirtualClock()
+    result = BattleReplayer(replay).play(dungeon_master, delay=0.5, clock=clock)
+    assert result["total_rounds"] == battle.round_number
+    assert clock.sleeps == battle.round_number - 1
+    assert clock.now() == 0.5 * (battle.round_number - 1)
+    assert any("回放" in message for message in dungeon_master.messages)
+
+
+if __name__ == "__main__":
+    test_replay_regenerates_battle()
+    test_replay_file_roundtrip()
+    test_replay_detects_divergence()
+    test_replay_play()
@@ -0,0 +1,46 @@
+"""
+测试对战矩阵与参数扫描共用的结果缓存
+"""
+
+import sys
+import os
+import random
+import tempfile
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.battle import BattleSimulator
+from src.battle_rules import BattleRules
+from src.result_cache import ResultCache
+
+SWORDSMAN = {"class": "剑士", "health": 100, "attack": 25, "defense": 8}
+ASSASSIN = {"class": "刺客", "health": 70, "attack": 40, "defense": 4}
+
+
+def test_key_store_and_load():
+    """测试缓存键随内容变化、原子写入与损坏文件的处理"""
+    print("=== 结果缓存测试 ===")
+    rules = BattleRules()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache = ResultCache(os.path.join(temp_dir, "cache"), version=1, label="测试缓存")
+        key = cache.key(SWORDSMAN, ASSASSIN, rules, 100, 0, "scalar")
+        assert key == cache.key(dict(SWORDSMAN), dict(ASSASSIN), rules, 100, 0, "scalar")
+        assert key != cache.key(SWORDSMAN, ASSASSIN, rules.replace(max_rounds=10), 100, 0, "scalar")
+        assert key != ResultCache(temp_dir, version=2).key(SWORDSMAN, ASSASSIN, rules, 100, 0, "scalar")
+        assert 0 <= ResultCache.seed_for(key) < 2**64
+
+        assert cache.load(key) is None
+        stats = BattleSimulator(SWORDSMAN, ASSASSIN).run(100, rng=random.Random(1))
+        cache.store(key, stats)
+        assert cache.load(key).to_dict() == stats.to_dict()
+        assert os.listdir(cache.directory) == [f"{key}.json"]
+
+        with open(cache.path(key), "w", encoding="utf-8") as f:
+            f.write("{")
+        assert cache.load(key) is None
+    print("✅ 结果缓存测试通过")
+
+
+if __name__ == "__main__":
+    test_key_store_and_load()
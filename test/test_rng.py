@@ -0,0 +1,107 @@
+"""
+测试可注入的随机数流
+"""
+
+import sys
+import os
+import random
+import threading
+
+import numpy as np
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.battle import Battle, BattleSimulator
+from src.character_generator import CharacterDataLoader, CharacterNameGenerator
+from src.player import Player
+from src.rng import RandomStream, as_random_source
+
+SWORDSMAN = {"class": "剑士", "health": 100, "attack": 25, "defense": 8}
+ASSASSIN = {"class": "刺客", "health": 70, "attack": 40, "defense": 4}
+
+
+def _fight(rng):
+    battle = Battle(
+        Player("甲", "剑士", 100, 25, 8), Player("乙", "刺客", 70, 40, 4), rng=rng
+    )
+    while not battle.battle_ended and battle.round_number < 50:
+        battle.execute_round()
+    return [
+        (action["actual_damage"], action["is_critical"])
+        for round_log in battle.battle_log
+        for action in round_log["actions"]
+    ]
+
+
+def test_random_stream_sources():
+    """测试不同随机数来源的可复现性与基本方法"""
+    for make in (lambda: RandomStream(11), lambda: RandomStream(np.random.default_rng(11))):
+        first, second = make(), make()
+        assert [first.random() for _ in range(10000)] == [second.random() for _ in range(10000)]
+
+        stream = make()
+        values = [stream.uniform(0.8, 1.2) for _ in range(1000)]
+        assert all(0.8 <= v < 1.2 for v in values)
+        items = list(range(10))
+        stream.shuffle(items)
+        assert sorted(items) == list(range(10))
+        assert len(set(stream.sample(range(10), 5))) == 5
+        assert stream.choice("abc") in "abc"
+
+    assert as_random_source(None) is random
+    generator = random.Random(1)
+    assert as_random_source(generator) is generator
+
+
+def test_battle_rng_isolated_from_global_state():
+    """测试注入随机数源后战斗可复现且不触碰全局 random"""
+    print("=== 随机数流注入测试 ===")
+    random.seed(0)
+    state = random.getstate()
+    assert _fight(random.Random(5)) == _fight(random.Random(5))
+    assert _fight(np.random.default_rng(5)) == _fight(np.random.default_rng(5))
+    assert random.getstate() == state
+
+    stats = BattleSimulator(SWORDSMAN, ASSASSIN).run(200, rng=RandomStream(3))
+    again = BattleSimulator(SWORDSMAN, ASSASSIN).run(200, rng=RandomStream(3))
+    assert stats.to_dict() == again.to_dict()
+    assert random.getstate() == state
+    print("✅ 随机数流注入测试通过")
+
+
+def test_parallel_threads_reproducible():
+    """测试多个线程各自使用独立随机数源时结果可复现"""
+    results = {}
+
+    def worker(seed):
+        results[seed] = BattleSimulator(SWORDSMAN, ASSASSIN).run(300, rng=random.Random(seed)).to_dict()
+
+    threads = [threading.Thread(target=worker, args=(seed,)) for seed in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    for seed in range(4):
+        expected = BattleSimulator(SWORDSMAN, ASSASSIN).run(300, rng=random.Random(seed)).to_dict()
+        assert results[seed] == expected
+
+
+def test_generators_accept_rng():
+    """测试角色与名称生成器使用注入的随机数源"""
+    loader = CharacterDataLoader()
+    names = CharacterNameGenerator()
+    assert loader.get_random_character(rng=random.Random(2)) == loader.get_random_character(rng=random.Random(2))
+    assert names.get_random_name(rng=RandomStream(2)) == names.get_random_name(rng=RandomStream(2))
+    picked = names.get_random_names(3, rng=np.random.default_rng(2))
+    assert len(set(picked)) == len(picked)
+    first = names.get_all_names()[0]
+    assert all(names.get_random_name(first, rng=random.Random(i)) != first for i in range(20))
+
+
+if __name__ == "__main__":
+    test_random_stream_sources()
+    test_battle_rng_isolated_from_global_state()
+    test_parallel_threads_reproducible()
+    test_generators_accept_rng()
@@ -0,0 +1,96 @@
+"""
+测试 N vs M 团队战斗及其目标索引结构
+"""
+
+import sys
+import os
+import random
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.battle_log import EVENT_ACTUAL_DAMAGE, EVENT_ATTACKER, EVENT_TARGET
+from src.player import FastPlayer, Player
+from src.team_battle import (
+    TARGET_LOWEST_HEALTH,
+    AliveIndex,
+    LowestHealthHeap,
+    TeamBattle,
+)
+
+
+class _ScanTeamBattle(TeamBattle):
+    """每次行动扫描敌方队伍选择血量最低目标的参考实现"""
+
+    def _choose_target(self, team):
+        first = self.team_sizes[0]
+        indices = range(first) if team == 0 else range(first, len(self.combatants))
+        candidates = [i for i in indices if self.combatants[i].is_alive]
+        return min(candidates, key=lambda i: (self.combatants[i].current_health, i))
+
+
+def _team(prefix, size, seed):
+    rng = random.Random(seed)
+    return [
+        FastPlayer(f"{prefix}·{i}", "剑士", rng.randint(50, 120), rng.randint(15, 40), rng.randint(0, 10))
+        for i in range(size)
+    ]
+
+
+def test_alive_index():
+    """测试存活下标集合的交换删除"""
+    print("=== 团队战斗索引测试 ===")
+    alive = AliveIndex([10, 11, 12, 13])
+    alive.remove(11)
+    assert sorted(alive.members) == [10, 12, 13] and 11 not in alive
+    alive.remove(13)
+    alive.remove(10)
+    assert alive.members == [12] and len(alive) == 1
+    assert alive.random_choice(random.Random(0).random) == 12
+
+    players = [Player(f"测试·{i}", "剑士", 50 + i, 10, 0) for i in range(5)]
+    heap = LowestHealthHeap(players, range(5))
+    assert heap.peek() == 0
+    players[0].take_damage(100)
+    players[3].take_damage(40)
+    heap.update(0)
+    heap.update(3)
+    assert heap.peek() == 3
+    print("✅ 团队战斗索引测试通过")
+
+
+def test_lowest_health_matches_scan():
+    """测试血量堆选目标与逐个扫描的结果完全一致"""
+    results = []
+    for battle_class in (TeamBattle, _ScanTeamBattle):
+        battle = battle_class(
+            _team("A", 30, 1),
+            _team("B", 25, 2),
+            rng=random.Random(3),
+            targeting=TARGET_LOWEST_HEALTH,
+        )
+        outcome = battle.fight()
+        results.append((outcome["winning_team"], outcome["total_rounds"], battle.battle_log.events.tolist()))
+    assert results[0] == results[1]
+
+
+def test_team_battle_result():
+    """测试团队战斗的胜负、统计与日志"""
+    battle = TeamBattle(_team("A", 40, 4), _team("B", 10, 5), rng=random.Random(6))
+    result = battle.fight()
+    assert result["outcome"] == "victory" and result["winning_team"] == 0
+    assert result["survivors"][1] == 0 and result["survivors"][0] > 0
+
+    summary = battle.get_team_summary()
+    total_damage = sum(team["damage_dealt"] for team in summary["teams"])
+    assert total_damage == sum(battle.battle_log.column(EVENT_ACTUAL_DAMAGE))
+    targets = battle.battle_log.column(EVENT_TARGET)
+    attackers = battle.battle_log.column(EVENT_ATTACKER)
+    assert all(battle.team_of[a] != battle.team_of[t] for a, t in zip(attackers, targets))
+    assert len(battle.alive[0]) == sum(1 for c in battle.combatants[:40] if c.is_alive)
+
+
+if __name__ == "__main__":
+    test_alive_index()
+    test_lowest_health_matches_scan()
+    test_team_battle_result()
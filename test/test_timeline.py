@@ -0,0 +1,111 @@
+"""
+测试先攻时间线调度与时间线战斗
+"""
+
+import sys
+import os
+import random
+from collections import Counter
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.battle_log import EVENT_ACTUAL_DAMAGE, EVENT_ATTACKER, EVENT_ROUND
+from src.battle_rules import BattleRules
+from src.character_generator import CharacterDataLoader
+from src.player import DEFAULT_SPEED, FastPlayer, Player
+from src.timeline import ROUND_LENGTH, InitiativeTimeline, TimelineBattle
+
+
+def test_initiative_timeline():
+    """测试时间线的出堆顺序、延后和移除"""
+    print("=== 先攻时间线测试 ===")
+    timeline = InitiativeTimeline()
+    timeline.schedule(0, 5.0)
+    timeline.schedule(1, 2.0)
+    timeline.schedule(2, 5.0)
+    timeline.schedule(3, 1.0)
+    timeline.delay(3, 10.0)
+    timeline.remove(1)
+    assert len(timeline) == 3 and 1 not in timeline
+    assert timeline.peek_time() == 5.0
+    # 同一时间按入队顺序
+    assert timeline.pop() == (5.0, 0)
+    assert timeline.pop() == (5.0, 2)
+    assert timeline.pop() == (11.0, 3)
+    assert timeline.pop() is None and timeline.peek_time() is None
+    print("✅ 先攻时间线测试通过")
+
+
+def test_speed_sets_action_rate():
+    """测试行动次数与速度成正比"""
+    fast = FastPlayer("测试·刺客", "刺客", 100000, 1, 0, speed=15)
+    slow = FastPlayer("测试·盾卫", "盾卫", 100000, 1, 0, speed=5)
+    battle = TimelineBattle([fast], [slow], rng=random.Random(1))
+    result = battle.fight(max_rounds=100)
+    assert result["outcome"] == "timeout"
+    counts = Counter(battle.battle_log.column(EVENT_ATTACKER))
+    assert abs(counts[0] - 150) <= 1 and abs(counts[1] - 50) <= 1
+    assert result["time"] < 100 * ROUND_LENGTH
+
+
+def test_idle_rounds_skipped():
+    """测试慢速角色之间的战斗跳过空闲回合"""
+    team1 = [Player("测试·甲", "盾卫", 60, 30, 0, speed=1)]
+    team2 = [Player("测试·乙", "盾卫", 60, 30, 0, speed=1)]
+    battle = TimelineBattle(team1, team2, rng=random.Random(2), rules=BattleRules(max_rounds=1000))
+    result = battle.fight()
+    assert result["outcome"] == "victory"
+    # 每 10 回合才有一次行动，日志中只出现有行动的回合
+    rounds = battle.battle_log.column(EVENT_ROUND)
+    active_rounds = sorted(set(rounds))
+    assert len(battle.battle_log) == len(active_rounds) < result["total_rounds"]
+    assert all(b - a == 10 for a, b in zip(active_rounds, active_rounds[1:]))
+
+
+def test_delayed_action():
+    """测试被延后的角色错过行动"""
+    team1 = [FastPlayer(f"测试·甲{i}", "剑士", 1000, 10, 0) for i in range(3)]
+    team2 = [FastPlayer(f"测试·乙{i}", "剑士", 1000, 10, 0) for i in range(3)]
+    battle = TimelineBattle(team1, team2, rng=random.Random(3))
+    battle.delay_action(0, 5 * ROUND_LENGTH)
+    battle.fight(max_rounds=10)
+    counts = Counter(battle.battle_log.column(EVENT_ATTACKER))
+    assert counts[0] == 5 and counts[1] == 10
+
+
+def test_large_timeline_battle():
+    """测试大规模时间线战斗的结果与统计一致"""
+    rng = random.Random(4)
+    teams = [
+        [
+            FastPlayer(f"T{team}·{i}", "剑士", 80, rng.randint(15, 35), 5, speed=rng.randint(5, 15))
+            for i in range(200)
+        ]
+        for team in range(2)
+    ]
+    battle = TimelineBattle(teams[0], teams[1], rng=random.Random(5))
+    result = battle.fight()
+    assert result["outcome"] == "victory"
+    assert result["survivors"][1 - result["winning_team"]] == 0
+    total_damage = sum(team["damage_dealt"] for team in battle.get_team_summary()["teams"])
+    assert total_damage == sum(battle.battle_log.column(EVENT_ACTUAL_DAMAGE))
+    assert len(battle.timeline) == result["survivors"][result["winning_team"]]
+
+
+def test_loader_speed_default():
+    """测试预制数据的速度字段及缺省值"""
+    presets = CharacterDataLoader().get_character_presets()
+    assert all(preset["speed"] > 0 for preset in presets)
+    fallback = CharacterDataLoader("不存在的文件.json").get_character_presets()
+    assert all("speed" in preset for preset in fallback)
+    assert Player("测试·默认", "剑士", 10, 1, 1).speed == DEFAULT_SPEED
+
+
+if __name__ == "__main__":
+    test_initiative_timeline()
+    test_speed_sets_action_rate()
+    test_idle_rounds_skipped()
+    test_delayed_action()
+    test_large_timeline_battle()
+    test_loader_speed_default()
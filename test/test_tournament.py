@@ -0,0 +1,97 @@
+"""
+测试锦标赛赛制与并行执行
+"""
+
+import sys
+import os
+from collections import Counter
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.tournament import (
+    DoubleEliminationTournament,
+    RoundRobinTournament,
+    SingleEliminationTournament,
+    SwissTournament,
+    create_tournament,
+    generate_entrants,
+)
+
+
+def test_generate_entrants():
+    """测试参赛者生成"""
+    print("=== 锦标赛测试 ===")
+    entrants = generate_entrants(50, seed=1)
+    assert len({entrant["name"] for entrant in entrants}) == 50
+    assert all({"class", "health", "attack", "defense", "speed"} <= set(e) for e in entrants)
+    assert generate_entrants(50, seed=1) == entrants
+
+
+def test_round_robin_circle_method():
+    """测试单循环赛每对参赛者恰好相遇一次"""
+    for count in (8, 9):
+        tournament = RoundRobinTournament(generate_entrants(count, seed=2), seed=3)
+        pairs = Counter()
+        byes = Counter()
+        for stage in tournament.run():
+            for first, second, _ in stage["results"]:
+                pairs[frozenset((first, second))] += 1
+        assert tournament.stage == count - (1 - count % 2)
+        assert len(pairs) == count * (count - 1) // 2
+        assert set(pairs.values()) == {1}
+        # 奇数人数时每人恰好轮空一次
+        assert sum(tournament.byes) == (count if count % 2 else 0)
+        for row in tournament.standings():
+            assert row["wins"] + row["losses"] + row["draws"] == count - 1
+
+
+def test_elimination_formats():
+    """测试单败/双败淘汰只剩一名未被淘汰的冠军"""
+    entrants = generate_entrants(37, seed=4)
+    single = SingleEliminationTournament(entrants, seed=5)
+    single.play()
+    assert single.bracket == [single.champion["index"]]
+    assert sum(1 for losses in single.losses if losses == 0) == 1
+    assert single.matches_played == 36
+
+    double = DoubleEliminationTournament(entrants, seed=5, games_per_match=3)
+    double.play()
+    survivors = [i for i, losses in enumerate(double.losses) if losses < 2]
+    assert survivors == [double.champion["index"]]
+    assert double.matches_played in (2 * 37 - 2, 2 * 37 - 1)
+    print("✅ 淘汰赛测试通过")
+
+
+def test_swiss_avoids_rematches():
+    """测试瑞士轮配对避免重复对阵"""
+    tournament = SwissTournament(generate_entrants(65, seed=6), seed=7, rounds=6)
+    pairs = Counter()
+    stages = list(tournament.run())
+    for stage in stages:
+        assert stage["matches"] == 32 and stage["byes"] == 1
+        assert len(stage["standings"]) == 10
+        for first, second, _ in stage["results"]:
+            pairs[frozenset((first, second))] += 1
+    assert max(pairs.values()) == 1
+    assert max(tournament.byes) == 1
+    assert sum(tournament.points) == 6 * 32 + 6
+
+
+def test_results_independent_of_workers():
+    """测试多进程与单进程得到相同排名"""
+    entrants = generate_entrants(40, seed=8)
+    results = [
+        create_tournament("swiss", entrants, seed=9, workers=workers).play()
+        for workers in (1, 2)
+    ]
+    assert results[0] == results[1]
+    print("✅ 锦标赛测试通过")
+
+
+if __name__ == "__main__":
+    test_generate_entrants()
+    test_round_robin_circle_method()
+    test_elimination_formats()
+    test_swiss_avoids_rematches()
+    test_results_independent_of_workers()